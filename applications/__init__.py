@@ -5,20 +5,70 @@ Job Application Assistance System
 - Stage 6: Tracking & Follow-ups (followup_manager)
 """
 
-from .browser_handler import BrowserHandler, FormField, ApplicationResult
-from .application_autofill import ApplicationAutofiller, UserProfile
-from .application_tracker import ApplicationTracker, Application, ApplicationStatus, StatusChange
-from .followup_manager import FollowupManager
+import importlib
+
+# Exports are imported on first use, so modules that don't drive a browser
+# (storage, tracker, analytics, ...) can be used without Playwright installed.
+_EXPORTS = {
+    "BrowserHandler": ".browser_handler",
+    "FormField": ".browser_handler",
+    "ApplicationResult": ".browser_handler",
+    "BrowserRuntime": ".browser_runtime",
+    "BrowserPool": ".browser_pool",
+    "BulkApplyRunner": ".bulk_apply",
+    "ApplicationAutofiller": ".application_autofill",
+    "UserProfile": ".application_autofill",
+    "RequirementDetector": ".requirement_detector",
+    "AnswerBank": ".answer_bank",
+    "ApplicationTracker": ".application_tracker",
+    "Application": ".application_tracker",
+    "ApplicationStatus": ".application_tracker",
+    "StatusChange": ".application_tracker",
+    "ApplicationStore": ".storage",
+    "CsvApplicationStore": ".storage",
+    "SqliteApplicationStore": ".storage",
+    "migrate_csv_to_sqlite": ".storage",
+    "FollowupManager": ".followup_manager",
+    "ApplicationAnalytics": ".analytics",
+    "ResponseTimeTracker": ".response_times",
+    "QuantileSketch": ".response_times"
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
 __all__ = [
     "BrowserHandler",
     "FormField",
     "ApplicationResult",
+    "BrowserRuntime",
+    "BrowserPool",
+    "BulkApplyRunner",
     "ApplicationAutofiller",
     "UserProfile",
+    "RequirementDetector",
+    "AnswerBank",
     "ApplicationTracker",
     "Application",
     "ApplicationStatus",
     "StatusChange",
-    "FollowupManager"
+    "ApplicationStore",
+    "CsvApplicationStore",
+    "SqliteApplicationStore",
+    "migrate_csv_to_sqlite",
+    "FollowupManager",
+    "ApplicationAnalytics",
+    "ResponseTimeTracker",
+    "QuantileSketch"
 ]
@@ -0,0 +1,343 @@
+"""
+Application analytics over status history (Stage 9)
+Keeps a SQLite table of status transitions, updated incrementally from
+ApplicationTracker change events, and answers funnel, time-in-stage and
+cohort questions with set-based SQL instead of walking every status_history.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Ordered funnel stages; reaching a later stage implies the earlier ones
+FUNNEL_STAGES = ["submitted", "viewed", "interview", "offer", "accepted"]
+EXIT_STATUSES = ["rejected", "withdrawn"]
+
+# SQL expressions over the applications table (alias a) for each grouping
+GROUPINGS = {
+    "all": "'all'",
+    "week": "COALESCE(strftime('%Y-W%W', a.submitted_at), 'unsubmitted')",
+    "month": "COALESCE(strftime('%Y-%m', a.submitted_at), 'unsubmitted')",
+    "role_family": "a.role_family",
+    "company": "a.company",
+}
+
+
+def load_role_families(role_families_file: Optional[Path]) -> Dict[str, List[str]]:
+    """Role family -> list of role titles (config/role_families.json)."""
+    if not role_families_file or not Path(role_families_file).exists():
+        return {}
+    try:
+        return json.loads(Path(role_families_file).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error loading role families: {e}")
+        return {}
+
+
+def classify_role_family(role: str, role_families: Dict[str, List[str]]) -> str:
+    """First family with a title contained in the role (or named in it); "other" otherwise."""
+    role_text = (role or "").lower()
+    for family, titles in role_families.items():
+        if any(title.lower() in role_text for title in titles):
+            return family
+    for family in role_families:
+        if family.replace("_", " ") in role_text:
+            return family
+    return "other"
+
+
+class ApplicationAnalytics:
+    """Incrementally maintained transition table with funnel, time-in-stage and cohort queries."""
+
+    def __init__(self, db_path: Path, role_families_file: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite database for analytics tables (safe to share between processes)
+            role_families_file: config/role_families.json for role family grouping
+        """
+        self.db_path = Path(db_path)
+        self.role_families = load_role_families(role_families_file)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS applications ("
+                "job_id TEXT PRIMARY KEY, company TEXT, role TEXT, role_family TEXT, submitted_at TEXT)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS transitions ("
+                "job_id TEXT NOT NULL, seq INTEGER NOT NULL, status TEXT NOT NULL, at TEXT, "
+                "PRIMARY KEY (job_id, seq)) WITHOUT ROWID"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_transitions_status_at ON transitions (status, at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_submitted_at ON applications (submitted_at)")
+            # store_signature: ApplicationStore.signature() as of the last change recorded here
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    # -------------------------
+    # Incremental Maintenance
+    # -------------------------
+
+    def _dimension_row(self, app) -> Tuple:
+        return (
+            app.job_id,
+            app.company,
+            app.role,
+            classify_role_family(app.role, self.role_families),
+            app.submitted_at or None
+        )
+
+    @staticmethod
+    def _transition_rows(app) -> List[Tuple]:
+        # Read the stored JSON so lazily decoded records stay undecoded
+        try:
+            history = json.loads(app.to_row()["status_history"] or "[]")
+        except json.JSONDecodeError:
+            history = []
+        rows = [
+            (app.job_id, seq, change.get("status"), change.get("timestamp"))
+            for seq, change in enumerate(history)
+            if change.get("status")
+        ]
+        # Applications created as submitted have no history entry but did enter the funnel
+        if app.submitted_at and not any(row[2] == "submitted" for row in rows):
+            rows.append((app.job_id, -1, "submitted", app.submitted_at))
+        return rows
+
+    def _write(self, dimensions: List[Tuple], transitions: List[Tuple], store_signature: Optional[str] = None):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO applications (job_id, company, role, role_family, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(job_id) DO UPDATE SET "
+                "company=excluded.company, role=excluded.role, role_family=excluded.role_family, "
+                "submitted_at=excluded.submitted_at",
+                dimensions
+            )
+            # History entries are append-only, so (job_id, seq) identifies them
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO transitions (job_id, seq, status, at) VALUES (?, ?, ?, ?)",
+                transitions
+            )
+            if store_signature is not None:
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('store_signature', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (store_signature,)
+                )
+
+    def store_signature(self) -> Optional[str]:
+        """Store signature this database is current with (None before the first sync)."""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'store_signature'").fetchone()
+        return row[0] if row else None
+
+    def sync(self, applications: Iterable, store_signature: Optional[str] = None) -> int:
+        """
+        Backfill from application records (idempotent). Returns number of applications synced.
+
+        Args:
+            applications: Application records to sync
+            store_signature: Signature of the store they were read from (marks this database current)
+        """
+        dimensions, transitions = [], []
+        for app in applications:
+            dimensions.append(self._dimension_row(app))
+            transitions.extend(self._transition_rows(app))
+        self._write(dimensions, transitions, store_signature)
+        return len(dimensions)
+
+    def record(self, event: Dict, app, store_signature: Optional[str] = None):
+        """Tracker listener: apply one change event (store_signature: the store's signature after it)."""
+        change = event.get("status_change")
+        if event.get("op") == "update" and change:
+            seq = event.get("status_seq", len(app.status_history) - 1)
+            dimensions = [self._dimension_row(app)]
+            transitions = [(app.job_id, seq, change["status"], change["timestamp"])]
+        elif event.get("op") == "update" and not event.get("fields", {}).get("submitted_at"):
+            if store_signature is None:
+                return
+            dimensions, transitions = [], []  # Field-only update: nothing analytics tracks changed
+        else:
+            dimensions, transitions = [self._dimension_row(app)], self._transition_rows(app)
+        self._write(dimensions, transitions, store_signature)
+
+    def attach(self, tracker, backfill: bool = True) -> "ApplicationAnalytics":
+        """
+        Keep analytics current with a tracker. With backfill, its history is synced first
+        unless the store is unchanged since this database last recorded a change from it,
+        so restarts skip decoding every status_history.
+        """
+        store = tracker.store
+        if backfill:
+            signature = store.signature()  # Read first: writes during the sync leave it stale
+            if signature is None or signature != self.store_signature():
+                self.sync(tracker.applications.values(), signature)
+        # Listeners run under the tracker's store write lock, so the signature is exactly post-event
+        tracker.subscribe(lambda event, app: self.record(event, app, store.signature()))
+        return self
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def _group_expr(self, group_by: Optional[str]) -> str:
+        group_by = group_by or "all"
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Unknown group_by: {group_by} (expected one of {', '.join(GROUPINGS)})")
+        return GROUPINGS[group_by]
+
+    def _query(self, sql: str, params: Dict) -> List[Dict]:
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def funnel(self, group_by: Optional[str] = "all", since: Optional[str] = None,
+               as_of: Optional[str] = None) -> Dict:
+        """
+        Applications reaching each funnel stage, with stage-to-stage conversion rates.
+
+        Args:
+            group_by: all, week, month, role_family or company (cohort = submission date)
+            since: Only applications submitted on/after this ISO date
+            as_of: Point-in-time view: ignore transitions after this ISO timestamp
+        """
+        stage_case = " ".join(f"WHEN '{stage}' THEN {rank}" for rank, stage in enumerate(FUNNEL_STAGES, 1))
+        stage_sums = ", ".join(
+            f"SUM(COALESCE(r.stage, 0) >= {rank}) AS {stage}" for rank, stage in enumerate(FUNNEL_STAGES, 1)
+        )
+        exit_sums = ", ".join(f"SUM(COALESCE(r.{status}, 0)) AS {status}" for status in EXIT_STATUSES)
+        exit_flags = ", ".join(f"MAX(status = '{status}') AS {status}" for status in EXIT_STATUSES)
+
+        sql = f"""
+            WITH reached AS (
+                SELECT job_id, MAX(CASE status {stage_case} ELSE 0 END) AS stage, {exit_flags}
+                FROM transitions
+                WHERE :as_of IS NULL OR at <= :as_of
+                GROUP BY job_id
+            )
+            SELECT {self._group_expr(group_by)} AS grp, COUNT(*) AS applications, {stage_sums}, {exit_sums}
+            FROM applications a {'JOIN' if as_of else 'LEFT JOIN'} reached r ON r.job_id = a.job_id
+            WHERE :since IS NULL OR a.submitted_at >= :since
+            GROUP BY grp
+            ORDER BY grp
+        """
+        groups = []
+        for row in self._query(sql, {"since": since or None, "as_of": as_of or None}):
+            group = {"group": row.pop("grp"), **row}
+            group["conversion"] = {
+                f"{prev}_to_{stage}": round(row[stage] / row[prev], 4) if row[prev] else None
+                for prev, stage in zip(FUNNEL_STAGES, FUNNEL_STAGES[1:])
+            }
+            groups.append(group)
+
+        return {
+            "report": "funnel",
+            "group_by": group_by or "all",
+            "since": since or None,
+            "as_of": as_of or None,
+            "stages": FUNNEL_STAGES,
+            "groups": groups
+        }
+
+    def time_in_stage(self, group_by: Optional[str] = "all", since: Optional[str] = None) -> Dict:
+        """Days spent in each status before the next transition (open stays counted separately)."""
+        sql = f"""
+            WITH ordered AS (
+                SELECT job_id, status, at,
+                       LEAD(at) OVER (PARTITION BY job_id ORDER BY at, seq) AS next_at
+                FROM transitions
+            )
+            SELECT {self._group_expr(group_by)} AS grp, o.status AS status,
+                   COUNT(*) AS entered,
+                   COUNT(o.next_at) AS exited,
+                   ROUND(AVG(julianday(o.next_at) - julianday(o.at)), 2) AS avg_days,
+                   ROUND(MIN(julianday(o.next_at) - julianday(o.at)), 2) AS min_days,
+                   ROUND(MAX(julianday(o.next_at) - julianday(o.at)), 2) AS max_days,
+                   ROUND(AVG(CASE WHEN o.next_at IS NULL THEN julianday(:now) - julianday(o.at) END), 2)
+                       AS avg_open_days
+            FROM ordered o JOIN applications a ON a.job_id = o.job_id
+            WHERE :since IS NULL OR a.submitted_at >= :since
+            GROUP BY grp, o.status
+            ORDER BY grp, o.status
+        """
+        rows = self._query(sql, {"since": since or None, "now": datetime.now().isoformat()})
+        return {
+            "report": "time_in_stage",
+            "group_by": group_by or "all",
+            "since": since or None,
+            "rows": [{"group": row.pop("grp"), **row} for row in rows]
+        }
+
+    def cohorts(self, period: str = "week", since: Optional[str] = None) -> Dict:
+        """Per submission week/month: response, interview, offer and rejection counts."""
+        if period not in ("week", "month"):
+            raise ValueError(f"Unknown cohort period: {period} (expected week or month)")
+
+        sql = f"""
+            WITH outcomes AS (
+                SELECT job_id,
+                       MIN(CASE WHEN status NOT IN ('pending', 'submitted') THEN at END) AS first_response_at,
+                       MAX(status IN ('interview', 'offer', 'accepted')) AS interviewed,
+                       MAX(status IN ('offer', 'accepted')) AS offered,
+                       MAX(status = 'rejected') AS rejected
+                FROM transitions
+                GROUP BY job_id
+            )
+            SELECT {GROUPINGS[period]} AS cohort,
+                   COUNT(*) AS submitted,
+                   SUM(o.first_response_at IS NOT NULL) AS responded,
+                   SUM(COALESCE(o.interviewed, 0)) AS interviewed,
+                   SUM(COALESCE(o.offered, 0)) AS offered,
+                   SUM(COALESCE(o.rejected, 0)) AS rejected,
+                   ROUND(AVG(julianday(o.first_response_at) - julianday(a.submitted_at)), 2)
+                       AS avg_days_to_response
+            FROM applications a LEFT JOIN outcomes o ON o.job_id = a.job_id
+            WHERE a.submitted_at IS NOT NULL AND (:since IS NULL OR a.submitted_at >= :since)
+            GROUP BY cohort
+            ORDER BY cohort
+        """
+        rows = self._query(sql, {"since": since or None})
+        for row in rows:
+            row["response_rate"] = round(row["responded"] / row["submitted"], 4) if row["submitted"] else None
+            row["interview_rate"] = round(row["interviewed"] / row["submitted"], 4) if row["submitted"] else None
+        return {"report": "cohorts", "period": period, "since": since or None, "cohorts": rows}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def test_analytics():
+    """Test analytics with a temporary tracker."""
+    import tempfile
+    from applications.application_tracker import ApplicationTracker
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tracker = ApplicationTracker(Path(tmpdir))
+        analytics = ApplicationAnalytics(Path(tmpdir) / "analytics.db").attach(tracker)
+
+        for i, role in enumerate(["Backend Engineer", "Data Engineer", "QA Engineer"]):
+            tracker.add_application(f"job-{i}", "Acme", role, f"https://example.com/{i}", status="submitted")
+        tracker.update_application("job-0", status="viewed")
+        tracker.update_application("job-0", status="interview")
+        tracker.update_application("job-1", status="rejected")
+
+        print(json.dumps(analytics.funnel(), indent=2))
+        print(json.dumps(analytics.time_in_stage(), indent=2))
+        print(json.dumps(analytics.cohorts(), indent=2))
+        analytics.close()
+
+
+if __name__ == "__main__":
+    test_analytics()
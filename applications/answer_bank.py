@@ -0,0 +1,237 @@
+"""
+Answer bank for ambiguous application questions (Stage 9)
+Remembers the answers the user gave to visa, salary, relocation, notice-period and
+similar questions, indexed by normalized question text, so later applications can
+fill them locally instead of stopping for user input.
+
+Lookups go through a character-trigram inverted index: only saved questions that
+share a trigram with the query are scored (Jaccard similarity), so a lookup costs
+microseconds even with thousands of saved answers. Persisted as JSON next to the
+other application data.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Question filler that would otherwise dominate the similarity of short questions
+STOPWORDS = frozenset({
+    "a", "an", "and", "any", "are", "at", "be", "can", "do", "does", "for", "have", "how", "i", "if",
+    "in", "is", "it", "me", "much", "my", "now", "of", "on", "or", "please", "the", "this", "to",
+    "what", "when", "which", "will", "with", "would", "you", "your"
+})
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, punctuation- and filler-free question text ("What are your salary expectations?*" -> "salary expectations")."""
+    words = NON_ALNUM.sub(" ", str(question or "").lower()).split()
+    return " ".join(word for word in words if word not in STOPWORDS) or " ".join(words)
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """Character trigrams of a normalized question, padded so word boundaries count."""
+    padded = f" {normalized} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class AnswerBank:
+    """Saved answers keyed by normalized question, with fuzzy trigram lookup."""
+
+    def __init__(self, path: Path, min_similarity: float = 0.5):
+        """
+        Args:
+            path: JSON file the bank is persisted to
+            min_similarity: Trigram Jaccard similarity a fuzzy match needs to be used
+        """
+        self.path = Path(path)
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        # normalized question -> {"question", "answer", "field", "uses", "updated_at"}
+        self.answers: Dict[str, Dict] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._index: Dict[str, Set[str]] = {}  # trigram -> normalized questions
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.lookup_seconds = 0.0
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            answers = json.loads(self.path.read_text(encoding="utf-8")).get("answers", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading answer bank: {e}")
+            return
+        for key, entry in answers.items():
+            self._add(key, entry)
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({"answers": self.answers}, indent=2)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _add(self, key: str, entry: Dict):
+        self.answers[key] = entry
+        grams = trigrams(key)
+        self._grams[key] = grams
+        for gram in grams:
+            self._index.setdefault(gram, set()).add(key)
+
+    def _remove(self, key: str):
+        self.answers.pop(key, None)
+        for gram in self._grams.pop(key, ()):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def record_many(self, answers: Iterable[Tuple[str, Any, Optional[str]]]) -> int:
+        """
+        Save (question, answer, field) triples; a new answer to a known question replaces the old one.
+
+        Returns:
+            Number of answers saved (empty questions and answers are skipped)
+        """
+        saved = 0
+        with self._lock:
+            for question, answer, field in answers:
+                key = normalize_question(question)
+                if not key or answer is None or answer == "":
+                    continue
+                previous = self.answers.get(key)
+                self._remove(key)
+                self._add(key, {
+                    "question": str(question),
+                    "answer": answer,
+                    "field": field,
+                    "uses": previous["uses"] if previous else 0,
+                    "updated_at": datetime.now().isoformat()
+                })
+                saved += 1
+        if saved:
+            self.save()
+        return saved
+
+    def record(self, question: str, answer: Any, field: Optional[str] = None) -> bool:
+        """Save one answer. See record_many."""
+        return self.record_many([(question, answer, field)]) == 1
+
+    def forget(self, question: str) -> bool:
+        """Drop the saved answer for a question (exact normalized match)."""
+        key = normalize_question(question)
+        with self._lock:
+            if key not in self.answers:
+                return False
+            self._remove(key)
+        self.save()
+        return True
+
+    def lookup(self, question: str, field: Optional[str] = None) -> Optional[Dict]:
+        """
+        Best saved answer for a question.
+
+        Args:
+            question: Question text as asked on the form
+            field: Only fuzzy-match answers saved for this field (exact question matches always count;
+                   answers saved without a field never fuzzy-match a field lookup)
+
+        Returns:
+            {"question", "answer", "field", "similarity", "match"} with match "exact" or "fuzzy",
+            or None if nothing is similar enough
+        """
+        started = time.perf_counter()
+        key = normalize_question(question)
+        with self._lock:
+            self.lookups += 1
+            entry = self.answers.get(key)
+            similarity = 1.0
+            match = "exact"
+            if entry is None and key:
+                match = "fuzzy"
+                similarity, best = 0.0, None
+                grams = self._grams.get(key) or trigrams(key)
+                shared: Dict[str, int] = {}
+                for gram in grams:
+                    for candidate in self._index.get(gram, ()):
+                        shared[candidate] = shared.get(candidate, 0) + 1
+                for candidate, count in shared.items():
+                    if field is not None and self.answers[candidate]["field"] != field:
+                        continue
+                    score = count / (len(grams) + len(self._grams[candidate]) - count)
+                    if score > similarity:
+                        similarity, best = score, candidate
+                if best is not None and similarity >= self.min_similarity:
+                    entry = self.answers[best]
+
+            if entry is not None:
+                entry["uses"] += 1
+                if match == "exact":
+                    self.exact_hits += 1
+                else:
+                    self.fuzzy_hits += 1
+            self.lookup_seconds += time.perf_counter() - started
+
+        if entry is None:
+            return None
+        return {
+            "question": entry["question"],
+            "answer": entry["answer"],
+            "field": entry["field"],
+            "similarity": round(similarity, 3),
+            "match": match
+        }
+
+    def entries(self, field: Optional[str] = None) -> List[Dict]:
+        """Saved answers, most recently updated first."""
+        with self._lock:
+            entries = [dict(entry) for entry in self.answers.values() if field is None or entry["field"] == field]
+        return sorted(entries, key=lambda entry: entry["updated_at"], reverse=True)
+
+    def stats(self) -> Dict:
+        """Saved answers and lookup counters (this process)."""
+        with self._lock:
+            hits = self.exact_hits + self.fuzzy_hits
+            fields: Dict[str, int] = {}
+            for entry in self.answers.values():
+                fields[entry["field"] or "other"] = fields.get(entry["field"] or "other", 0) + 1
+            return {
+                "answers": len(self.answers),
+                "fields": fields,
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.lookups - hits,
+                "hit_rate": round(hits / self.lookups, 3) if self.lookups else 0.0,
+                "avg_lookup_us": round(self.lookup_seconds / self.lookups * 1e6, 1) if self.lookups else 0.0
+            }
+
+
+def test_answer_bank():
+    """Test recording, fuzzy lookup and persistence."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bank = AnswerBank(Path(tmpdir) / "answer_bank.json")
+        bank.record("Will you now or in the future require visa sponsorship?", "No", "visa_sponsorship")
+        bank.record("What are your salary expectations?", "$160k", "salary_expectations")
+        for question in ["Do you require visa sponsorship?", "Salary expectations (USD)*", "Favourite colour?"]:
+            print(f"{question!r}: {bank.lookup(question)}")
+        print(AnswerBank(Path(tmpdir) / "answer_bank.json").entries())
+        print(bank.stats())
+
+
+if __name__ == "__main__":
+    test_answer_bank()
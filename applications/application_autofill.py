@@ -5,11 +5,16 @@ Extracts user data from master profile and applies to job applications.
 
 import json
 import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from applications.requirement_detector import RequirementDetector
+from applications.answer_bank import AnswerBank
+
 
 @dataclass
 class UserProfile:
@@ -28,45 +33,98 @@ class UserProfile:
         return asdict(self)
 
 
+# Validation patterns, compiled once
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_PATTERN = re.compile(r"^[\d\s\-\+\(\)]{10,}$")
+
+
 class ApplicationAutofiller:
     """Handles autofill logic for job applications."""
     
-    def __init__(self, master_resume_path: Path = None):
+    def __init__(
+        self,
+        master_resume_path: Path = None,
+        requirement_rules_path: Path = None,
+        answer_bank: Optional[AnswerBank] = None
+    ):
         self.master_resume_path = master_resume_path or Path(__file__).parent.parent / "resumes" / "master"
-        self.user_profile = self._extract_user_profile()
+        self.requirement_detector = RequirementDetector(requirement_rules_path)
+        self.answer_bank = answer_bank  # Saved answers to ambiguous questions (None = always ask)
+        self._profile_lock = threading.Lock()
+        self._profile_signature = None
+        self._user_profile: Optional[UserProfile] = None
+        self._autofill_base: Mapping[str, str] = MappingProxyType({})
+        self.profile_loads = 0
+        self._refresh_profile()
+    
+    # -------------------------
+    # Profile cache
+    # -------------------------
+    
+    def _profile_paths(self) -> Tuple[Path, Path]:
+        return (
+            self.master_resume_path / "core_experience.json",
+            self.master_resume_path / "skills_inventory.json"
+        )
+    
+    def _source_signature(self) -> Tuple:
+        """(mtime_ns, size) of each profile source file; None for missing files."""
+        signature = []
+        for path in self._profile_paths():
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def _refresh_profile(self):
+        """Re-extract the profile only when a source file changed since the last load."""
+        signature = self._source_signature()
+        if signature == self._profile_signature:
+            return
+        with self._profile_lock:
+            if signature == self._profile_signature:
+                return
+            profile = self._extract_user_profile()
+            self._autofill_base = MappingProxyType(self._build_autofill_base(profile))
+            self._user_profile = profile
+            self._profile_signature = signature
+            self.profile_loads += 1
+    
+    @property
+    def user_profile(self) -> UserProfile:
+        """User profile, reloaded when the master resume files change."""
+        self._refresh_profile()
+        return self._user_profile
+    
+    @property
+    def autofill_base(self) -> Mapping[str, str]:
+        """Read-only autofill fields shared by every application (copy before modifying)."""
+        self._refresh_profile()
+        return self._autofill_base
     
     def _extract_user_profile(self) -> UserProfile:
         """Extract user contact info from master resume."""
         # Load master resume data
-        core_exp_path = self.master_resume_path / "core_experience.json"
-        skills_path = self.master_resume_path / "skills_inventory.json"
+        core_exp_path, skills_path = self._profile_paths()
         
         user_data = {}
+        years_exp = 0
         
         try:
             if core_exp_path.exists():
                 core_exp = json.loads(core_exp_path.read_text())
-                # Handle both array and object formats
+                # Handle both array and object formats; count job experiences
                 if isinstance(core_exp, list) and len(core_exp) > 0:
                     user_data = core_exp[0].get("contact_info", {})
+                    years_exp = len(core_exp[0].get("job_experience", []))
                 elif isinstance(core_exp, dict):
                     user_data = core_exp.get("contact_info", {})
+                    years_exp = len(core_exp.get("experience", []))
         except Exception as e:
             pass  # Silently continue if no contact info
         
-        # Extract years of experience from core experience
-        years_exp = 0
-        try:
-            if core_exp_path.exists():
-                core_exp = json.loads(core_exp_path.read_text())
-                # Count job experiences
-                if isinstance(core_exp, list) and len(core_exp) > 0:
-                    years_exp = len(core_exp[0].get("job_experience", []))
-                elif isinstance(core_exp, dict):
-                    years_exp = len(core_exp.get("experience", []))
-        except Exception:
-            pass
-        
         # Extract core skills
         core_skills = []
         try:
@@ -88,9 +146,8 @@ class ApplicationAutofiller:
             core_skills=core_skills or []
         )
     
-    def get_autofill_data(self) -> Dict[str, str]:
-        """Get autofill data dictionary ready for form filling."""
-        profile = self.user_profile
+    @staticmethod
+    def _build_autofill_base(profile: UserProfile) -> Dict[str, str]:
         return {
             "first_name": profile.first_name,
             "last_name": profile.last_name,
@@ -102,6 +159,10 @@ class ApplicationAutofiller:
             "years_experience": str(profile.years_experience),
         }
     
+    def get_autofill_data(self) -> Dict[str, str]:
+        """Get autofill data dictionary ready for form filling."""
+        return dict(self.autofill_base)
+    
     def map_job_requirements_to_profile(
         self,
         job_description: str,
@@ -111,31 +172,88 @@ class ApplicationAutofiller:
         Analyze job requirements and suggest autofill values.
         Returns mapping of potential ambiguous fields to suggested values.
         """
-        suggestions = {}
-        
-        jd_lower = job_description.lower()
-        
-        # Check for visa sponsorship question
-        if any(keyword in jd_lower for keyword in ["visa", "sponsorship", "work authorization", "eligible to work"]):
-            suggestions["visa_sponsorship"] = None  # Requires user input
-        
-        # Check for relocation question
-        if any(keyword in jd_lower for keyword in ["relocation", "willing to relocate", "remote", "on-site"]):
-            suggestions["willing_to_relocate"] = None  # Requires user input
-        
-        # Check for salary expectations
-        if any(keyword in jd_lower for keyword in ["salary", "compensation", "salary range"]):
-            suggestions["salary_expectations"] = None  # Requires user input
+        # Memoized per description: bulk runs often repeat the same JD text.
+        # Values are None - every detected field requires user input.
+        return {field: None for field in self.requirement_detector.categories(job_description or "")}
+    
+    def explain_requirements(self, job_description: str) -> Dict[str, List[Dict]]:
+        """Why each ambiguous field was flagged: matched keywords with their offsets in the description."""
+        return self.requirement_detector.detect(job_description or "")
+    
+    def answer_field(self, key: str) -> Optional[str]:
+        """
+        Ambiguous field an answer key belongs to: the key itself for field names, the
+        single field a free-form question mentions, else None (not an ambiguous question).
+        """
+        if key in self.requirement_detector.rules:
+            return key
+        fields = self.requirement_detector.categories(str(key))
+        return fields[0] if len(fields) == 1 else None
+    
+    def remember_answers(self, answers: Dict) -> int:
+        """
+        Save user-provided answers to ambiguous questions in the answer bank.
+        Keys are ambiguous field names (saved under the field's question) or free-form
+        question text mentioning exactly one field (saved as asked, scoped to that field).
+        Other keys - profile and contact overrides such as phone_number - are not saved.
+        Returns the number of answers saved.
+        """
+        if self.answer_bank is None or not answers:
+            return 0
+        entries = []
+        for key, answer in answers.items():
+            field = self.answer_field(key)
+            if field is None:
+                continue
+            question = self.requirement_detector.question(key) if key == field else key
+            entries.append((question, answer, field))
+        return self.answer_bank.record_many(entries)
+    
+    def resolve_ambiguous_fields(
+        self,
+        ambiguous_fields: Dict[str, Optional[str]],
+        autofill_data: Dict[str, str]
+    ) -> Dict[str, Dict]:
+        """
+        Answer ambiguous fields from user-provided data, then from the answer bank.
+        Resolved fields are removed from ambiguous_fields and their answers added to autofill_data.
+        Returns {field: {"answer", "source", ...}} for every resolved field.
         
-        # Check for contract type
-        if any(keyword in jd_lower for keyword in ["contract", "permanent", "temp", "freelance"]):
-            suggestions["contract_type"] = None  # Requires user input
+        A resolved answer still has to reach the form: see unfilled_ambiguous_fields.
+        """
+        resolved = {}
+        for field in list(ambiguous_fields):
+            if autofill_data.get(field) not in (None, ""):
+                resolved[field] = {"answer": autofill_data[field], "source": "user"}
+            elif self.answer_bank is not None:
+                match = self.answer_bank.lookup(self.requirement_detector.question(field), field)
+                if match is None:
+                    continue
+                autofill_data[field] = match["answer"]
+                resolved[field] = {**match, "source": "answer_bank"}
+            else:
+                continue
+            del ambiguous_fields[field]
+        return resolved
+    
+    def unfilled_ambiguous_fields(self, payload: Dict, filled_keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Ambiguous fields that still block submission after the form was filled.
         
-        # Check for notice period
-        if any(keyword in jd_lower for keyword in ["notice", "availability", "start date"]):
-            suggestions["notice_period"] = None  # Requires user input
+        Args:
+            payload: From prepare_application_payload
+            filled_keys: Autofill keys the browser actually wrote into the form
         
-        return suggestions
+        Returns:
+            {field: suggested answer}: None for unanswered fields; the resolved answer
+            for fields answered but not written (no form selector maps to them)
+        """
+        filled = set(filled_keys)
+        blocking = dict(payload["ambiguous_fields"])
+        for field, resolution in payload["resolved_fields"].items():
+            if field not in filled:
+                blocking[field] = resolution["answer"]
+        return blocking
     
     def extract_resume_file_path(self, role_variant: Dict) -> str:
         """Get resume file path for attachment. Returns path to generated DOCX."""
@@ -156,14 +274,12 @@ class ApplicationAutofiller:
         
         # Validate email format
         if data.get("user_email"):
-            email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-            if not re.match(email_pattern, data["user_email"]):
+            if not EMAIL_PATTERN.match(data["user_email"]):
                 missing_fields.append("user_email (invalid format)")
         
         # Validate phone format
         if data.get("phone_number"):
-            phone_pattern = r"^[\d\s\-\+\(\)]{10,}$"
-            if not re.match(phone_pattern, data["phone_number"]):
+            if not PHONE_PATTERN.match(data["phone_number"]):
                 missing_fields.append("phone_number (invalid format)")
         
         return len(missing_fields) == 0, missing_fields
@@ -187,16 +303,22 @@ class ApplicationAutofiller:
         if additional_data:
             autofill_data.update(additional_data)
         
+        ambiguous_fields = self.map_job_requirements_to_profile(
+            job.get("job_description", ""),
+            role_variant.get("role_family", "")
+        )
+        resolved_fields = self.resolve_ambiguous_fields(ambiguous_fields, autofill_data)
+        
         return {
             "job_id": job.get("id"),
             "company": job.get("company"),
             "role": job.get("role"),
             "apply_url": job.get("apply_url"),
             "autofill_data": autofill_data,
-            "ambiguous_fields": self.map_job_requirements_to_profile(
-                job.get("job_description", ""),
-                role_variant.get("role_family", "")
-            ),
+            "ambiguous_fields": ambiguous_fields,
+            "ambiguous_questions": {field: self.requirement_detector.question(field) for field in ambiguous_fields},
+            "resolved_fields": resolved_fields,
+            "ambiguous_field_matches": self.explain_requirements(job.get("job_description", "")),
             "prepared_at": datetime.now().isoformat()
         }
 
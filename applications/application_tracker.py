@@ -3,14 +3,20 @@ Application tracking and status management.
 Tracks submitted applications, follow-ups, and application history.
 """
 
-import csv
+import bisect
+import functools
 import json
+import threading
+from collections import Counter
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from enum import Enum
 
+from applications.storage import ApplicationStore, open_store
+
 
 class ApplicationStatus(Enum):
     """Application status enum."""
@@ -35,32 +41,110 @@ class StatusChange:
         return asdict(self)
 
 
-@dataclass
+_JSON_FIELDS = ('filled_fields', 'ambiguous_fields_filled', 'status_history')
+
+
+def _decode_json(raw: Optional[str], default_factory):
+    if raw:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            pass
+    return default_factory()
+
+
+class _LazyJSONField:
+    """
+    Attribute backed by a raw JSON string from storage, decoded on first access.
+    Rows loaded for list views never pay for decoding fields they don't read.
+    """
+    
+    def __init__(self, default_factory):
+        self.default_factory = default_factory
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.value_slot = f"_{name}"
+        self.raw_slot = f"_raw_{name}"
+    
+    def __get__(self, app, owner=None):
+        if app is None:
+            return self
+        value = getattr(app, self.value_slot)
+        if value is None:
+            value = _decode_json(getattr(app, self.raw_slot), self.default_factory)
+            setattr(app, self.value_slot, value)
+            setattr(app, self.raw_slot, None)
+        return value
+    
+    def __set__(self, app, value):
+        setattr(app, self.value_slot, value if value is not None else self.default_factory())
+        setattr(app, self.raw_slot, None)
+    
+    def encoded(self, app) -> str:
+        """JSON text for storage; reuses the raw string if the field was never decoded."""
+        raw = getattr(app, self.raw_slot)
+        if getattr(app, self.value_slot) is None and raw:
+            return raw
+        return json.dumps(self.__get__(app))
+
+
 class Application:
-    """Single application record with status tracking and follow-up dates."""
-    job_id: str
-    company: str
-    role: str
-    apply_url: str
-    status: str = ApplicationStatus.PENDING.value
-    submitted_at: Optional[str] = None
-    filled_fields: Dict[str, str] = None
-    ambiguous_fields_filled: Dict[str, str] = None
-    notes: str = ""
-    status_history: List = None  # List of StatusChange dicts
-    last_followup_at: Optional[str] = None
-    next_followup_at: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.filled_fields is None:
-            self.filled_fields = {}
-        if self.ambiguous_fields_filled is None:
-            self.ambiguous_fields_filled = {}
-        if self.status_history is None:
-            self.status_history = []
+    """
+    Single application record with status tracking and follow-up dates.
+    Uses __slots__ and lazily decoded JSON columns to keep large histories small in memory.
+    """
+    
+    __slots__ = (
+        'job_id', 'company', 'role', 'apply_url', 'status', 'submitted_at',
+        'notes', 'last_followup_at', 'next_followup_at',
+        *(f"_{name}" for name in _JSON_FIELDS),
+        *(f"_raw_{name}" for name in _JSON_FIELDS)
+    )
+    
+    filled_fields = _LazyJSONField(dict)
+    ambiguous_fields_filled = _LazyJSONField(dict)
+    status_history = _LazyJSONField(list)  # List of StatusChange dicts
+    
+    def __init__(
+        self,
+        job_id: str,
+        company: str,
+        role: str,
+        apply_url: str,
+        status: str = ApplicationStatus.PENDING.value,
+        submitted_at: Optional[str] = None,
+        filled_fields: Dict[str, str] = None,
+        ambiguous_fields_filled: Dict[str, str] = None,
+        notes: str = "",
+        status_history: List = None,
+        last_followup_at: Optional[str] = None,
+        next_followup_at: Optional[str] = None
+    ):
+        self.job_id = job_id
+        self.company = company
+        self.role = role
+        self.apply_url = apply_url
+        self.status = status
+        self.submitted_at = submitted_at
+        self.notes = notes
+        self.last_followup_at = last_followup_at
+        self.next_followup_at = next_followup_at
+        self.filled_fields = filled_fields
+        self.ambiguous_fields_filled = ambiguous_fields_filled
+        self.status_history = status_history
+        
         if not self.submitted_at and self.status == ApplicationStatus.SUBMITTED.value:
             self.submitted_at = datetime.now().isoformat()
     
+    def __repr__(self) -> str:
+        return f"Application(job_id={self.job_id!r}, company={self.company!r}, role={self.role!r}, status={self.status!r})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Application):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
     def add_status_change(self, new_status: str, notes: str = ""):
         """Record a status change in history."""
         change = {
@@ -70,92 +154,205 @@ class Application:
         }
         self.status_history.append(change)
         self.status = new_status
+        return change
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            'job_id': self.job_id,
+            'company': self.company,
+            'role': self.role,
+            'apply_url': self.apply_url,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'filled_fields': self.filled_fields,
+            'ambiguous_fields_filled': self.ambiguous_fields_filled,
+            'notes': self.notes,
+            'status_history': self.status_history,
+            'last_followup_at': self.last_followup_at,
+            'next_followup_at': self.next_followup_at
+        }
+    
+    def to_row(self) -> Dict[str, str]:
+        """Flatten to a storage row (JSON-encoded dict/list fields)."""
+        return {
+            'job_id': self.job_id,
+            'company': self.company,
+            'role': self.role,
+            'apply_url': self.apply_url,
+            'status': self.status,
+            'submitted_at': self.submitted_at or '',
+            'filled_fields': Application.filled_fields.encoded(self),
+            'ambiguous_fields_filled': Application.ambiguous_fields_filled.encoded(self),
+            'status_history': Application.status_history.encoded(self),
+            'last_followup_at': self.last_followup_at or '',
+            'next_followup_at': self.next_followup_at or '',
+            'notes': self.notes
+        }
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, str]) -> "Application":
+        """Build an application from a storage row; JSON columns are decoded on first access."""
+        app = cls.__new__(cls)
+        app.job_id = row['job_id']
+        app.company = row['company']
+        app.role = row['role']
+        app.apply_url = row['apply_url']
+        app.status = row.get('status', ApplicationStatus.PENDING.value)
+        app.submitted_at = row.get('submitted_at')
+        app.notes = row.get('notes', '')
+        app.last_followup_at = row.get('last_followup_at')
+        app.next_followup_at = row.get('next_followup_at')
+        
+        for name in _JSON_FIELDS:
+            setattr(app, f"_{name}", None)
+            setattr(app, f"_raw_{name}", row.get(name) or None)
+        
+        if not app.submitted_at and app.status == ApplicationStatus.SUBMITTED.value:
+            app.submitted_at = datetime.now().isoformat()
+        
+        return app
+
+
+def _synchronized(write: bool = False):
+    """
+    Run a tracker method under its lock after picking up other processes' writes.
+    Writes also hold the store's write lock so the read-modify-write cannot interleave.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._lock:
+                with self.store.write_lock() if write else nullcontext():
+                    self.refresh()
+                    return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class ApplicationTracker:
     """Manages application history and tracking."""
     
-    def __init__(self, applications_dir: Path = None):
+    def __init__(self, applications_dir: Path = None, storage: Union[str, ApplicationStore, None] = None):
+        """
+        Args:
+            applications_dir: Directory holding application data
+            storage: Backend name ("csv" or "sqlite"), a store instance, or None
+                     for the APPLICATION_STORAGE env var (default: csv)
+        """
         self.applications_dir = applications_dir or Path(__file__).parent.parent / "applications"
         self.applications_dir.mkdir(exist_ok=True)
         
         self.csv_path = self.applications_dir / "applications.csv"
         self.json_path = self.applications_dir / "applications.json"
         
-        self._ensure_csv_exists()
-        self.applications: Dict[str, Application] = self._load_applications()
-    
-    def _ensure_csv_exists(self):
-        """Ensure CSV file exists with headers."""
-        if not self.csv_path.exists():
-            with open(self.csv_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=[
-                    'job_id', 'company', 'role', 'apply_url', 'status',
-                    'submitted_at', 'filled_fields', 'ambiguous_fields_filled', 
-                    'status_history', 'last_followup_at', 'next_followup_at', 'notes'
-                ])
-                writer.writeheader()
+        if isinstance(storage, ApplicationStore):
+            self.store = storage
+        else:
+            self.store = open_store(self.applications_dir, storage)
+        
+        # Reentrant: public methods nest (get_summary -> count_due_followups)
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[Dict, Application], None]] = []
+        self._applications: Dict[str, Application] = self._load_applications()
+        self._rebuild_indexes()
+    
+    @property
+    def applications(self) -> Dict[str, Application]:
+        """
+        Snapshot of all applications, including writes made by other processes.
+        A copy, so callers can iterate it while other threads write.
+        """
+        with self._lock:
+            self.refresh()
+            return dict(self._applications)
+    
+    def refresh(self) -> bool:
+        """
+        Pick up writes made by other processes sharing the applications directory.
+        Returns True if anything changed.
+        """
+        with self._lock:
+            return self._apply_changes(self.store.poll_changes())
+    
+    def _apply_changes(self, changes: Optional[Dict[str, Dict[str, str]]]) -> bool:
+        if changes is None:
+            self._applications = self._load_applications()
+            self._rebuild_indexes()
+            return True
+        
+        for job_id, row in changes.items():
+            if job_id in self._applications:
+                self._unindex_app(self._applications[job_id])
+            app = Application.from_row(row)
+            self._applications[job_id] = app
+            self._index_app(app)
+        return bool(changes)
     
     def _load_applications(self) -> Dict[str, Application]:
-        """Load existing applications from CSV."""
+        """Load existing applications from storage."""
         applications = {}
         
-        if not self.csv_path.exists():
-            return applications
-        
         try:
-            with open(self.csv_path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if not row.get('job_id'):
-                        continue
-                    
-                    # Parse JSON fields
-                    filled_fields = {}
-                    ambiguous_fields = {}
-                    
-                    try:
-                        if row.get('filled_fields'):
-                            filled_fields = json.loads(row['filled_fields'])
-                    except json.JSONDecodeError:
-                        pass
-                    
-                    try:
-                        if row.get('ambiguous_fields_filled'):
-                            ambiguous_fields = json.loads(row['ambiguous_fields_filled'])
-                    except json.JSONDecodeError:
-                        pass
-                    
-                    app = Application(
-                        job_id=row['job_id'],
-                        company=row['company'],
-                        role=row['role'],
-                        apply_url=row['apply_url'],
-                        status=row.get('status', ApplicationStatus.PENDING.value),
-                        submitted_at=row.get('submitted_at'),
-                        filled_fields=filled_fields,
-                        ambiguous_fields_filled=ambiguous_fields,
-                        notes=row.get('notes', ''),
-                        last_followup_at=row.get('last_followup_at'),
-                        next_followup_at=row.get('next_followup_at')
-                    )
-                    
-                    # Load status history
-                    try:
-                        if row.get('status_history'):
-                            app.status_history = json.loads(row['status_history'])
-                    except json.JSONDecodeError:
-                        pass
-                    
-                    applications[row['job_id']] = app
+            for row in self.store.load_rows():
+                applications[row['job_id']] = Application.from_row(row)
         except Exception as e:
             print(f"Error loading applications: {e}")
         
         return applications
     
+    # -------------------------
+    # In-memory indexes (kept current on add/update so summaries are O(1))
+    # -------------------------
+    
+    def _rebuild_indexes(self):
+        """Rebuild status/company counters and the sorted follow-up index."""
+        self._status_counts: Counter = Counter()
+        self._company_counts: Counter = Counter()
+        self._followup_keys: Dict[str, str] = {}
+        self._followup_index: List[Tuple[str, str]] = []  # Sorted (next_followup_at, job_id)
+        
+        for app in self._applications.values():
+            self._status_counts[app.status] += 1
+            self._company_counts[app.company] += 1
+            key = self._followup_key(app)
+            if key:
+                self._followup_keys[app.job_id] = key
+                self._followup_index.append((key, app.job_id))
+        self._followup_index.sort()
+    
+    @staticmethod
+    def _followup_key(app: Application) -> Optional[str]:
+        """Normalized ISO timestamp so index order matches chronological order."""
+        if not app.next_followup_at:
+            return None
+        try:
+            return datetime.fromisoformat(app.next_followup_at).isoformat()
+        except ValueError:
+            return None
+    
+    def _index_app(self, app: Application):
+        self._status_counts[app.status] += 1
+        self._company_counts[app.company] += 1
+        key = self._followup_key(app)
+        if key:
+            self._followup_keys[app.job_id] = key
+            bisect.insort(self._followup_index, (key, app.job_id))
+    
+    def _unindex_app(self, app: Application):
+        self._status_counts[app.status] -= 1
+        if self._status_counts[app.status] <= 0:
+            del self._status_counts[app.status]
+        self._company_counts[app.company] -= 1
+        if self._company_counts[app.company] <= 0:
+            del self._company_counts[app.company]
+        key = self._followup_keys.pop(app.job_id, None)
+        if key:
+            entry = (key, app.job_id)
+            i = bisect.bisect_left(self._followup_index, entry)
+            if i < len(self._followup_index) and self._followup_index[i] == entry:
+                del self._followup_index[i]
+    
+    @_synchronized(write=True)
     def add_application(
         self,
         job_id: str,
@@ -173,10 +370,14 @@ class ApplicationTracker:
             status=status,
             submitted_at=datetime.now().isoformat() if status == ApplicationStatus.SUBMITTED.value else None
         )
-        self.applications[job_id] = app
+        if job_id in self._applications:
+            self._unindex_app(self._applications[job_id])
+        self._applications[job_id] = app
+        self._index_app(app)
         self._save_application(app)
         return app
     
+    @_synchronized(write=True)
     def update_application(
         self,
         job_id: str,
@@ -188,93 +389,251 @@ class ApplicationTracker:
         next_followup_at: Optional[str] = None
     ) -> Optional[Application]:
         """Update existing application."""
-        if job_id not in self.applications:
+        if job_id not in self._applications:
             return None
         
-        app = self.applications[job_id]
+        app = self._applications[job_id]
+        self._record_event(self._apply_update(
+            app, status, filled_fields, ambiguous_fields_filled,
+            notes, last_followup_at, next_followup_at
+        ))
+        return app
+    
+    def _apply_update(
+        self,
+        app: Application,
+        status: Optional[str] = None,
+        filled_fields: Optional[Dict] = None,
+        ambiguous_fields_filled: Optional[Dict] = None,
+        notes: Optional[str] = None,
+        last_followup_at: Optional[str] = None,
+        next_followup_at: Optional[str] = None
+    ) -> Dict:
+        """Apply an update in memory (keeping indexes current); returns the event to persist."""
+        event = {"op": "update", "job_id": app.job_id, "fields": {}}
+        self._unindex_app(app)
         
         if status:
             # Record status change in history
             status_notes = notes or f"Status changed to {status}"
-            app.add_status_change(status, status_notes)
+            event["status_change"] = app.add_status_change(status, status_notes)
+            # Position in status_history: listeners run after a whole batch, when
+            # later changes to the same application may already be appended
+            event["status_seq"] = len(app.status_history) - 1
+            event["fields"]["status"] = status
             
             if status == ApplicationStatus.SUBMITTED.value and not app.submitted_at:
                 app.submitted_at = datetime.now().isoformat()
+                event["fields"]["submitted_at"] = app.submitted_at
         
         if filled_fields:
             app.filled_fields.update(filled_fields)
+            event["fields"]["filled_fields"] = json.dumps(app.filled_fields)
         
         if ambiguous_fields_filled:
             app.ambiguous_fields_filled.update(ambiguous_fields_filled)
+            event["fields"]["ambiguous_fields_filled"] = json.dumps(app.ambiguous_fields_filled)
         
         if notes and not status:  # If notes provided without status change
             app.notes = notes
+            event["fields"]["notes"] = notes
         
         if last_followup_at:
             app.last_followup_at = last_followup_at
+            event["fields"]["last_followup_at"] = last_followup_at
         
         if next_followup_at:
             app.next_followup_at = next_followup_at
+            event["fields"]["next_followup_at"] = next_followup_at
+        elif status and app.next_followup_at:
+            from applications.followup_manager import FollowupManager  # Imports this module
+            if FollowupManager.followup_interval(status) == 0:
+                # Closed statuses (rejected, withdrawn, ...) have nothing left to follow up
+                app.next_followup_at = None
+                event["fields"]["next_followup_at"] = ""
         
-        self._save_application(app)
-        return app
+        self._index_app(app)
+        return event
+    
+    @_synchronized(write=True)
+    def bulk_update_status(self, updates: List[Dict], atomic: bool = False) -> Dict:
+        """
+        Change the status of many applications with one storage write.
+        
+        Every transition is validated with FollowupManager.is_valid_transition and
+        gets the same follow-up scheduling as a single status update.
+        
+        Args:
+            updates: [{"job_id": ..., "status": ..., "notes": optional}, ...]
+            atomic: If True, apply nothing unless every update is valid
+        
+        Returns:
+            Dict with updated/failed counts and per-item results (in request order)
+        """
+        from applications.followup_manager import FollowupManager  # Imports this module
+        
+        results = []
+        planned: Dict[str, str] = {}  # job_id -> status after earlier items in this batch
+        valid = []
+        
+        for item in updates:
+            if not isinstance(item, dict):
+                results.append({"job_id": None, "success": False, "status": "invalid_request",
+                                "message": f"Invalid item: expected an object, got {type(item).__name__}"})
+                continue
+            
+            job_id = item.get("job_id")
+            new_status = item.get("status")
+            
+            if not job_id or not new_status:
+                results.append({"job_id": job_id, "success": False, "status": "invalid_request",
+                                "message": "Missing job_id or status"})
+                continue
+            
+            app = self._applications.get(job_id)
+            if app is None:
+                results.append({"job_id": job_id, "success": False, "status": "not_found",
+                                "message": f"Application not found: {job_id}"})
+                continue
+            
+            current = planned.get(job_id, app.status)
+            if not FollowupManager.is_valid_transition(current, new_status):
+                results.append({"job_id": job_id, "success": False, "status": "invalid_transition",
+                                "message": f"Cannot transition from {current} to {new_status}",
+                                "current_status": current, "attempted_status": new_status})
+                continue
+            
+            planned[job_id] = new_status
+            valid.append((len(results), item))
+            results.append({"job_id": job_id, "success": True, "previous_status": current,
+                            "new_status": new_status})
+        
+        failed = len(updates) - len(valid)
+        if atomic and failed:
+            for index, _ in valid:
+                results[index] = {**results[index], "success": False, "status": "not_applied",
+                                  "message": "Batch rejected: another update in the batch is invalid"}
+            return {"atomic": True, "applied": False, "updated": 0, "failed": len(updates), "results": results}
+        
+        events = []
+        now = datetime.now().isoformat()
+        for index, item in valid:
+            app = self._applications[item["job_id"]]
+            new_status = item["status"]
+            next_followup = FollowupManager.calculate_next_followup(
+                new_status,
+                app.submitted_at,
+                app.last_followup_at,
+                company=app.company,
+                source=app.apply_url
+            )
+            events.append(self._apply_update(
+                app,
+                status=new_status,
+                notes=item.get("notes") or "",
+                last_followup_at=now if new_status == ApplicationStatus.VIEWED.value else None,
+                next_followup_at=next_followup
+            ))
+            results[index]["next_followup_at"] = next_followup
+        
+        if events:
+            try:
+                self._apply_changes(self.store.append_events(events))
+            except Exception as e:
+                print(f"Error saving applications: {e}")
+            else:
+                self._notify(events)
+        
+        return {"atomic": atomic, "applied": bool(events), "updated": len(events), "failed": failed, "results": results}
     
     def _save_application(self, app: Application):
-        """Save single application to CSV."""
+        """Persist a full application record (as a put event)."""
+        self._record_event({"op": "put", "row": app.to_row()})
+    
+    def _record_event(self, event: Dict):
+        """Append a change event to the storage backend."""
         try:
-            with open(self.csv_path, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=[
-                    'job_id', 'company', 'role', 'apply_url', 'status',
-                    'submitted_at', 'filled_fields', 'ambiguous_fields_filled', 
-                    'status_history', 'last_followup_at', 'next_followup_at', 'notes'
-                ])
-                
-                # Check if this job_id already exists (update vs insert)
-                existing_ids = {app_id for app_id in self.applications.keys()}
-                
-                if app.job_id not in existing_ids or not self.csv_path.stat().st_size > 100:
-                    # Insert new row
-                    writer.writerow({
-                        'job_id': app.job_id,
-                        'company': app.company,
-                        'role': app.role,
-                        'apply_url': app.apply_url,
-                        'status': app.status,
-                        'submitted_at': app.submitted_at or '',
-                        'filled_fields': json.dumps(app.filled_fields),
-                        'ambiguous_fields_filled': json.dumps(app.ambiguous_fields_filled),
-                        'status_history': json.dumps(app.status_history),
-                        'last_followup_at': app.last_followup_at or '',
-                        'next_followup_at': app.next_followup_at or '',
-                        'notes': app.notes
-                    })
+            self._apply_changes(self.store.append_event(event))
         except Exception as e:
             print(f"Error saving application: {e}")
+            return
+        self._notify([event])
     
+    def subscribe(self, listener: Callable[[Dict, Application], None]):
+        """Call listener(event, application) after each change this tracker persists."""
+        self._listeners.append(listener)
+    
+    def _notify(self, events: List[Dict]):
+        for listener in self._listeners:
+            for event in events:
+                app = self._applications.get(event.get("job_id") or event.get("row", {}).get("job_id"))
+                if app is None:
+                    continue
+                try:
+                    listener(event, app)
+                except Exception as e:
+                    print(f"Error in application listener: {e}")
+    
+    @_synchronized()
     def get_application(self, job_id: str) -> Optional[Application]:
         """Get application by job ID."""
-        return self.applications.get(job_id)
+        return self._applications.get(job_id)
     
+    @_synchronized()
     def get_applications_by_status(self, status: str) -> List[Application]:
         """Get all applications with specific status."""
-        return [app for app in self.applications.values() if app.status == status]
+        job_ids = self.store.job_ids_by_status(status)
+        if job_ids is not None:
+            return [self._applications[job_id] for job_id in job_ids if job_id in self._applications]
+        return [app for app in self._applications.values() if app.status == status]
+    
+    @_synchronized()
+    def get_status_counts(self) -> Dict[str, int]:
+        """Number of applications per status."""
+        return dict(self._status_counts)
+    
+    @_synchronized()
+    def get_company_counts(self) -> Dict[str, int]:
+        """Number of applications per company."""
+        return dict(self._company_counts)
+    
+    @staticmethod
+    def _due_bound(as_of: date) -> Tuple[str]:
+        # ISO timestamps sort lexicographically: anything before the next day is due
+        return ((as_of + timedelta(days=1)).isoformat(),)
+    
+    @_synchronized()
+    def count_due_followups(self, as_of: Optional[date] = None) -> int:
+        """Number of applications with a follow-up due on or before as_of (default today)."""
+        as_of = as_of or datetime.now().date()
+        return bisect.bisect_left(self._followup_index, self._due_bound(as_of))
+    
+    @_synchronized()
+    def get_applications_due_for_followup(
+        self,
+        as_of: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> List[Application]:
+        """
+        Applications whose next follow-up is on or before as_of (default today), most overdue first.
+        Reads from the head of the sorted follow-up index: O(log n + k) for k results.
+        """
+        count = self.count_due_followups(as_of)
+        if limit is not None and limit >= 0:
+            count = min(count, limit)
+        return [self._applications[job_id] for _, job_id in self._followup_index[:count]]
     
+    @_synchronized()
     def get_summary(self) -> Dict:
         """Get summary statistics."""
-        total = len(self.applications)
-        submitted = len(self.get_applications_by_status(ApplicationStatus.SUBMITTED.value))
-        interviews = len(self.get_applications_by_status(ApplicationStatus.INTERVIEW.value))
-        offers = len(self.get_applications_by_status(ApplicationStatus.OFFER.value))
-        rejected = len(self.get_applications_by_status(ApplicationStatus.REJECTED.value))
+        total = len(self._applications)
+        status_counts = self._status_counts
         
-        # Count applications needing follow-up
-        today = datetime.now().date()
-        needing_followup = 0
-        for app in self.applications.values():
-            if app.next_followup_at:
-                followup_date = datetime.fromisoformat(app.next_followup_at).date()
-                if followup_date <= today:
-                    needing_followup += 1
+        submitted = status_counts.get(ApplicationStatus.SUBMITTED.value, 0)
+        interviews = status_counts.get(ApplicationStatus.INTERVIEW.value, 0)
+        offers = status_counts.get(ApplicationStatus.OFFER.value, 0)
+        rejected = status_counts.get(ApplicationStatus.REJECTED.value, 0)
+        needing_followup = self.count_due_followups()
         
         return {
             "total_applications": total,
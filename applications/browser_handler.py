@@ -5,8 +5,10 @@ Uses Playwright for reliable cross-platform form detection and autofill.
 
 import asyncio
 import json
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -15,6 +17,12 @@ try:
 except ImportError:
     raise ImportError("playwright not installed. Run: pip install playwright")
 
+from applications.browser_pool import BrowserPool
+from applications.readiness import ReadinessTracker
+from applications.resource_blocking import ResourceBlocker
+from applications.selector_cache import SelectorCache
+from applications.urls import apply_domain
+
 
 @dataclass
 class FormField:
@@ -42,14 +50,182 @@ class ApplicationResult:
             self.timestamp = datetime.now().isoformat()
 
 
+# Rule selectors with this prefix match a form control by its question text
+# ("label=visa sponsorship"): ATS custom questions have generated names such as
+# job_application[answers_attributes][2][boolean_value], so only the label identifies them
+LABEL_SELECTOR_PREFIX = "label="
+
+# In-page label lookup shared by the detection scripts: the first label (or Lever
+# .application-label / fieldset legend) containing the text, case-insensitively,
+# resolved to its control and returned as a plain CSS selector for filling and caching.
+LABEL_LOOKUP_JS = """
+    const controlSelector = element => {
+        if (element.id) return `#${CSS.escape(element.id)}`;
+        const name = element.getAttribute("name");
+        return name ? `${element.tagName.toLowerCase()}[name="${CSS.escape(name)}"]` : null;
+    };
+    const controlType = element => {
+        const tag = element.tagName.toLowerCase();
+        return element.getAttribute("type") || (tag === "select" || tag === "textarea" ? tag : "text");
+    };
+    const findByLabel = text => {
+        const needle = text.toLowerCase();
+        for (const label of document.querySelectorAll("label, .application-label, legend")) {
+            if (!label.textContent.toLowerCase().includes(needle)) continue;
+            const control = label.control || (label.parentElement &&
+                label.parentElement.querySelector("input:not([type=hidden]), select, textarea"));
+            if (control && controlSelector(control)) return control;
+        }
+        return null;
+    };
+"""
+
+# Resolves one label= rule selector (per-field detection path)
+LABEL_CONTROL_SCRIPT = """
+(text) => {
+""" + LABEL_LOOKUP_JS + """
+    const element = findByLabel(text);
+    return element ? {selector: controlSelector(element), type: controlType(element)} : null;
+}
+"""
+
+# In-page form detection: fingerprints the form layout, takes the ATS and known-good
+# selectors from the selector cache (sniffing the ATS like _detect_ats_system only
+# for unknown domains) and resolves the first matching selector per field,
+# returning types and attributes in one response.
+DETECT_FIELDS_SCRIPT = """
+({ats_names, rule_sets, layouts, domain_layout}) => {
+""" + LABEL_LOOKUP_JS + """
+    // Layout fingerprint: FNV-1a over the visible form controls' tag, type and name
+    const signature = Array.from(document.querySelectorAll("input, select, textarea"))
+        .filter(element => element.type !== "hidden")
+        .map(element => `${element.tagName}:${element.getAttribute("type") || ""}:${element.getAttribute("name") || element.id || ""}`)
+        .join("|");
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < signature.length; i++) {
+        hash = Math.imul(hash ^ signature.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    const fingerprint = hash.toString(16).padStart(8, "0");
+
+    const known = layouts[fingerprint] || domain_layout;
+    let ats = known && rule_sets[known.ats] ? known.ats : null;
+    if (!ats) {
+        const html = document.documentElement.outerHTML.toLowerCase();
+        ats = ats_names.find(name => html.includes(name)) || "standard_html";
+    }
+    const preferred = known && known.ats === ats ? known.fields : {};
+
+    let stale = false;
+    const fields = [];
+    for (const [name, rule_selectors] of Object.entries(rule_sets[ats] || rule_sets.standard_html)) {
+        const cached = preferred[name];
+        const selectors = cached ? [cached, ...rule_selectors.filter(s => s !== cached)] : rule_selectors;
+        const unsupported = [];
+        let match = null;
+        for (const rule_selector of selectors) {
+            let element, selector = rule_selector;
+            if (rule_selector.startsWith("label=")) {
+                element = findByLabel(rule_selector.slice(6));
+                if (element) selector = controlSelector(element);
+            } else {
+                try {
+                    element = document.querySelector(rule_selector);
+                } catch (e) {
+                    unsupported.push(rule_selector);  // Not valid CSS (e.g. :has-text)
+                    continue;
+                }
+            }
+            if (element) {
+                match = {
+                    name,
+                    selector,
+                    type: controlType(element),
+                    tag: element.tagName.toLowerCase(),
+                    attributes: {
+                        id: element.id || null,
+                        name: element.getAttribute("name"),
+                        placeholder: element.getAttribute("placeholder"),
+                        required: element.required
+                    }
+                };
+                break;
+            }
+        }
+        if (cached && !unsupported.includes(cached) && (!match || match.selector !== cached)) stale = true;
+        fields.push(match || {name, selector: null, unsupported});
+    }
+    return {ats, fingerprint, cached: fingerprint in layouts, stale, fields};
+}
+"""
+
+
+# Field types set by FILL_FIELDS_SCRIPT; everything else uses per-field interaction
+BATCH_FILL_TYPES = {"text", "email", "tel", "url", "number", "search", "textarea"}
+
+# In-page fill: sets each value through the native setter (so framework-controlled
+# inputs see it) and dispatches the events a user edit would. Returns a status per
+# item: "filled", or why the caller should fall back to per-field interaction.
+FILL_FIELDS_SCRIPT = """
+(items) => items.map(({selector, value}) => {
+    let element;
+    try {
+        element = document.querySelector(selector);
+    } catch (e) {
+        return "unsupported_selector";
+    }
+    if (!element) return "not_found";
+    if (element.disabled || element.readOnly) return "readonly";
+
+    const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLInputElement ? HTMLInputElement.prototype : null;
+    if (!proto) return "unsupported_element";
+
+    element.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(element, value);
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+    element.blur();
+    return element.value === value ? "filled" : "rejected";  // e.g. masked inputs
+})
+"""
+
+
 class BrowserHandler:
     """Manages browser automation for job applications."""
     
-    def __init__(self, form_rules_path: Path = None):
+    def __init__(
+        self,
+        form_rules_path: Path = None,
+        headless: Optional[bool] = None,
+        pool_size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        max_heap_mb: Optional[float] = None,
+        selector_cache_path: Optional[Path] = None
+    ):
+        """
+        Args:
+            form_rules_path: ATS selector rules (config/form_rules.json)
+            headless: Run Chromium headless (default: BROWSER_HEADLESS, "1")
+            pool_size: Warm browsers kept (default: BROWSER_POOL_SIZE, 2)
+            max_uses: Contexts per browser before it is recycled (default: BROWSER_MAX_USES, 50)
+            max_heap_mb: JS heap that triggers a recycle (default: BROWSER_MAX_HEAP_MB, 512)
+            selector_cache_path: Learned per-domain selectors (default: applications/selector_cache.json)
+        """
         self.form_rules_path = form_rules_path or Path(__file__).parent.parent / "config" / "form_rules.json"
         self.form_rules = self._load_form_rules()
-        self.browser: Optional[Browser] = None
+        self.headless = headless if headless is not None else os.environ.get("BROWSER_HEADLESS", "1") != "0"
+        self.playwright = None
+        self.pool = BrowserPool(
+            self._launch_browser,
+            size=pool_size or int(os.environ.get("BROWSER_POOL_SIZE", "2")),
+            max_uses=max_uses if max_uses is not None else int(os.environ.get("BROWSER_MAX_USES", "50")),
+            max_heap_mb=max_heap_mb if max_heap_mb is not None else float(os.environ.get("BROWSER_MAX_HEAP_MB", "512")),
+            context_options={"viewport": {"width": 1280, "height": 720}}
+        )
         self.context: Optional[BrowserContext] = None
+        self.readiness = ReadinessTracker()
+        self.resource_blocker = ResourceBlocker(self.form_rules)
+        self.selector_cache = SelectorCache(selector_cache_path or Path(__file__).parent / "selector_cache.json")
         
     def _load_form_rules(self) -> Dict:
         """Load form rules for different ATS systems."""
@@ -57,43 +233,107 @@ class BrowserHandler:
             raise FileNotFoundError(f"Form rules not found: {self.form_rules_path}")
         return json.loads(self.form_rules_path.read_text())
     
+    async def _launch_browser(self) -> Browser:
+        """Launch one Chromium for the pool (Playwright is started once)."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        return await self.playwright.chromium.launch(headless=self.headless)
+    
+    async def ensure_browser(self) -> Browser:
+        """Warm the browser pool (launching only missing browsers) and return one browser."""
+        warm = await self.pool.fill()
+        return warm[0].browser
+    
+    async def new_context(self) -> BrowserContext:
+        """Create a fresh, isolated context (cookies, storage) on a warm pooled browser."""
+        return await self.pool.acquire()
+    
+    @asynccontextmanager
+    async def application_context(self) -> AsyncIterator[BrowserContext]:
+        """
+        Per-application browser context.
+        Browsers stay warm in the pool; only the context is created and discarded.
+        """
+        async with self.pool.context() as context:
+            yield context
+    
+    def pool_stats(self) -> Dict:
+        """Browser pool utilization and recycling counters."""
+        return {"headless": self.headless, **self.pool.stats()}
+    
     async def init(self):
-        """Initialize Playwright browser."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=False)
-        self.context = await self.browser.new_context(
-            viewport={"width": 1280, "height": 720}
-        )
+        """Initialize the browser pool with a default context."""
+        await self.ensure_browser()
+        if not self.context:
+            self.context = await self.new_context()
     
     async def close(self):
-        """Close browser and cleanup."""
+        """Close all pooled browsers and cleanup."""
         if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
+            await self.pool.release(self.context)
+            self.context = None
+        await self.pool.close()
+        if self.playwright:
             await self.playwright.stop()
+            self.playwright = None
     
-    async def open_job_link(self, job_url: str) -> Page:
-        """Open job application link."""
-        if not self.context:
-            await self.init()
-        page = await self.context.new_page()
+    async def open_job_link(self, job_url: str, context: Optional[BrowserContext] = None) -> Page:
+        """Open job application link (in the given context, or the default one)."""
+        if context is None:
+            if not self.context:
+                await self.init()
+            context = self.context
+        page = await context.new_page()
+        # Drop images, fonts and trackers per the ATS's resource_blocking policy
+        await self.resource_blocker.attach(page, self._detect_ats_system(job_url))
         await page.goto(job_url, wait_until="domcontentloaded")
-        await asyncio.sleep(2)  # Wait for JS to render
+        await self.wait_until_ready(page, job_url)
         return page
     
+    async def wait_until_ready(self, page: Page, job_url: str) -> Dict:
+        """
+        Wait for JS-rendered forms: until one of the ATS's form selectors is attached
+        or the network goes idle, capped by the ATS's adaptive timeout.
+        """
+        ats_system = self._detect_ats_system(job_url)
+        rules = self.form_rules.get(ats_system, self.form_rules["standard_html"])
+        selectors = [
+            selector for candidates in rules["selectors"].values() for selector in candidates
+            if not selector.startswith(LABEL_SELECTOR_PREFIX)  # Resolved in-page, not a selector
+        ]
+        return await self.readiness.wait_until_ready(page, ats_system, selectors)
+    
+    def _ats_names(self) -> List[str]:
+        """ATS rule sets that are sniffed from page content (standard_html is the fallback)."""
+        return [
+            name for name, rules in self.form_rules.items()
+            if isinstance(rules, dict) and "selectors" in rules and name != "standard_html"
+        ]
+    
     def _detect_ats_system(self, page_content: str) -> str:
         """Detect which ATS system the job board uses."""
-        if "greenhouse" in page_content.lower():
-            return "greenhouse"
-        elif "lever" in page_content.lower():
-            return "lever"
-        else:
-            return "standard_html"
-    
-    async def detect_form_fields(self, page: Page) -> List[FormField]:
-        """Detect all fillable form fields on the page."""
+        page_content = page_content.lower()
+        for name in self._ats_names():
+            if name in page_content:
+                return name
+        return "standard_html"
+    
+    async def detect_form_fields(self, page: Page, batched: bool = True) -> List[FormField]:
+        """
+        Detect all fillable form fields on the page.
+        
+        Args:
+            page: Page to inspect
+            batched: Resolve every selector (learned ones for this domain first) in a
+                     single page.evaluate round trip; False uses one query_selector
+                     per candidate selector
+        """
+        if batched:
+            try:
+                return await self._detect_form_fields_batched(page)
+            except Exception as e:
+                print(f"Batched field detection failed, falling back: {e}")
+        
         page_content = await page.content()
         ats_system = self._detect_ats_system(page_content)
         rules = self.form_rules.get(ats_system, self.form_rules["standard_html"])
@@ -102,20 +342,84 @@ class BrowserHandler:
         
         # Check for standard input fields
         for field_name, selectors in rules["selectors"].items():
-            for selector in selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        field_type = await element.get_attribute("type") or "text"
-                        detected_fields.append(FormField(
+            field = await self._detect_field(page, field_name, selectors)
+            if field:
+                detected_fields.append(field)
+        
+        return detected_fields
+    
+    async def _detect_field(self, page: Page, field_name: str, selectors: List[str]) -> Optional[FormField]:
+        """First matching selector for a field, one round trip per candidate (label= rules resolve in-page)."""
+        for selector in selectors:
+            try:
+                if selector.startswith(LABEL_SELECTOR_PREFIX):
+                    control = await page.evaluate(LABEL_CONTROL_SCRIPT, selector[len(LABEL_SELECTOR_PREFIX):])
+                    if control:
+                        return FormField(
                             name=field_name,
-                            selector=selector,
-                            field_type=field_type,
+                            selector=control["selector"],
+                            field_type=control["type"],
                             detected=True
-                        ))
-                        break  # Found this field, move to next
-                except Exception:
+                        )
                     continue
+                element = await page.query_selector(selector)
+                if element:
+                    field_type = await element.get_attribute("type") or "text"
+                    return FormField(
+                        name=field_name,
+                        selector=selector,
+                        field_type=field_type,
+                        detected=True
+                    )
+            except Exception:
+                continue
+        return None
+    
+    async def _detect_form_fields_batched(self, page: Page) -> List[FormField]:
+        """
+        Ship every ATS selector set, plus the selectors learned for this domain,
+        into the page and resolve them in one evaluate call.
+        Selectors the browser can't parse as CSS (Playwright-only syntax) fall back to
+        query_selector individually.
+        """
+        rule_sets = {
+            name: rules["selectors"]
+            for name, rules in self.form_rules.items()
+            if isinstance(rules, dict) and "selectors" in rules
+        }
+        domain = apply_domain(page.url)
+        layouts = self.selector_cache.layouts(domain)
+        result = await page.evaluate(DETECT_FIELDS_SCRIPT, {
+            "ats_names": self._ats_names(),
+            "rule_sets": rule_sets,
+            "layouts": layouts,
+            # Most recently matched layout: lets new layouts on a known board skip ATS sniffing
+            "domain_layout": list(layouts.values())[-1] if layouts else None
+        })
+        
+        detected_fields = []
+        for match in result["fields"]:
+            if match.get("selector"):
+                detected_fields.append(FormField(
+                    name=match["name"],
+                    selector=match["selector"],
+                    field_type=match["type"],
+                    detected=True
+                ))
+            elif match.get("unsupported"):
+                field = await self._detect_field(page, match["name"], match["unsupported"])
+                if field:
+                    detected_fields.append(field)
+        
+        if detected_fields:
+            outcome = "miss" if not result["cached"] else "stale" if result["stale"] else "hit"
+            self.selector_cache.record(
+                domain,
+                result["fingerprint"],
+                result["ats"],
+                {field.name: field.selector for field in detected_fields},
+                outcome
+            )
         
         return detected_fields
     
@@ -145,28 +449,62 @@ class BrowserHandler:
         self,
         page: Page,
         user_data: Dict[str, str],
-        detected_fields: List[FormField]
+        detected_fields: List[FormField],
+        batched: bool = True
     ) -> Tuple[Dict[str, str], List[str]]:
         """
         Autofill detected form fields with user data.
         Returns (filled_fields, ambiguous_fields).
+        
+        With batched=True, plain text-like fields are set in one in-page script;
+        file uploads, selects and fields that reject the script are filled one
+        by one with fill_form_field.
         """
         filled_fields = {}
         ambiguous_fields = []
         
         field_mapping = self.form_rules.get("field_mapping", {})
         
+        to_fill = []
         for field in detected_fields:
             mapped_key = field_mapping.get(field.name, field.name)
-            
             if mapped_key in user_data:
-                value = user_data[mapped_key]
-                success = await self.fill_form_field(page, field, value)
-                if success:
-                    filled_fields[field.name] = value
+                to_fill.append((field, user_data[mapped_key]))
+        
+        if batched:
+            batch = [(field, value) for field, value in to_fill if field.field_type in BATCH_FILL_TYPES]
+            if batch:
+                batch_filled = await self._fill_batched(page, batch)
+                filled_fields.update(batch_filled)
+                to_fill = [(field, value) for field, value in to_fill if field.name not in batch_filled]
+        
+        for field, value in to_fill:
+            success = await self.fill_form_field(page, field, value)
+            if success:
+                filled_fields[field.name] = value
         
         return filled_fields, ambiguous_fields
     
+    def filled_data_keys(self, filled_fields: Dict[str, str]) -> List[str]:
+        """User-data keys (as passed to autofill_form) whose values were written into the form."""
+        field_mapping = self.form_rules.get("field_mapping", {})
+        return [field_mapping.get(name, name) for name in filled_fields]
+    
+    async def _fill_batched(self, page: Page, batch: List[Tuple[FormField, str]]) -> Dict[str, str]:
+        """Set text-like values in one evaluate call; returns the fields it filled."""
+        try:
+            results = await page.evaluate(FILL_FIELDS_SCRIPT, [
+                {"selector": field.selector, "value": str(value)} for field, value in batch
+            ])
+        except Exception as e:
+            print(f"Batched fill failed, falling back: {e}")
+            return {}
+        return {
+            field.name: value
+            for (field, value), status in zip(batch, results)
+            if status == "filled"
+        }
+    
     async def find_submit_button(self, page: Page) -> Optional[str]:
         """Find and return selector for submit button."""
         # Try standard selectors
@@ -205,26 +543,26 @@ class BrowserHandler:
 
 
 async def test_browser_handler():
-    """Test browser handler with sample job URL."""
-    handler = BrowserHandler()
+    """Test browser handler against the local ATS fixtures (benchmarks/fixtures)."""
+    import tempfile
+    from benchmarks.fixture_server import FixtureServer
+    
+    handler = BrowserHandler(selector_cache_path=Path(tempfile.gettempdir()) / "selector_cache_demo.json")
     try:
-        await handler.init()
-        
-        # Example: Test with a real job board
-        test_url = "https://boards.greenhouse.io/example/jobs"
-        print(f"Opening {test_url}...")
-        page = await handler.open_job_link(test_url)
-        
-        # Detect form fields
-        fields = await handler.detect_form_fields(page)
-        print(f"Detected {len(fields)} fields: {[f.name for f in fields]}")
-        
-        await page.close()
+        with FixtureServer() as server:
+            for fixture in server.fixtures:
+                async with handler.application_context() as context:
+                    print(f"Opening {server.url(fixture)}...")
+                    page = await handler.open_job_link(server.url(fixture), context)
+                    
+                    # Detect form fields
+                    fields = await handler.detect_form_fields(page)
+                    print(f"Detected {len(fields)} fields: {[f.name for f in fields]}")
     finally:
         await handler.close()
 
 
 if __name__ == "__main__":
-    # Uncomment to test
+    # Uncomment to test (python -m applications.browser_handler)
     # asyncio.run(test_browser_handler())
     pass
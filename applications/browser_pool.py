@@ -0,0 +1,303 @@
+"""
+Warm browser pool for application automation (Stage 9)
+Keeps N launched browsers and hands out fresh, isolated contexts per application.
+Browsers are recycled after a number of uses or when their JS heap grows past a
+limit, so long bulk runs don't accumulate leaks; launch cost is paid once per
+pooled browser rather than once per job.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+# Largest JS heap across a context's pages (bytes); 0 where performance.memory is unavailable
+HEAP_SCRIPT = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
+
+class PooledBrowser:
+    """A launched browser plus its pool bookkeeping."""
+
+    def __init__(self, browser_id: int, browser: Any, launch_seconds: float):
+        self.id = browser_id
+        self.browser = browser
+        self.launch_seconds = launch_seconds
+        self.launched_at = time.monotonic()
+        self.uses = 0
+        self.active = 0
+        self.heap_bytes = 0
+        self.retire_reason: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.retire_reason is None and self.browser.is_connected()
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "uses": self.uses,
+            "active_contexts": self.active,
+            "heap_mb": round(self.heap_bytes / 1024 / 1024, 1),
+            "age_seconds": round(time.monotonic() - self.launched_at, 1),
+            "launch_ms": int(self.launch_seconds * 1000),
+            "retiring": self.retire_reason
+        }
+
+
+class BrowserPool:
+    """Pool of warm browsers handing out per-application contexts."""
+
+    def __init__(
+        self,
+        launch: Callable[[], Awaitable[Any]],
+        size: int = 2,
+        max_uses: int = 50,
+        max_heap_mb: float = 512,
+        context_options: Optional[Dict] = None
+    ):
+        """
+        Args:
+            launch: Coroutine function launching one browser (e.g. chromium.launch)
+            size: Number of warm browsers kept
+            max_uses: Contexts served before a browser is recycled (0 = unlimited)
+            max_heap_mb: JS heap observed at context close that triggers a recycle (0 = unlimited)
+            context_options: Keyword arguments for browser.new_context()
+        """
+        self.launch = launch
+        self.size = max(1, int(size))
+        self.max_uses = max(0, int(max_uses))
+        self.max_heap_mb = max_heap_mb
+        self.context_options = context_options or {}
+
+        self.browsers: List[PooledBrowser] = []
+        self._owners: Dict[int, PooledBrowser] = {}  # id(context) -> browser
+        self._started: Dict[int, float] = {}  # id(context) -> acquire time
+        self._busy_since: Optional[float] = None
+        self._fill_lock: Optional[asyncio.Lock] = None
+        # Guards bookkeeping: the runtime loop mutates it while stats() runs on tool threads.
+        # Never held across an await.
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+        self.created_at = time.monotonic()
+        self.launches = 0
+        self.launch_seconds = 0.0
+        self.contexts_served = 0
+        self.peak_active = 0
+        self.busy_seconds = 0.0  # Time with at least one context open
+        self.context_seconds = 0.0  # Summed context lifetimes
+        self.recycled: Dict[str, int] = {}
+
+    # -------------------------
+    # Browsers
+    # -------------------------
+
+    async def _launch_one(self) -> PooledBrowser:
+        started = time.perf_counter()
+        browser = await self.launch()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._next_id += 1
+            self.launches += 1
+            self.launch_seconds += elapsed
+            return PooledBrowser(self._next_id, browser, elapsed)
+
+    async def fill(self) -> List[PooledBrowser]:
+        """Launch browsers (concurrently) until `size` healthy ones are warm."""
+        if self._fill_lock is None:
+            self._fill_lock = asyncio.Lock()  # Bound to the loop that first uses the pool
+        async with self._fill_lock:
+            for pooled in [b for b in self.browsers if not b.browser.is_connected()]:
+                await self._retire(pooled, "disconnected")
+            missing = self.size - sum(1 for b in self.browsers if b.healthy)
+            if missing > 0:
+                launched = await asyncio.gather(*(self._launch_one() for _ in range(missing)))
+                with self._lock:
+                    self.browsers.extend(launched)
+        return [b for b in self.browsers if b.healthy]
+
+    async def _retire(self, pooled: PooledBrowser, reason: str):
+        """Stop handing out contexts from a browser; close it once its last context is released."""
+        with self._lock:
+            if pooled.retire_reason is None:
+                pooled.retire_reason = reason
+                self.recycled[reason] = self.recycled.get(reason, 0) + 1
+            closing = pooled.active == 0
+            if closing and pooled in self.browsers:
+                self.browsers.remove(pooled)
+        if closing:
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass  # Already crashed or disconnected
+
+    # -------------------------
+    # Contexts
+    # -------------------------
+
+    async def acquire(self, **context_options) -> Any:
+        """New isolated context on the least busy warm browser (release it when done)."""
+        while True:
+            healthy = await self.fill()
+            pooled = min(healthy, key=lambda b: (b.active, b.uses))
+            with self._lock:
+                pooled.active += 1
+            try:
+                context = await pooled.browser.new_context(**{**self.context_options, **context_options})
+                break
+            except Exception:
+                with self._lock:
+                    pooled.active -= 1
+                if pooled.browser.is_connected():
+                    raise
+                await self._retire(pooled, "disconnected")  # Crashed between fill and use: retry
+
+        with self._lock:
+            pooled.uses += 1
+            if not self._owners:
+                self._busy_since = time.monotonic()
+            self.contexts_served += 1
+            self._owners[id(context)] = pooled
+            self._started[id(context)] = time.monotonic()
+            self.peak_active = max(self.peak_active, len(self._owners))
+
+        if self.max_uses and pooled.uses >= self.max_uses:
+            await self._retire(pooled, "max_uses")  # No new contexts; closed after the last release
+        return context
+
+    async def _measure_heap(self, context) -> int:
+        heap = 0
+        for page in list(getattr(context, "pages", [])):
+            try:
+                heap = max(heap, int(await page.evaluate(HEAP_SCRIPT) or 0))
+            except Exception:
+                continue  # Page closed or navigated away mid-measurement
+        return heap
+
+    async def release(self, context):
+        """Close a context and recycle its browser if it hit max_uses or max_heap_mb."""
+        with self._lock:
+            pooled = self._owners.pop(id(context), None)
+            started = self._started.pop(id(context), None)
+            if started is not None:
+                now = time.monotonic()
+                self.context_seconds += now - started
+                if not self._owners and self._busy_since is not None:
+                    self.busy_seconds += now - self._busy_since
+                    self._busy_since = None
+
+        heap = await self._measure_heap(context) if pooled and self.max_heap_mb else 0
+        try:
+            await context.close()
+        except Exception:
+            pass  # Browser may already be gone; nothing left to clean up
+        if pooled is None:
+            return
+
+        with self._lock:
+            pooled.active -= 1
+            if heap:
+                pooled.heap_bytes = heap
+
+        if pooled.retire_reason:
+            await self._retire(pooled, pooled.retire_reason)
+        elif self.max_heap_mb and heap > self.max_heap_mb * 1024 * 1024:
+            await self._retire(pooled, "memory")
+        elif not pooled.browser.is_connected():
+            await self._retire(pooled, "disconnected")
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator[Any]:
+        """Per-application context: acquired from the pool and released on exit."""
+        context = await self.acquire(**context_options)
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    async def close(self):
+        """Close every pooled browser (open contexts are closed with them)."""
+        with self._lock:
+            browsers, self.browsers = self.browsers, []
+            self._owners.clear()
+            self._started.clear()
+            self._busy_since = None
+        for pooled in browsers:
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass
+
+    # -------------------------
+    # Stats
+    # -------------------------
+
+    def stats(self) -> Dict:
+        """
+        Pool utilization: share of time since creation with at least one context
+        open, and the average number of open contexts.
+        Safe to call from other threads than the one running the pool's loop.
+        """
+        with self._lock:
+            now = time.monotonic()
+            busy = self.busy_seconds + (now - self._busy_since if self._busy_since is not None else 0)
+            context_seconds = self.context_seconds + sum(now - started for started in self._started.values())
+            elapsed = max(now - self.created_at, 1e-9)
+            return {
+                "size": self.size,
+                "max_uses": self.max_uses,
+                "max_heap_mb": self.max_heap_mb,
+                "warm_browsers": sum(1 for b in self.browsers if b.healthy),
+                "active_contexts": len(self._owners),
+                "peak_active_contexts": self.peak_active,
+                "contexts_served": self.contexts_served,
+                "launches": self.launches,
+                "avg_launch_ms": int(self.launch_seconds / self.launches * 1000) if self.launches else None,
+                "recycled": dict(self.recycled),
+                "utilization": round(busy / elapsed, 3),
+                "avg_active_contexts": round(context_seconds / elapsed, 2),
+                "browsers": [b.to_dict() for b in self.browsers]
+            }
+
+
+def test_browser_pool():
+    """Test context hand-out and recycling with fake browsers (no Playwright)."""
+
+    class FakeContext:
+        pages = []
+
+        async def close(self):
+            pass
+
+    class FakeBrowser:
+        def is_connected(self):
+            return True
+
+        async def new_context(self, **options):
+            return FakeContext()
+
+        async def close(self):
+            pass
+
+    async def launch():
+        await asyncio.sleep(0.01)
+        return FakeBrowser()
+
+    async def run():
+        pool = BrowserPool(launch, size=2, max_uses=3)
+
+        async def job():
+            async with pool.context():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(job() for _ in range(10)))
+        print(pool.stats())
+        await pool.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_browser_pool()
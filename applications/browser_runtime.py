@@ -0,0 +1,96 @@
+"""
+Long-lived browser runtime for application automation.
+Owns a background asyncio event loop and a warm Playwright browser pool so that
+each application only pays for a fresh context, not a Chromium launch.
+"""
+
+import asyncio
+import atexit
+import threading
+import concurrent.futures
+from typing import Any, Coroutine, Optional
+
+from applications.browser_handler import BrowserHandler
+
+
+class BrowserRuntime:
+    """Background event loop that owns a BrowserHandler and its warm browser."""
+
+    def __init__(self, browser_handler: BrowserHandler):
+        self.browser_handler = browser_handler
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self, warm: bool = False):
+        """Start the background loop (idempotent). Optionally launch the browser right away."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name="browser-runtime", daemon=True)
+            self._thread.start()
+            ready.wait()
+            atexit.register(self.shutdown)
+
+        if warm:
+            self.submit(self.browser_handler.ensure_browser())
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop and return a thread-safe future."""
+        if not self.is_running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro: Coroutine) -> Any:
+        """Await a coroutine executed on the runtime loop from any other event loop."""
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def run_sync(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Blocking variant of run() for synchronous callers."""
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self, timeout: float = 10.0):
+        """Close the browser and stop the background loop."""
+        with self._lock:
+            if not self.is_running:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self.browser_handler.close(), self.loop
+                ).result(timeout)
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            self.loop.close()
+            self.loop = None
+            self._thread = None
+
+
+def test_browser_runtime():
+    """Test runtime loop round-trip (does not launch a browser)."""
+    runtime = BrowserRuntime(BrowserHandler())
+
+    async def ping():
+        return threading.current_thread().name
+
+    print(f"Ran on thread: {runtime.run_sync(ping(), timeout=5)}")
+    print(f"Loop reused: {runtime.run_sync(ping(), timeout=5)}")
+    runtime.shutdown()
+
+
+if __name__ == "__main__":
+    test_browser_runtime()
@@ -0,0 +1,251 @@
+"""
+Bulk application runner.
+Runs many APPLY decisions through a bounded pool of concurrent browser workers,
+with per-ATS-domain concurrency limits and resumable on-disk progress.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+
+from applications.urls import apply_domain
+
+
+# Outcomes that are retried when an interrupted or finished batch is resumed
+RETRYABLE_STATUSES = {"error", "cancelled"}
+
+
+def decision_job_id(decision: Dict) -> str:
+    """Stable job id for a decision record (falls back to a hash of the apply URL)."""
+    job_id = decision.get("job_id") or decision.get("id")
+    if job_id:
+        return str(job_id)
+    apply_url = str(decision.get("apply_url") or "")
+    return "job_" + hashlib.sha1(apply_url.encode("utf-8")).hexdigest()[:12]
+
+
+class BulkApplyRunner:
+    """Runs a batch of applications with bounded concurrency and resumable progress."""
+
+    def __init__(
+        self,
+        batches_dir: Path,
+        apply_fn: Callable[[Dict], Awaitable[Dict]],
+        max_workers: int = 4,
+        per_domain_limit: int = 2
+    ):
+        """
+        Args:
+            batches_dir: Directory holding batch manifests and result logs
+            apply_fn: Coroutine function applying to a single decision, returning a result dict
+            max_workers: Maximum concurrent browser contexts across all domains
+            per_domain_limit: Maximum concurrent applications per ATS domain
+        """
+        self.batches_dir = Path(batches_dir)
+        self.batches_dir.mkdir(parents=True, exist_ok=True)
+        self.apply_fn = apply_fn
+        self.max_workers = max(1, int(max_workers))
+        self.per_domain_limit = max(1, int(per_domain_limit))
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def _manifest_path(self, batch_id: str) -> Path:
+        return self.batches_dir / f"{batch_id}.json"
+
+    def _results_path(self, batch_id: str) -> Path:
+        return self.batches_dir / f"{batch_id}.results.jsonl"
+
+    def new_batch_id(self) -> str:
+        return f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+
+    def _write_manifest(self, batch_id: str, decisions: List[Dict]):
+        manifest = {
+            "batch_id": batch_id,
+            "created_at": datetime.now().isoformat(),
+            "max_workers": self.max_workers,
+            "per_domain_limit": self.per_domain_limit,
+            "decisions": decisions
+        }
+        self._manifest_path(batch_id).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    def load_manifest(self, batch_id: str) -> Optional[Dict]:
+        path = self._manifest_path(batch_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def load_results(self, batch_id: str) -> Dict[str, Dict]:
+        """Latest recorded result per job_id (later lines win)."""
+        results = {}
+        path = self._results_path(batch_id)
+        if not path.exists():
+            return results
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from an interrupted write
+                results[record.get("job_id")] = record
+        return results
+
+    def _append_result(self, batch_id: str, record: Dict):
+        with open(self._results_path(batch_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+
+    # -------------------------
+    # Status
+    # -------------------------
+
+    def get_status(self, batch_id: str) -> Optional[Dict]:
+        """Progress summary for a batch."""
+        manifest = self.load_manifest(batch_id)
+        if manifest is None:
+            return None
+
+        results = self.load_results(batch_id)
+        job_ids = [decision_job_id(d) for d in manifest["decisions"]]
+
+        by_status: Dict[str, int] = {}
+        for job_id in job_ids:
+            status = results.get(job_id, {}).get("status", "queued")
+            by_status[status] = by_status.get(status, 0) + 1
+
+        done = sum(
+            1 for job_id in job_ids
+            if job_id in results and results[job_id].get("status") not in RETRYABLE_STATUSES
+        )
+
+        return {
+            "batch_id": batch_id,
+            "created_at": manifest.get("created_at"),
+            "total": len(job_ids),
+            "completed": done,
+            "remaining": len(job_ids) - done,
+            "by_status": by_status,
+            "results": [results[j] for j in job_ids if j in results]
+        }
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    async def run(
+        self,
+        decisions: Optional[List[Dict]] = None,
+        batch_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict, int, int], object]] = None
+    ) -> Dict:
+        """
+        Run (or resume) a batch.
+
+        Args:
+            decisions: Decision records to apply to. Required for a new batch;
+                       ignored when resuming an existing batch_id.
+            batch_id: Existing batch to resume, or None to start a new one
+            on_result: Callback(record, completed, total) invoked as each job finishes
+
+        Returns:
+            Batch status summary
+        """
+        manifest = self.load_manifest(batch_id) if batch_id else None
+
+        if manifest is None:
+            if not decisions:
+                raise ValueError("No decisions provided and no existing batch to resume")
+            batch_id = batch_id or self.new_batch_id()
+            self._write_manifest(batch_id, decisions)
+        else:
+            decisions = manifest["decisions"]
+
+        previous = self.load_results(batch_id)
+        pending = [
+            d for d in decisions
+            if previous.get(decision_job_id(d), {}).get("status", "error") in RETRYABLE_STATUSES
+        ]
+
+        total = len(decisions)
+        completed = total - len(pending)
+        workers = asyncio.Semaphore(self.max_workers)
+        domain_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def _run_one(decision: Dict):
+            nonlocal completed
+            job_id = decision_job_id(decision)
+            domain = apply_domain(decision.get("apply_url"))
+            domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(self.per_domain_limit))
+
+            # Take the domain slot first so a busy domain doesn't hold global workers idle
+            async with domain_limit:
+                async with workers:
+                    started = datetime.now()
+                    try:
+                        result = await self.apply_fn(decision)
+                    except asyncio.CancelledError:
+                        result = {"success": False, "status": "cancelled", "message": "Batch interrupted"}
+                        raise
+                    except Exception as e:
+                        result = {"success": False, "status": "error", "message": str(e)}
+                    finally:
+                        record = {
+                            "job_id": job_id,
+                            "company": decision.get("company"),
+                            "role": decision.get("role"),
+                            "apply_url": decision.get("apply_url"),
+                            "domain": domain,
+                            "success": bool(result.get("success")) if isinstance(result, dict) else False,
+                            "status": result.get("status", "error") if isinstance(result, dict) else "error",
+                            "message": result.get("message", "") if isinstance(result, dict) else "",
+                            "duration_ms": int((datetime.now() - started).total_seconds() * 1000),
+                            "finished_at": datetime.now().isoformat()
+                        }
+                        self._append_result(batch_id, record)
+
+            completed += 1
+            if on_result:
+                outcome = on_result(record, completed, total)
+                if inspect.isawaitable(outcome):
+                    await outcome
+
+        await asyncio.gather(*(_run_one(d) for d in pending))
+        return self.get_status(batch_id)
+
+
+def test_bulk_apply():
+    """Test runner with a fake apply function (no browser)."""
+    import tempfile
+
+    async def fake_apply(decision):
+        await asyncio.sleep(0.01)
+        if "fail" in decision["apply_url"]:
+            raise RuntimeError("boom")
+        return {"success": True, "status": "submitted", "message": "ok"}
+
+    decisions = [
+        {"id": f"job-{i}", "company": "Acme", "role": "Engineer",
+         "apply_url": f"https://boards.greenhouse.io/acme/{'fail' if i == 3 else i}"}
+        for i in range(6)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        runner = BulkApplyRunner(Path(tmpdir), fake_apply, max_workers=3, per_domain_limit=2)
+        status = asyncio.run(runner.run(decisions, on_result=lambda r, done, total: print(f"  {done}/{total} {r['job_id']}: {r['status']}")))
+        print(f"By status: {status['by_status']}")
+
+        # Resume retries only the failed job
+        resumed = asyncio.run(runner.run(batch_id=status["batch_id"]))
+        print(f"After resume: {resumed['by_status']}")
+
+
+if __name__ == "__main__":
+    test_bulk_apply()
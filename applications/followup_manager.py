@@ -3,9 +3,20 @@ Follow-up management for job applications.
 Calculates follow-up dates, generates templates, and tracks follow-up history.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+import functools
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, List, Union
 from applications.application_tracker import ApplicationStatus
+from toolkit.templates import TemplateEngine, user_template_dir
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_submitted_date(submitted_date: str) -> str:
+    """ISO date -> "January 05, 2024" (unparseable values are passed through)."""
+    try:
+        return datetime.fromisoformat(submitted_date).strftime("%B %d, %Y")
+    except (ValueError, TypeError):
+        return submitted_date
 
 
 class FollowupManager:
@@ -22,6 +33,12 @@ class FollowupManager:
         ApplicationStatus.PENDING.value: 0,            # No follow-up yet
         ApplicationStatus.WITHDRAWN.value: 0           # No follow-up
     }
+
+    # Learned intervals (see use_response_times): the percentile of observed
+    # time-to-response, clamped to [MIN_LEARNED_INTERVAL, 2x the fixed interval]
+    response_times = None
+    learned_percentile = 0.75
+    MIN_LEARNED_INTERVAL = 2
     
     # Follow-up email templates
     FOLLOWUP_TEMPLATES = {
@@ -73,11 +90,41 @@ Best regards,
         """
     }
     
+    @classmethod
+    def use_response_times(cls, response_times, percentile: float = 0.75):
+        """
+        Schedule follow-ups from learned time-to-response distributions
+        (a ResponseTimeTracker); pass None or percentile <= 0 to use fixed intervals.
+        """
+        cls.response_times = response_times if percentile > 0 else None
+        cls.learned_percentile = percentile
+
+    @staticmethod
+    def followup_interval(
+        current_status: str,
+        company: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> float:
+        """Days until the next follow-up for a status (0 = no follow-up)."""
+        interval = FollowupManager.FOLLOWUP_INTERVALS.get(current_status, 0)
+        response_times = FollowupManager.response_times
+        if interval == 0 or response_times is None:
+            return interval
+
+        learned = response_times.learned_interval(
+            current_status, company, source, FollowupManager.learned_percentile
+        )
+        if learned is None:
+            return interval
+        return min(max(round(learned), FollowupManager.MIN_LEARNED_INTERVAL), interval * 2)
+
     @staticmethod
     def calculate_next_followup(
         current_status: str,
         submitted_date: Optional[str] = None,
-        last_followup_date: Optional[str] = None
+        last_followup_date: Optional[str] = None,
+        company: Optional[str] = None,
+        source: Optional[str] = None
     ) -> Optional[str]:
         """
         Calculate next follow-up date based on current status.
@@ -86,11 +133,13 @@ Best regards,
             current_status: Current application status
             submitted_date: ISO date when application was submitted
             last_followup_date: ISO date of last follow-up attempt
+            company: Company name (for learned per-company intervals)
+            source: Apply URL or ATS domain (for learned per-source intervals)
         
         Returns:
             ISO date string for next follow-up, or None if no follow-up needed
         """
-        interval = FollowupManager.FOLLOWUP_INTERVALS.get(current_status, 0)
+        interval = FollowupManager.followup_interval(current_status, company, source)
         
         if interval == 0:
             return None  # No follow-up needed for this status
@@ -124,25 +173,34 @@ Best regards,
         Returns:
             Formatted email template, or None if no template available
         """
-        template = FollowupManager.FOLLOWUP_TEMPLATES.get(current_status)
+        engine = FollowupManager.template_engine()
+        name = f"followup_{current_status}"
         
-        if not template:
+        if not engine.has(name):
             return None
         
-        # Format template with variables
-        submitted_str = ""
-        if submitted_date:
-            try:
-                date_obj = datetime.fromisoformat(submitted_date)
-                submitted_str = date_obj.strftime("%B %d, %Y")
-            except (ValueError, TypeError):
-                submitted_str = submitted_date
-        
-        return template.format(
-            company=company,
-            role=role,
-            submitted_date=submitted_str
-        ).strip()
+        return engine.render(name, {
+            "company": company,
+            "role": role,
+            "submitted_date": _format_submitted_date(submitted_date) if submitted_date else ""
+        }).strip()
+    
+    _template_engine: Optional[TemplateEngine] = None
+    
+    @classmethod
+    def template_engine(cls) -> TemplateEngine:
+        """
+        Compiled follow-up templates (followup_<status>), with user overrides
+        loaded from followup_<status>.txt files in the template directory.
+        """
+        if cls._template_engine is None:
+            engine = TemplateEngine({
+                f"followup_{status}": template
+                for status, template in cls.FOLLOWUP_TEMPLATES.items()
+            })
+            engine.load_directory(user_template_dir(), prefix="followup_")
+            cls._template_engine = engine
+        return cls._template_engine
     
     @staticmethod
     def get_status_transitions() -> Dict[str, List[str]]:
@@ -187,46 +245,65 @@ Best regards,
     
     @staticmethod
     def get_followups_needed(
-        applications: Dict[str, 'Application']
+        applications: Union['ApplicationTracker', Dict[str, 'Application']],
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         Get list of applications needing follow-up.
         
+        Args:
+            applications: An ApplicationTracker (uses its sorted follow-up index)
+                          or a dict of job_id -> Application (full scan)
+            limit: Return at most this many (most overdue first); templates are
+                   only rendered for the entries returned
+        
         Returns sorted list of {job_id, company, role, next_followup_at, template}
         """
         today = datetime.now()
-        needing_followup = []
         
-        for job_id, app in applications.items():
+        if hasattr(applications, "get_applications_due_for_followup"):
+            due = applications.get_applications_due_for_followup(today.date(), limit=limit)
+        else:
+            due = FollowupManager._scan_due_followups(applications, today.date())
+            if limit is not None and limit >= 0:
+                due = due[:limit]
+        
+        return [FollowupManager._followup_entry(app, today) for app in due]
+    
+    @staticmethod
+    def _scan_due_followups(applications: Dict[str, 'Application'], as_of: date) -> List['Application']:
+        """Due applications from a plain dict, most overdue first."""
+        due = []
+        for app in applications.values():
             if not app.next_followup_at:
                 continue
-            
             try:
-                followup_date = datetime.fromisoformat(app.next_followup_at)
-                
-                # If followup date has passed or is today
-                if followup_date.date() <= today.date():
-                    template = FollowupManager.get_followup_template(
-                        app.status,
-                        app.company,
-                        app.role,
-                        app.submitted_at
-                    )
-                    
-                    needing_followup.append({
-                        "job_id": job_id,
-                        "company": app.company,
-                        "role": app.role,
-                        "status": app.status,
-                        "next_followup_at": app.next_followup_at,
-                        "days_overdue": (today.date() - followup_date.date()).days,
-                        "template": template
-                    })
+                followup_date = datetime.fromisoformat(app.next_followup_at).date()
             except (ValueError, TypeError):
                 continue
+            if followup_date <= as_of:
+                due.append((followup_date, app.next_followup_at, app))
         
-        # Sort by days overdue (most urgent first)
-        return sorted(needing_followup, key=lambda x: x["days_overdue"], reverse=True)
+        due.sort(key=lambda entry: entry[:2])
+        return [app for _, _, app in due]
+    
+    @staticmethod
+    def _followup_entry(app: 'Application', today: datetime) -> Dict:
+        followup_date = datetime.fromisoformat(app.next_followup_at)
+        return {
+            "job_id": app.job_id,
+            "company": app.company,
+            "role": app.role,
+            "status": app.status,
+            "next_followup_at": app.next_followup_at,
+            "days_overdue": (today.date() - followup_date.date()).days,
+            "template": FollowupManager.get_followup_template(
+                app.status,
+                app.company,
+                app.role,
+                app.submitted_at
+            )
+        }
 
 
 def test_followup_manager():
@@ -0,0 +1,136 @@
+"""
+Page readiness waits for application automation (Stage 9)
+Replaces a fixed post-navigation sleep with a race between the ATS form selectors
+appearing and the network going idle. How long each ATS takes to become ready is
+recorded, and the wait cap adapts to the observed tail latency.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class ReadinessTracker:
+    """Readiness waits plus per-ATS timing stats and adaptive timeouts."""
+
+    def __init__(
+        self,
+        max_wait_ms: int = 10000,
+        min_wait_ms: int = 1500,
+        headroom: float = 2.0,
+        min_samples: int = 5,
+        window: int = 200
+    ):
+        """
+        Args:
+            max_wait_ms: Hard cap on any readiness wait
+            min_wait_ms: Lower bound for the adaptive cap
+            headroom: Adaptive cap = headroom x observed p95 ready time
+            min_samples: Samples per ATS before the cap adapts (max_wait_ms until then)
+            window: Most recent samples kept per ATS
+        """
+        self.max_wait_ms = max_wait_ms
+        self.min_wait_ms = min_wait_ms
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._outcomes: Dict[str, Dict[str, int]] = {}
+
+    def timeout_ms(self, ats: str) -> int:
+        """Current wait cap for an ATS."""
+        samples = self._samples.get(ats)
+        if not samples or len(samples) < self.min_samples:
+            return self.max_wait_ms
+        p95 = _percentile(sorted(samples), 0.95)
+        return int(min(self.max_wait_ms, max(self.min_wait_ms, p95 * self.headroom)))
+
+    def record(self, ats: str, elapsed_ms: float, outcome: str):
+        """Record one readiness wait (outcome: selector, network_idle or timeout)."""
+        self._samples.setdefault(ats, deque(maxlen=self.window)).append(elapsed_ms)
+        outcomes = self._outcomes.setdefault(ats, {})
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    async def wait_until_ready(self, page, ats: str, selectors: List[str]) -> Dict:
+        """
+        Wait until any form selector is attached or the network is idle,
+        whichever comes first, capped at the ATS's adaptive timeout.
+        Never raises on timeout: the page is used as-is, as before.
+        """
+        timeout = self.timeout_ms(ats)
+        started = time.perf_counter()
+
+        waits = {
+            asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=timeout)): "network_idle"
+        }
+        if selectors:
+            waits[asyncio.ensure_future(
+                page.wait_for_selector(", ".join(selectors), state="attached", timeout=timeout)
+            )] = "selector"
+
+        outcome = "timeout"
+        pending = set(waits)
+        try:
+            while pending and outcome == "timeout":
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        outcome = waits[task]
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.record(ats, elapsed_ms, outcome)
+        return {"ats": ats, "outcome": outcome, "elapsed_ms": int(elapsed_ms), "timeout_ms": timeout}
+
+    def stats(self) -> Dict:
+        """Ready-time percentiles, outcomes and current wait cap per ATS."""
+        result = {}
+        for ats, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[ats] = {
+                "samples": len(ordered),
+                "p50_ms": int(_percentile(ordered, 0.5)),
+                "p95_ms": int(_percentile(ordered, 0.95)),
+                "max_ms": int(ordered[-1]),
+                "outcomes": dict(self._outcomes.get(ats, {})),
+                "timeout_ms": self.timeout_ms(ats)
+            }
+        return result
+
+
+def test_readiness():
+    """Test racing waits and adaptive timeouts with a fake page."""
+
+    class FakePage:
+        def __init__(self, form_after: float):
+            self.form_after = form_after
+
+        async def wait_for_load_state(self, state, timeout):
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError("networkidle")
+
+        async def wait_for_selector(self, selector, state, timeout):
+            if self.form_after * 1000 > timeout:
+                await asyncio.sleep(timeout / 1000)
+                raise TimeoutError(selector)
+            await asyncio.sleep(self.form_after)
+
+    readiness = ReadinessTracker(max_wait_ms=500, min_wait_ms=50)
+    for delay in (0.01, 0.02, 0.01, 0.03, 0.02, 0.01):
+        print(asyncio.run(readiness.wait_until_ready(FakePage(delay), "lever", ["form"])))
+    print(readiness.stats())
+
+
+if __name__ == "__main__":
+    test_readiness()
@@ -0,0 +1,91 @@
+"""
+Compiled requirement detector (Stage 9)
+Flags ambiguous application questions (visa, relocation, salary, ...) in a job
+description. Keyword groups live in config/requirement_rules.json and each category
+is compiled once into a case-insensitive alternation, so categories sharing a keyword
+(or with overlapping keywords) are all reported, together with the offsets of the
+matching keywords.
+
+Rules format:
+    {"<category>": {"description": "...", "question": "...", "keywords": ["literal", ...], "patterns": ["regex", ...]}}
+Keywords match as case-insensitive substrings; patterns are raw regular expressions.
+"question" is the application question the category stands for (asked of the user
+and used to look up saved answers).
+"""
+
+import functools
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_RULES_FILE = Path(__file__).parent.parent / "config" / "requirement_rules.json"
+
+
+class RequirementDetector:
+    """Precompiled per-category matcher over job descriptions."""
+
+    def __init__(self, rules_path: Optional[Path] = None, cache_size: int = 1024):
+        """
+        Args:
+            rules_path: Category keyword rules (config/requirement_rules.json)
+            cache_size: Job descriptions whose detected categories are memoized
+        """
+        self.rules_path = Path(rules_path or DEFAULT_RULES_FILE)
+        if not self.rules_path.exists():
+            raise FileNotFoundError(f"Requirement rules not found: {self.rules_path}")
+        self.rules: Dict[str, Dict] = json.loads(self.rules_path.read_text(encoding="utf-8"))
+        self.patterns = self._compile(self.rules)
+        self.categories = functools.lru_cache(maxsize=cache_size)(self._categories)
+
+    @staticmethod
+    def _compile(rules: Dict[str, Dict]) -> Dict[str, "re.Pattern"]:
+        """
+        One pattern per category, in rules order; longer keywords first so e.g.
+        "salary range" wins over "salary". Separate patterns (rather than one
+        alternation of groups) so a keyword shared by two categories triggers both.
+        """
+        patterns = {}
+        for category, rule in rules.items():
+            keywords = sorted(rule.get("keywords", []), key=len, reverse=True)
+            parts = [re.escape(keyword) for keyword in keywords] + list(rule.get("patterns", []))
+            if parts:
+                patterns[category] = re.compile("|".join(parts), re.IGNORECASE)
+        return patterns
+
+    def detect(self, text: str) -> Dict[str, List[Dict]]:
+        """Every triggered category with its matches: [{"keyword", "start", "end"}], in text order."""
+        text = text or ""
+        matches: Dict[str, List[Dict]] = {}
+        # Categories in rules order, as map_job_requirements_to_profile reported them
+        for category, pattern in self.patterns.items():
+            found = [
+                {"keyword": match.group(), "start": match.start(), "end": match.end()}
+                for match in pattern.finditer(text)
+            ]
+            if found:
+                matches[category] = found
+        return matches
+
+    def question(self, category: str) -> str:
+        """Application question for a category (falls back to its name for unknown categories)."""
+        rule = self.rules.get(category, {})
+        return rule.get("question") or rule.get("description") or category.replace("_", " ")
+
+    def _categories(self, text: str) -> Tuple[str, ...]:
+        return tuple(category for category, pattern in self.patterns.items() if pattern.search(text))
+
+
+def test_requirement_detector():
+    """Test detection with offsets."""
+    detector = RequirementDetector()
+    jd = "Backend role. Visa sponsorship available. Salary range $150k-$180k. Remote friendly; start date flexible."
+    for category, matches in detector.detect(jd).items():
+        print(f"{category}: {[(m['keyword'], m['start'], m['end']) for m in matches]}")
+    print(detector.categories(jd))
+    print({category: pattern.pattern[:40] for category, pattern in detector.patterns.items()})
+
+
+if __name__ == "__main__":
+    test_requirement_detector()
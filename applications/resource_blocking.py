@@ -0,0 +1,147 @@
+"""
+Request interception for application pages (Stage 9)
+Aborts requests that don't matter for filling forms - images, media, fonts and
+analytics/tracker domains - and counts what was saved.
+
+Saved bytes are an estimate, not a measurement: an aborted request never gets a
+response, so each one is counted at the per-type average in
+resource_blocking.estimated_bytes (config/form_rules.json). For measured numbers,
+compare the bytes served in benchmarks/browser_benchmark.py runs with and
+without --no-blocking.
+
+Policy comes from "resource_blocking" in config/form_rules.json. An ATS section
+may carry its own "resource_blocking": its resource_types / enabled replace the
+defaults and its blocked_domains are added to the default list.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+DEFAULT_ESTIMATED_BYTES = 5000  # Per blocked request of a type without an estimate (or "other")
+
+
+class ResourceBlocker:
+    """Per-ATS request blocking policy plus blocked request/byte counters."""
+
+    def __init__(self, form_rules: Dict):
+        self.form_rules = form_rules
+        self.defaults = form_rules.get("resource_blocking", {})
+        self.estimated_bytes: Dict[str, int] = self.defaults.get("estimated_bytes", {})
+        self._policies: Dict[str, Tuple[bool, frozenset, Tuple[str, ...]]] = {}
+        self._stats: Dict[str, Dict] = {}
+
+    def policy(self, ats: str) -> Tuple[bool, frozenset, Tuple[str, ...]]:
+        """(enabled, blocked resource types, blocked domains) for an ATS."""
+        policy = self._policies.get(ats)
+        if policy is None:
+            rules = self.form_rules.get(ats)
+            override = rules.get("resource_blocking", {}) if isinstance(rules, dict) else {}
+            policy = (
+                bool(override.get("enabled", self.defaults.get("enabled", False))),
+                frozenset(override.get("resource_types", self.defaults.get("resource_types", []))),
+                tuple(
+                    domain.lower().lstrip(".")
+                    for domain in self.defaults.get("blocked_domains", []) + override.get("blocked_domains", [])
+                )
+            )
+            self._policies[ats] = policy
+        return policy
+
+    def block_reason(self, ats: str, resource_type: str, url: str) -> Optional[str]:
+        """"type" or "domain" if a request should be aborted, else None."""
+        enabled, resource_types, domains = self.policy(ats)
+        if not enabled:
+            return None
+        if resource_type in resource_types:
+            return "type"
+        host = (urlparse(url).hostname or "").lower()
+        if any(host == domain or host.endswith("." + domain) for domain in domains):
+            return "domain"
+        return None
+
+    def _record(self, ats: str, resource_type: str, reason: Optional[str]):
+        stats = self._stats.setdefault(ats, {
+            "requests": 0,
+            "blocked": 0,
+            "blocked_by_type": {},
+            "blocked_by_domain": 0,
+            "estimated_bytes_saved": 0
+        })
+        stats["requests"] += 1
+        if reason is None:
+            return
+        stats["blocked"] += 1
+        if reason == "domain":
+            stats["blocked_by_domain"] += 1
+        else:
+            by_type = stats["blocked_by_type"]
+            by_type[resource_type] = by_type.get(resource_type, 0) + 1
+        stats["estimated_bytes_saved"] += self.estimated_bytes.get(
+            resource_type, self.estimated_bytes.get("other", DEFAULT_ESTIMATED_BYTES)
+        )
+
+    async def attach(self, page, ats: str) -> bool:
+        """Route a page's requests through the ATS policy. False if blocking is disabled."""
+        if not self.policy(ats)[0]:
+            return False
+
+        async def handle(route, request):
+            reason = self.block_reason(ats, request.resource_type, request.url)
+            self._record(ats, request.resource_type, reason)
+            try:
+                if reason:
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+            except Exception:
+                pass  # Page closed while the request was in flight
+
+        await page.route("**/*", handle)
+        return True
+
+    def stats(self) -> Dict:
+        """
+        Requests seen and blocked per ATS, with estimated_bytes_saved: blocked requests
+        times the configured per-type averages (not measured; see module docstring).
+        """
+        per_ats = {ats: {**s, "blocked_by_type": dict(s["blocked_by_type"])} for ats, s in self._stats.items()}
+        requests = sum(s["requests"] for s in per_ats.values())
+        blocked = sum(s["blocked"] for s in per_ats.values())
+        return {
+            "requests": requests,
+            "blocked": blocked,
+            "blocked_ratio": round(blocked / requests, 3) if requests else 0.0,
+            "estimated_bytes_saved": sum(s["estimated_bytes_saved"] for s in per_ats.values()),
+            "ats": per_ats
+        }
+
+
+def test_resource_blocking():
+    """Test policy resolution and counters (no browser)."""
+    rules = {
+        "greenhouse": {"selectors": {}, "resource_blocking": {"blocked_domains": ["cdn.cookielaw.org"]}},
+        "resource_blocking": {
+            "enabled": True,
+            "resource_types": ["image", "font"],
+            "blocked_domains": ["google-analytics.com"],
+            "estimated_bytes": {"image": 45000, "font": 35000, "script": 60000}
+        }
+    }
+    blocker = ResourceBlocker(rules)
+    requests: List[Tuple[str, str]] = [
+        ("document", "https://boards.greenhouse.io/acme/jobs/1"),
+        ("image", "https://boards.greenhouse.io/logo.png"),
+        ("script", "https://www.google-analytics.com/analytics.js"),
+        ("script", "https://cdn.cookielaw.org/consent.js"),
+        ("font", "https://fonts.gstatic.com/x.woff2")
+    ]
+    for resource_type, url in requests:
+        reason = blocker.block_reason("greenhouse", resource_type, url)
+        blocker._record("greenhouse", resource_type, reason)
+        print(f"{resource_type:8} {reason or 'allowed':8} {url}")
+    print(blocker.stats())
+
+
+if __name__ == "__main__":
+    test_resource_blocking()
@@ -0,0 +1,371 @@
+"""
+Time-to-response distributions for adaptive follow-ups (Stage 9)
+Streams the time applications spend in each status (e.g. submitted -> any response)
+into mergeable quantile sketches per company and per source (ATS domain), so
+follow-up intervals can use a learned percentile instead of a fixed number of days.
+"""
+
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from applications.storage import FileLock
+from applications.urls import apply_domain
+
+
+# Statuses whose dwell time drives follow-ups
+TRACKED_STATUSES = ("submitted", "viewed")
+
+
+class QuantileSketch:
+    """
+    DDSketch-style log-bucketed quantile sketch.
+    Quantiles are within `relative_accuracy` of the true value; memory is bounded
+    by max_buckets (lowest buckets are merged when exceeded).
+    """
+
+    MIN_VALUE = 1e-3  # Smaller values (days) count as zero
+
+    def __init__(self, relative_accuracy: float = 0.02, max_buckets: int = 256):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        value = max(0.0, float(value))
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value < self.MIN_VALUE:
+            self.zero_count += 1
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def _collapse_lowest(self):
+        keys = sorted(self.buckets)
+        lowest, next_lowest = keys[0], keys[1]
+        self.buckets[next_lowest] += self.buckets.pop(lowest)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0..1), or None if empty."""
+        if self.count == 0:
+            return None
+        q = min(1.0, max(0.0, q))
+        rank = q * (self.count - 1)
+
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "QuantileSketch"):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse_lowest()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(data.get("relative_accuracy", 0.02), data.get("max_buckets", 256))
+        sketch.buckets = {int(k): v for k, v in data.get("buckets", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        sketch.min = data["min"] if data.get("min") is not None else math.inf
+        sketch.max = data["max"] if data.get("max") is not None else -math.inf
+        return sketch
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_days": round(self.total / self.count, 2) if self.count else None,
+            "p50_days": _round(self.quantile(0.5)),
+            "p75_days": _round(self.quantile(0.75)),
+            "p90_days": _round(self.quantile(0.9)),
+            "max_days": _round(self.max) if self.count else None
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def _days_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    try:
+        return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds() / 86400
+    except (TypeError, ValueError):
+        return None
+
+
+class ResponseTimeTracker:
+    """
+    Per-status sketches of days spent before the next transition, keyed by
+    "all", "company:<name>" and "source:<ats domain>". Persisted as JSON.
+
+    Several processes (the MCP server and the dashboard) may share one file: new
+    observations are kept as a pending delta and merged into the file's current
+    sketches under a file lock, at most every `save_every` observations or
+    `save_interval` seconds (and at exit).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        relative_accuracy: float = 0.02,
+        save_every: int = 20,
+        save_interval: float = 30.0
+    ):
+        self.path = Path(path)
+        self.relative_accuracy = relative_accuracy
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.path.with_suffix(self.path.suffix + ".lock"))
+        self.sketches: Dict[str, Dict[str, QuantileSketch]] = self._read()
+        # Observations not yet merged into the file
+        self._pending: Dict[str, Dict[str, QuantileSketch]] = {status: {} for status in TRACKED_STATUSES}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    def _read(self) -> Dict[str, Dict[str, QuantileSketch]]:
+        sketches: Dict[str, Dict[str, QuantileSketch]] = {status: {} for status in TRACKED_STATUSES}
+        if not self.path.exists():
+            return sketches
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading response times: {e}")
+            return sketches
+        for status, keyed in data.get("sketches", {}).items():
+            sketches[status] = {key: QuantileSketch.from_dict(s) for key, s in keyed.items()}
+        return sketches
+
+    def _write(self, sketches: Dict[str, Dict[str, QuantileSketch]]):
+        data = {"sketches": {
+            status: {key: sketch.to_dict() for key, sketch in keyed.items()}
+            for status, keyed in sketches.items()
+        }}
+        # Unique temp name: other processes may be writing the same file
+        fd, tmp_name = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def flush(self):
+        """Merge pending observations into the file and reload what other processes saved."""
+        with self._file_lock.exclusive():
+            with self._lock:
+                pending, count = self._pending, self._pending_count
+                self._pending = {status: {} for status in TRACKED_STATUSES}
+                self._pending_count = 0
+                self._last_flush = time.monotonic()
+            merged = self._read()
+            for status, keyed in pending.items():
+                target = merged.setdefault(status, {})
+                for key, sketch in keyed.items():
+                    if key in target:
+                        target[key].merge(sketch)
+                    else:
+                        target[key] = sketch
+            if count:
+                self._write(merged)
+            with self._lock:
+                # Observations made while merging stay pending and visible
+                for status, keyed in self._pending.items():
+                    for key, sketch in keyed.items():
+                        copy = QuantileSketch.from_dict(sketch.to_dict())
+                        if key in merged.setdefault(status, {}):
+                            merged[status][key].merge(copy)
+                        else:
+                            merged[status][key] = copy
+                self.sketches = merged
+
+    def close(self):
+        """Save observations still pending (registered at exit by attach)."""
+        if self._pending_count:
+            self.flush()
+
+    def _maybe_flush(self):
+        with self._lock:
+            due = self._pending_count >= self.save_every or (
+                self._pending_count and time.monotonic() - self._last_flush >= self.save_interval
+            )
+        if due:
+            self.flush()
+
+    @staticmethod
+    def sketch_keys(company: Optional[str], source: Optional[str]):
+        keys = ["all"]
+        if company:
+            keys.append(f"company:{company.strip().lower()}")
+        if source:
+            keys.append(f"source:{apply_domain(source) if '/' in source else source.lower()}")
+        return keys
+
+    def observe(self, status: str, days: float, company: Optional[str] = None, source: Optional[str] = None):
+        """Record that an application spent `days` in `status` before its next transition."""
+        if status not in self.sketches or days is None or days < 0:
+            return
+        with self._lock:
+            for sketches in (self.sketches, self._pending):
+                keyed = sketches[status]
+                for key in self.sketch_keys(company, source):
+                    sketch = keyed.get(key)
+                    if sketch is None:
+                        sketch = keyed[key] = QuantileSketch(self.relative_accuracy)
+                    sketch.add(days)
+            self._pending_count += 1
+
+    def _observe_history(self, app, history):
+        # Entering time of each status: history timestamps, with submitted_at for
+        # applications created as submitted (no history entry)
+        previous_status, previous_at = None, None
+        if app.submitted_at and not any(c.get("status") == "submitted" for c in history):
+            previous_status, previous_at = "submitted", app.submitted_at
+        for change in history:
+            if previous_status is not None:
+                self.observe(previous_status, _days_between(previous_at, change.get("timestamp")),
+                             app.company, app.apply_url)
+            previous_status, previous_at = change.get("status"), change.get("timestamp")
+
+    def backfill(self, applications: Iterable):
+        """Rebuild all sketches from application histories (replaces the file)."""
+        with self._lock:
+            self.sketches = {status: {} for status in TRACKED_STATUSES}
+        for app in applications:
+            self._observe_history(app, app.status_history)
+        with self._file_lock.exclusive(), self._lock:
+            self._write(self.sketches)
+            self._pending = {status: {} for status in TRACKED_STATUSES}
+            self._pending_count = 0
+
+    def record(self, event: Dict, app):
+        """Tracker listener: observe the dwell time that a status change just ended."""
+        if event.get("op") != "update" or not event.get("status_change"):
+            return
+        # Listeners run after a whole batch: locate this change by its history index
+        history = app.status_history
+        seq = event.get("status_seq", len(history) - 1)
+        if not 0 <= seq < len(history):
+            return
+        if seq >= 1:
+            previous = history[seq - 1]
+            previous_status, previous_at = previous.get("status"), previous.get("timestamp")
+        elif app.submitted_at and history[seq].get("status") != "submitted":
+            previous_status, previous_at = "submitted", app.submitted_at
+        else:
+            return
+        days = _days_between(previous_at, history[seq].get("timestamp"))
+        if previous_status in self.sketches and days is not None:
+            self.observe(previous_status, days, app.company, app.apply_url)
+            self._maybe_flush()
+
+    def attach(self, tracker) -> "ResponseTimeTracker":
+        """Follow a tracker's status changes (backfilling from history on first use)."""
+        if not self.path.exists():
+            self.backfill(tracker.applications.values())
+        tracker.subscribe(self.record)
+        atexit.register(self.close)
+        return self
+
+    def learned_interval(
+        self,
+        status: str,
+        company: Optional[str] = None,
+        source: Optional[str] = None,
+        percentile: float = 0.75,
+        min_samples: int = 5
+    ) -> Optional[float]:
+        """
+        Days by which `percentile` of applications have moved on from `status`,
+        from the most specific sketch with enough samples (company, then source, then all).
+        """
+        with self._lock:  # flush() swaps in merged sketches under this lock
+            keyed = self.sketches.get(status, {})
+            keys = self.sketch_keys(company, source)
+            for key in keys[1:] + keys[:1]:  # company, source, then all
+                sketch = keyed.get(key)
+                if sketch is not None and sketch.count >= min_samples:
+                    return sketch.quantile(percentile)
+        return None
+
+    def summary(self, status: Optional[str] = None, key: Optional[str] = None) -> Dict:
+        """Percentile summaries per status and key."""
+        with self._lock:
+            return {
+                s: {k: sketch.summary() for k, sketch in keyed.items() if not key or k == key}
+                for s, keyed in self.sketches.items()
+                if not status or s == status
+            }
+
+
+def test_response_times():
+    """Test sketches and learned intervals."""
+    import random
+    import tempfile
+
+    sketch = QuantileSketch()
+    values = [random.expovariate(1 / 10) for _ in range(10000)]
+    for value in values:
+        sketch.add(value)
+    values.sort()
+    for q in (0.5, 0.75, 0.9, 0.99):
+        print(f"p{int(q * 100)}: sketch={sketch.quantile(q):.2f} exact={values[int(q * (len(values) - 1))]:.2f}")
+    print(f"Buckets: {len(sketch.buckets)}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        times = ResponseTimeTracker(Path(tmpdir) / "response_times.json")
+        for days in (3, 4, 5, 6, 7):
+            times.observe("submitted", days, "FastCo", "https://jobs.lever.co/fastco/1")
+        print(f"FastCo p75: {times.learned_interval('submitted', 'FastCo'):.1f} days")
+        print(times.summary("submitted"))
+
+
+if __name__ == "__main__":
+    test_response_times()
@@ -0,0 +1,136 @@
+"""
+Learned selector cache for form detection (Stage 9)
+Remembers which selectors matched on each apply-URL domain and form layout
+(a fingerprint of the form's inputs), so later applications on the same board
+try known-good selectors first and skip sniffing the ATS from page content.
+Persisted as JSON next to the other application data.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class SelectorCache:
+    """Per-domain, per-layout matched selectors with hit/miss statistics."""
+
+    def __init__(self, path: Path, max_layouts_per_domain: int = 20):
+        """
+        Args:
+            path: JSON file the cache is persisted to
+            max_layouts_per_domain: Layouts kept per domain (least recently used are dropped)
+        """
+        self.path = Path(path)
+        self.max_layouts_per_domain = max_layouts_per_domain
+        self._lock = threading.Lock()
+        # domain -> fingerprint -> {"ats", "fields": {name: selector}, "hits", "updated_at"}
+        self.domains: Dict[str, Dict[str, Dict]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            self.domains = json.loads(self.path.read_text(encoding="utf-8")).get("domains", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading selector cache: {e}")
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({"domains": self.domains}, indent=2)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def layouts(self, domain: str) -> Dict[str, Dict]:
+        """Known layouts for a domain: {fingerprint: {"ats", "fields"}} (shipped into the page)."""
+        with self._lock:
+            return {
+                fingerprint: {"ats": layout["ats"], "fields": dict(layout["fields"])}
+                for fingerprint, layout in self.domains.get(domain, {}).items()
+            }
+
+    def record(
+        self,
+        domain: str,
+        fingerprint: str,
+        ats: str,
+        fields: Dict[str, str],
+        outcome: str
+    ):
+        """
+        Record a detection result.
+
+        Args:
+            domain: Apply-URL domain
+            fingerprint: Form layout fingerprint
+            ats: ATS rule set the selectors came from
+            fields: Matched selector per field name
+            outcome: "hit" (all cached selectors matched), "stale" (known layout,
+                     some cached selector stopped matching) or "miss" (new layout)
+        """
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "stale":
+                self.stale += 1
+            else:
+                self.misses += 1
+
+            layouts = self.domains.setdefault(domain, {})
+            layout = layouts.pop(fingerprint, None)  # Re-inserted last (most recently used)
+            changed = layout is None or layout["fields"] != fields or layout["ats"] != ats
+            layout = layout or {"hits": 0}
+            layout.update({"ats": ats, "fields": fields, "updated_at": datetime.now().isoformat()})
+            if outcome == "hit":
+                layout["hits"] += 1
+            layouts[fingerprint] = layout
+            while len(layouts) > self.max_layouts_per_domain:
+                layouts.pop(next(iter(layouts)))
+
+        if changed:
+            self.save()  # Hits only bump counters; no need to rewrite the file
+
+    def stats(self, domain: Optional[str] = None) -> Dict:
+        """Hit/miss counters (this process) and learned layouts per domain."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.stale
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "domains": {
+                    d: {
+                        "layouts": len(layouts),
+                        "hits": sum(layout["hits"] for layout in layouts.values()),
+                        "ats": sorted({layout["ats"] for layout in layouts.values()})
+                    }
+                    for d, layouts in self.domains.items()
+                    if domain is None or d == domain
+                }
+            }
+
+
+def test_selector_cache():
+    """Test recording, lookup and persistence."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SelectorCache(Path(tmpdir) / "selector_cache.json")
+        fields = {"email": "input[name='email']", "phone": "input[name='phone']"}
+        cache.record("jobs.lever.co", "a1b2c3d4", "lever", fields, "miss")
+        cache.record("jobs.lever.co", "a1b2c3d4", "lever", fields, "hit")
+        print(cache.layouts("jobs.lever.co"))
+        print(SelectorCache(Path(tmpdir) / "selector_cache.json").stats())
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    test_selector_cache()
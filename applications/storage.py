@@ -0,0 +1,508 @@
+"""
+Storage backends for ApplicationTracker.
+Backends persist flat application rows (JSON columns kept as serialized text),
+so the tracker owns the Application model and backends stay format-only.
+
+Writes are expressed as events:
+    {"op": "put", "row": {...}}                                    new application
+    {"op": "update", "job_id": ..., "fields": {...},
+     "status_change": {"status", "timestamp", "notes"},
+     "status_seq": <index of status_change in status_history>}     field / status update
+
+Several processes (the MCP server and the dashboard) may share one applications
+directory: writers take an advisory lock and every store can report changes made
+by other processes since it last looked (poll_changes).
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Column order of applications.csv (also the SQLite schema)
+APPLICATION_FIELDS = [
+    'job_id', 'company', 'role', 'apply_url', 'status',
+    'submitted_at', 'filled_fields', 'ambiguous_fields_filled',
+    'status_history', 'last_followup_at', 'next_followup_at', 'notes'
+]
+
+
+def apply_event(rows: Dict[str, Dict[str, str]], event: Dict):
+    """
+    Apply one event to in-memory rows.
+    Idempotent, so replaying a log tail that a snapshot already contains is harmless.
+    """
+    if event.get("op") == "put":
+        row = event["row"]
+        rows[row['job_id']] = dict(row)
+        return
+
+    row = rows.get(event.get("job_id"))
+    if row is None:
+        return
+
+    row.update(event.get("fields") or {})
+
+    change = event.get("status_change")
+    if change:
+        try:
+            history = json.loads(row.get('status_history') or '[]')
+        except json.JSONDecodeError:
+            history = []
+        if change not in history:
+            history.append(change)
+            row['status_history'] = json.dumps(history)
+
+
+class FileLock:
+    """
+    Advisory inter-process lock on a lock file (flock on POSIX, msvcrt on Windows).
+    Shared mode lets readers proceed together; exclusive mode serializes writers.
+    Also serializes threads within this process.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._depth = 0
+
+    @contextmanager
+    def shared(self):
+        with self._acquire(exclusive=False):
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        with self._acquire(exclusive=True):
+            yield
+
+    @contextmanager
+    def _acquire(self, exclusive: bool):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                else:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)  # Exclusive only
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._fd, fcntl.LOCK_UN)
+                    else:
+                        os.lseek(self._fd, 0, os.SEEK_SET)
+                        msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+                    os.close(self._fd)
+                    self._fd = None
+
+
+class ApplicationStore:
+    """Storage backend interface."""
+
+    name = "base"
+
+    def load_rows(self) -> Iterator[Dict[str, str]]:
+        """Yield every stored application row."""
+        raise NotImplementedError
+
+    def append_event(self, event: Dict) -> Optional[Dict[str, Dict[str, str]]]:
+        """Durably record a single put/update event."""
+        return self.append_events([event])
+
+    def append_events(self, events: List[Dict]) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Durably record several events as one write.
+        Returns the same as poll_changes for writes by other processes picked up on the way.
+        """
+        raise NotImplementedError
+
+    def poll_changes(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Rows changed by other processes since the last load/poll/append:
+        {job_id: row} ({} when nothing changed), or None when a full reload is needed.
+        """
+        return {}
+
+    def write_lock(self):
+        """
+        Context manager held around a tracker's read-modify-write so it cannot
+        interleave with another process's write (no-op where the backend handles it).
+        """
+        return nullcontext()
+
+    def signature(self) -> Optional[str]:
+        """
+        Token that changes whenever the stored applications change, stable across
+        processes and restarts (None: unknown, callers must assume data changed).
+        """
+        return None
+
+    # Optional indexed queries; None means "not supported, compute in memory"
+
+    def job_ids_by_status(self, status: str) -> Optional[List[str]]:
+        return None
+
+    def compact(self):
+        """Fold pending log entries into the primary data file (no-op if not applicable)."""
+        pass
+
+    def close(self):
+        pass
+
+
+class CsvApplicationStore(ApplicationStore):
+    """
+    CSV snapshot (applications.csv) plus an append-only event log
+    (applications.events.jsonl). Every write is one fsync'd log append; the log
+    is folded into a fresh snapshot every `compact_every` events.
+    Loading reads the snapshot and replays the log tail.
+
+    Writers hold an exclusive lock on applications.lock. Other processes' writes
+    are picked up by replaying the log from the last byte offset this store read;
+    a changed snapshot (another process compacted) requires a full reload.
+    """
+
+    name = "csv"
+
+    def __init__(self, csv_path: Path, compact_every: int = 1000):
+        self.csv_path = Path(csv_path)
+        self.log_path = self.csv_path.with_suffix('.events.jsonl')
+        self.lock = FileLock(self.csv_path.with_suffix('.lock'))
+        self.compact_every = compact_every
+        self._rows: Dict[str, Dict[str, str]] = {}
+        self._pending_events = 0
+        self._log_offset = 0
+        self._snapshot_signature = None
+        with self.lock.exclusive():
+            self._ensure_csv_exists()
+
+    def _ensure_csv_exists(self):
+        """Ensure CSV file exists with headers."""
+        if not self.csv_path.exists():
+            with open(self.csv_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=APPLICATION_FIELDS)
+                writer.writeheader()
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _read_snapshot(self) -> Dict[str, Dict[str, str]]:
+        rows = {}
+        if self.csv_path.exists():
+            with open(self.csv_path, 'r', newline='') as f:
+                for row in csv.DictReader(f):
+                    if row.get('job_id'):
+                        rows[row['job_id']] = row  # Later duplicate rows win
+        return rows
+
+    def _read_log(self, offset: int) -> List[Dict]:
+        """Complete events from the log starting at a byte offset; advances _log_offset."""
+        if not self.log_path.exists():
+            self._log_offset = 0
+            return []
+        events = []
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn final write from a crash (or a write in progress)
+                offset += len(line)
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        self._log_offset = offset
+        return events
+
+    def load_rows(self) -> Iterator[Dict[str, str]]:
+        with self.lock.exclusive():
+            rows = self._read_snapshot()
+            self._snapshot_signature = self._signature()
+            events = self._read_log(0)
+            for event in events:
+                apply_event(rows, event)
+            self._pending_events = len(events)
+            self._rows = rows
+            if self._pending_events >= self.compact_every:
+                self._compact_locked()
+            loaded = [dict(row) for row in rows.values()]
+        yield from loaded
+
+    def _catch_up_locked(self) -> Optional[set]:
+        """Apply other processes' new log events; returns changed job ids, or None if a reload is needed."""
+        if self._signature() != self._snapshot_signature:
+            return None
+        if self.log_path.exists() and os.path.getsize(self.log_path) < self._log_offset:
+            return None
+
+        events = self._read_log(self._log_offset)
+        changed = set()
+        for event in events:
+            apply_event(self._rows, event)
+            changed.add(event.get("job_id") or event.get("row", {}).get("job_id"))
+        self._pending_events += len(events)
+        return changed
+
+    def _changed_rows(self, changed: Optional[set]) -> Optional[Dict[str, Dict[str, str]]]:
+        if changed is None:
+            return None
+        return {job_id: dict(self._rows[job_id]) for job_id in changed if job_id in self._rows}
+
+    def poll_changes(self) -> Optional[Dict[str, Dict[str, str]]]:
+        # Cheap unlocked check first: nothing to do if neither file changed
+        if self._signature() == self._snapshot_signature:
+            try:
+                log_size = os.path.getsize(self.log_path)
+            except FileNotFoundError:
+                log_size = 0
+            if log_size == self._log_offset:
+                return {}
+        with self.lock.shared():
+            return self._changed_rows(self._catch_up_locked())
+
+    def write_lock(self):
+        return self.lock.exclusive()
+
+    def signature(self) -> Optional[str]:
+        # The log only grows between compactions, which replace the snapshot
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            log_size = 0
+        return f"csv:{self._signature()}:{log_size}"
+
+    def append_events(self, events: List[Dict]) -> Optional[Dict[str, Dict[str, str]]]:
+        with self.lock.exclusive():
+            changed = self._catch_up_locked()
+
+            data = "".join(json.dumps(event) + "\n" for event in events).encode('utf-8')
+            with open(self.log_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                self._log_offset = f.tell()
+
+            for event in events:
+                apply_event(self._rows, event)
+            self._pending_events += len(events)
+
+            # Rows reflect other processes' events followed by ours
+            foreign = self._changed_rows(changed)
+
+            if changed is not None and self._pending_events >= self.compact_every:
+                self._compact_locked()
+        return foreign
+
+    def compact(self):
+        with self.lock.exclusive():
+            if self._catch_up_locked() is None:
+                return  # Another process compacted; our rows are stale
+            self._compact_locked()
+
+    def _compact_locked(self):
+        """Write a new snapshot atomically, then truncate the log."""
+        tmp_path = self.csv_path.with_suffix('.csv.tmp')
+        with open(tmp_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=APPLICATION_FIELDS)
+            writer.writeheader()
+            writer.writerows(self._rows.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.csv_path)
+
+        # A crash before this truncate only means replaying events already in the snapshot
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._snapshot_signature = self._signature()
+        self._log_offset = 0
+        self._pending_events = 0
+
+
+class SqliteApplicationStore(ApplicationStore):
+    """
+    SQLite database in WAL mode with indexes for summary and follow-up queries.
+    Other processes' commits are detected through PRAGMA data_version (and
+    trigger a full reload); tracker read-modify-writes also hold applications.lock
+    so JSON columns merged in memory are not overwritten by a concurrent writer.
+    """
+
+    name = "sqlite"
+
+    INDEXED_COLUMNS = ('status', 'company', 'submitted_at', 'next_followup_at')
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.lock = FileLock(self.db_path.with_suffix('.lock'))
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._data_version = self._current_data_version()
+
+    def _current_data_version(self) -> int:
+        # Changes only when another connection commits
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll_changes(self) -> Optional[Dict[str, Dict[str, str]]]:
+        with self._lock:
+            version = self._current_data_version()
+            if version == self._data_version:
+                return {}
+            self._data_version = version
+        return None
+
+    def _create_schema(self):
+        columns = ", ".join(
+            f"{name} TEXT PRIMARY KEY" if name == 'job_id' else f"{name} TEXT NOT NULL DEFAULT ''"
+            for name in APPLICATION_FIELDS
+        )
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS applications ({columns})")
+            # Write counter behind signature(); bumped in the same transaction as each write
+            self.conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            for column in self.INDEXED_COLUMNS:
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_applications_{column} ON applications ({column})"
+                )
+
+    def write_lock(self):
+        return self.lock.exclusive()
+
+    def signature(self) -> str:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'writes'").fetchone()
+        return f"sqlite:{row[0] if row else 0}"
+
+    def _count_write(self):
+        self.conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('writes', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+
+    def load_rows(self) -> Iterator[Dict[str, str]]:
+        with self._lock:
+            self._data_version = self._current_data_version()
+            cursor = self.conn.execute(f"SELECT {', '.join(APPLICATION_FIELDS)} FROM applications")
+            rows = cursor.fetchall()
+        for values in rows:
+            yield dict(zip(APPLICATION_FIELDS, values))
+
+    def save_rows(self, rows: List[Dict[str, str]]):
+        """Upsert many rows in one transaction."""
+        with self._lock, self.conn:
+            self._upsert(rows)
+            self._count_write()
+
+    def _upsert(self, rows: List[Dict[str, str]]):
+        placeholders = ", ".join("?" for _ in APPLICATION_FIELDS)
+        updates = ", ".join(f"{name}=excluded.{name}" for name in APPLICATION_FIELDS if name != 'job_id')
+        sql = (
+            f"INSERT INTO applications ({', '.join(APPLICATION_FIELDS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(job_id) DO UPDATE SET {updates}"
+        )
+        self.conn.executemany(
+            sql,
+            [tuple(row.get(name) or '' for name in APPLICATION_FIELDS) for row in rows]
+        )
+
+    def append_events(self, events: List[Dict]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Apply events in a single transaction; status changes are appended with json_insert."""
+        with self._lock, self.conn:
+            foreign = {} if self._current_data_version() == self._data_version else None
+            for event in events:
+                if event.get("op") == "put":
+                    self._upsert([event["row"]])
+                    continue
+
+                fields = {k: v for k, v in (event.get("fields") or {}).items() if k in APPLICATION_FIELDS and k != 'job_id'}
+                assignments = [f"{name} = ?" for name in fields]
+                params = [value or '' for value in fields.values()]
+
+                change = event.get("status_change")
+                if change:
+                    assignments.append(
+                        "status_history = json_insert(CASE WHEN status_history = '' THEN '[]' "
+                        "ELSE status_history END, '$[#]', json(?))"
+                    )
+                    params.append(json.dumps(change))
+
+                if assignments:
+                    self.conn.execute(
+                        f"UPDATE applications SET {', '.join(assignments)} WHERE job_id = ?",
+                        params + [event["job_id"]]
+                    )
+            self._count_write()
+            self._data_version = self._current_data_version()
+        return foreign
+
+    def job_ids_by_status(self, status: str) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT job_id FROM applications WHERE status = ?", (status,)).fetchall()
+        return [job_id for (job_id,) in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def migrate_csv_to_sqlite(csv_path: Path, db_path: Path) -> int:
+    """
+    Copy applications.csv into a SQLite store.
+    Later rows for the same job_id win, matching how the tracker loads the CSV.
+    Returns number of applications migrated.
+    """
+    rows: Dict[str, Dict[str, str]] = {}
+    for row in CsvApplicationStore(csv_path).load_rows():
+        rows[row['job_id']] = row
+
+    store = SqliteApplicationStore(db_path)
+    try:
+        store.save_rows(list(rows.values()))
+    finally:
+        store.close()
+    return len(rows)
+
+
+def open_store(applications_dir: Path, backend: Optional[str] = None) -> ApplicationStore:
+    """
+    Open the configured backend ("csv" or "sqlite"; default from APPLICATION_STORAGE, else csv).
+    Switching to sqlite migrates an existing applications.csv on first use.
+    """
+    backend = (backend or os.environ.get("APPLICATION_STORAGE") or "csv").lower()
+    csv_path = Path(applications_dir) / "applications.csv"
+
+    if backend == "sqlite":
+        db_path = Path(applications_dir) / "applications.db"
+        if not db_path.exists() and csv_path.exists():
+            migrated = migrate_csv_to_sqlite(csv_path, db_path)
+            # stderr: stdout is the protocol channel when this runs inside the MCP stdio server
+            print(f"Migrated {migrated} applications from {csv_path.name} to {db_path.name}", file=sys.stderr)
+        return SqliteApplicationStore(db_path)
+
+    if backend == "csv":
+        return CsvApplicationStore(csv_path)
+
+    raise ValueError(f"Unknown application storage backend: {backend}")
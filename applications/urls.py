@@ -0,0 +1,23 @@
+"""
+Apply-URL helpers shared by the application modules (Stage 9)
+The bulk runner throttles per ATS domain, the selector cache learns layouts per
+domain and follow-up statistics are kept per source domain; all of them key on
+the same normalized host.
+"""
+
+from urllib.parse import urlparse
+
+
+def apply_domain(apply_url: str) -> str:
+    """ATS domain of an apply URL (e.g. boards.greenhouse.io); "unknown" if it has none."""
+    return urlparse(str(apply_url or "")).netloc.lower() or "unknown"
+
+
+def test_apply_domain():
+    """Print the domain of a few apply URLs."""
+    for url in ("https://boards.greenhouse.io/acme/jobs/1", "https://JOBS.LEVER.CO/acme/2/apply", "", None):
+        print(f"{url!r}: {apply_domain(url)}")
+
+
+if __name__ == "__main__":
+    test_apply_domain()
@@ -0,0 +1,4 @@
+"""
+Offline benchmarks (Stage 9)
+Local ATS fixture pages, a fixture server and a browser automation benchmark runner.
+"""
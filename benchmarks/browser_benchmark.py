@@ -0,0 +1,179 @@
+"""
+Browser automation benchmark (Stage 9)
+Runs BrowserHandler against the local fixture server and reports open, detect,
+fill and submit latency per phase and per fixture, so browser-path changes can
+be compared offline and in CI.
+
+Usage:
+    python benchmarks/browser_benchmark.py --iterations 10
+    python benchmarks/browser_benchmark.py --per-field --no-blocking --output before.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixture_server import TRACKER_HOST, FixtureServer
+
+
+PHASES = ("open", "detect", "fill", "submit", "total")
+
+# Autofill data keyed like ApplicationAutofiller output (form_rules field_mapping values)
+USER_DATA = {
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "user_email": "ada@example.com",
+    "phone_number": "+1 555 0100",
+    "preferred_location": "Remote",
+    "linkedin_url": "https://www.linkedin.com/in/ada",
+    "portfolio_url": "https://ada.dev"
+}
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Latency summary (ms) for one phase."""
+    if not samples:
+        return {"runs": 0}
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 1),
+        "p50_ms": round(ordered[len(ordered) // 2], 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+        "min_ms": round(ordered[0], 1),
+        "max_ms": round(ordered[-1], 1)
+    }
+
+
+async def run_benchmark(
+    fixtures: Optional[List[str]] = None,
+    iterations: int = 5,
+    batched: bool = True,
+    block_resources: bool = True,
+    headless: bool = True
+) -> Dict:
+    """
+    Apply to each fixture `iterations` times on one warm browser.
+
+    Returns:
+        Settings, browser launch time, and per-fixture phase summaries with fields
+        detected/filled, submissions received by the fixture server, tracker
+        requests that got through (0 with blocking) and bytes the server sent
+    """
+    from applications.browser_handler import BrowserHandler
+    from applications.resource_blocking import ResourceBlocker
+
+    with tempfile.TemporaryDirectory() as tmpdir, FixtureServer() as server:
+        resume = Path(tmpdir) / "resume.pdf"
+        resume.write_bytes(b"%PDF-1.4 benchmark resume")
+        user_data = {**USER_DATA, "resume_path": str(resume)}
+
+        handler = BrowserHandler(headless=headless, pool_size=1, selector_cache_path=Path(tmpdir) / "selector_cache.json")
+        blocking = handler.form_rules.get("resource_blocking", {})
+        if block_resources:
+            # Fixture trackers load from TRACKER_HOST, which the real blocked_domains can't match
+            blocking = {**blocking, "blocked_domains": blocking.get("blocked_domains", []) + [TRACKER_HOST]}
+        else:
+            blocking = {"enabled": False}
+        handler.resource_blocker = ResourceBlocker({**handler.form_rules, "resource_blocking": blocking})
+
+        started = time.perf_counter()
+        await handler.ensure_browser()
+        launch_ms = (time.perf_counter() - started) * 1000
+
+        results = {}
+        try:
+            for fixture in fixtures or server.fixtures:
+                timings: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+                detected = filled = 0
+                submissions_before = len(server.submissions)
+                tracker_before = server.tracker_requests
+                bytes_before = server.bytes_served
+
+                for _ in range(iterations):
+                    async with handler.application_context() as context:
+                        t0 = time.perf_counter()
+                        page = await handler.open_job_link(server.url(fixture), context)
+                        t1 = time.perf_counter()
+                        fields = await handler.detect_form_fields(page, batched=batched)
+                        t2 = time.perf_counter()
+                        filled_fields, _ = await handler.autofill_form(page, user_data, fields, batched=batched)
+                        t3 = time.perf_counter()
+                        await handler.submit_application(page)
+                        t4 = time.perf_counter()
+
+                    for phase, elapsed in zip(PHASES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+                        timings[phase].append(elapsed * 1000)
+                    detected, filled = len(fields), len(filled_fields)
+
+                results[fixture] = {
+                    "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+                    "fields_detected": detected,
+                    "fields_filled": filled,
+                    "submitted": len(server.submissions) - submissions_before,
+                    "tracker_requests": server.tracker_requests - tracker_before,
+                    # Measured per application; compare with a --no-blocking run for actual savings
+                    "bytes_served_per_run": (server.bytes_served - bytes_before) // max(iterations, 1)
+                }
+        finally:
+            await handler.close()
+
+        return {
+            "settings": {
+                "iterations": iterations,
+                "batched": batched,
+                "block_resources": block_resources,
+                "headless": headless
+            },
+            "browser_launch_ms": round(launch_ms, 1),
+            "fixtures": results,
+            "readiness": handler.readiness.stats(),
+            "resource_blocking": handler.resource_blocker.stats(),
+            "selector_cache": handler.selector_cache.stats()
+        }
+
+
+def print_report(report: Dict):
+    print(f"Settings: {report['settings']}  (browser launch {report['browser_launch_ms']}ms)")
+    print(f"{'fixture':<15}{'phase':<8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for fixture, result in report["fixtures"].items():
+        for phase in PHASES:
+            summary = result["phases"][phase]
+            print(f"{fixture:<15}{phase:<8}{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['mean_ms']:>10}")
+        print(f"{'':<15}fields {result['fields_filled']}/{result['fields_detected']} filled, "
+              f"{result['submitted']} submitted, {result['tracker_requests']} tracker requests, "
+              f"{result['bytes_served_per_run'] // 1000} KB served per run")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BrowserHandler against local ATS fixtures")
+    parser.add_argument("--iterations", type=int, default=5, help="Applications per fixture")
+    parser.add_argument("--fixtures", default="", help="Comma-separated fixture names (default: all)")
+    parser.add_argument("--per-field", action="store_true", help="Disable batched detection and fill")
+    parser.add_argument("--no-blocking", action="store_true", help="Disable resource blocking")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--output", default="", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        fixtures=[f for f in args.fixtures.split(",") if f] or None,
+        iterations=args.iterations,
+        batched=not args.per_field,
+        block_resources=not args.no_blocking,
+        headless=not args.headed
+    ))
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Local fixture server for browser automation benchmarks (Stage 9)
+Serves recorded ATS application pages (benchmarks/fixtures/<name>.html) so
+BrowserHandler can be benchmarked and regression-tested without real career sites.
+
+Routes:
+    GET  /<name>/apply    -> fixtures/<name>.html ({{tracker_origin}} filled in)
+    GET  /assets/<file>   -> placeholder bytes sized like the real asset type
+    POST /<name>/submit   -> confirmation page (submissions are recorded)
+
+Third-party scripts in the fixtures (tag managers, analytics) load from
+{{tracker_origin}}, an origin on TRACKER_HOST that resolves to this server, so
+no benchmark run touches the internet and domain blocking is still exercised.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Stand-in for tracker domains: browsers resolve *.localhost to loopback without DNS
+TRACKER_HOST = "tracker.localhost"
+
+# Placeholder asset sizes and content types, so resource blocking has realistic weight
+ASSET_TYPES = {
+    ".css": ("text/css", 25000),
+    ".js": ("application/javascript", 60000),
+    ".png": ("image/png", 20000),
+    ".jpg": ("image/jpeg", 150000),
+    ".woff2": ("font/woff2", 35000),
+    ".mp4": ("video/mp4", 750000)
+}
+
+
+class FixtureServer:
+    """Threaded HTTP server for fixture pages; usable as a context manager."""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            fixtures_dir: Directory of <name>.html fixtures
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.fixtures_dir = Path(fixtures_dir)
+        self.host = host
+        self.port = port
+        self.submissions: List[Dict] = []
+        self.requests = 0
+        self.tracker_requests = 0  # Requests that reached TRACKER_HOST (i.e. were not blocked)
+        self.bytes_served = 0  # Response body bytes sent (measured, unlike ResourceBlocker's estimate)
+        self._lock = threading.Lock()  # Counters are updated from handler threads
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def fixtures(self) -> List[str]:
+        return sorted(path.stem for path in self.fixtures_dir.glob("*.html"))
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def tracker_origin(self) -> str:
+        return f"http://{TRACKER_HOST}:{self.port}"
+
+    def url(self, fixture: str) -> str:
+        """Apply URL for a fixture (the path keeps the ATS name, as real board URLs do)."""
+        return f"{self.base_url}/{fixture}/apply"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def _send(self, status: int, content_type: str, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_served += len(body)
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    if (self.headers.get("Host") or "").split(":")[0] == TRACKER_HOST:
+                        server.tracker_requests += 1
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "assets":
+                    content_type, size = ASSET_TYPES.get(Path(parts[1]).suffix, ("application/octet-stream", 1000))
+                    if content_type == "application/javascript":
+                        body = b"/*" + b" " * (size - 4) + b"*/"  # Valid no-op script
+                    else:
+                        body = b"\0" * size
+                    self._send(200, content_type, body)
+                    return
+                fixture = server.fixtures_dir / f"{parts[0]}.html"
+                if len(parts) == 2 and parts[1] == "apply" and fixture.exists():
+                    html = fixture.read_bytes().replace(b"{{tracker_origin}}", server.tracker_origin.encode())
+                    self._send(200, "text/html; charset=utf-8", html)
+                    return
+                self._send(404, "text/plain", b"Not found")
+
+            def do_POST(self):
+                with server._lock:
+                    server.requests += 1
+                parts = self.path.strip("/").split("/")
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                if len(parts) == 2 and parts[1] == "submit":
+                    server.submissions.append({"fixture": parts[0], "bytes": length})
+                    self._send(200, "text/html; charset=utf-8",
+                               b"<html><body><h1>Thank you for applying!</h1></body></html>")
+                    return
+                self._send(404, "text/plain", b"Not found")
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def test_fixture_server():
+    """Fetch each fixture over HTTP."""
+    from urllib.request import urlopen
+
+    with FixtureServer() as server:
+        for fixture in server.fixtures:
+            with urlopen(server.url(fixture)) as response:
+                print(f"{fixture}: {response.status} {len(response.read())} bytes at {server.url(fixture)}")
+
+
+if __name__ == "__main__":
+    test_fixture_server()
@@ -4,6 +4,7 @@ Interactive dashboard for viewing and managing job applications
 """
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, render_template, jsonify, request
@@ -14,6 +15,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from applications.application_tracker import ApplicationTracker, ApplicationStatus
 from applications.followup_manager import FollowupManager
+from applications.analytics import ApplicationAnalytics
+from applications.response_times import ResponseTimeTracker
 
 # Initialize Flask app
 app = Flask(__name__, 
@@ -22,6 +25,13 @@ app = Flask(__name__,
 
 # Initialize tracker
 tracker = ApplicationTracker()
+analytics = ApplicationAnalytics(
+    tracker.applications_dir / "analytics.db",
+    Path(__file__).parent.parent / "config" / "role_families.json"
+).attach(tracker)
+response_times = ResponseTimeTracker(tracker.applications_dir / "response_times.json").attach(tracker)
+# Opt-in learned follow-up intervals (FOLLOWUP_PERCENTILE, e.g. 0.75; default 0 = fixed intervals)
+FollowupManager.use_response_times(response_times, float(os.environ.get("FOLLOWUP_PERCENTILE", "0")))
 
 # -------------------------
 # Routes
@@ -54,23 +64,12 @@ def get_stats():
     """Get dashboard statistics"""
     summary = tracker.get_summary()
     
-    # Get additional stats
-    apps = tracker.applications.values()
-    
-    # Count by status
-    status_counts = {}
-    for app in apps:
-        status = app.status
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    # Get company diversity
-    companies = set(app.company for app in apps)
-    
+    # Counters are maintained by the tracker, so polling this stays O(1)
     return jsonify({
         "success": True,
         "summary": summary,
-        "status_counts": status_counts,
-        "company_count": len(companies),
+        "status_counts": tracker.get_status_counts(),
+        "company_count": len(tracker.get_company_counts()),
         "timestamp": datetime.now().isoformat()
     })
 
@@ -156,7 +155,9 @@ def update_status():
     next_followup = FollowupManager.calculate_next_followup(
         new_status,
         app.submitted_at,
-        app.last_followup_at
+        app.last_followup_at,
+        company=app.company,
+        source=app.apply_url
     )
     
     tracker.update_application(
@@ -181,28 +182,82 @@ def update_status():
     })
 
 
+@app.route('/api/bulk-update-status', methods=['POST'])
+def bulk_update_status():
+    """Update status of many applications in one request"""
+    data = request.get_json() or {}
+    updates = data.get('updates')
+    
+    if not updates or not isinstance(updates, list):
+        return jsonify({
+            "success": False,
+            "message": "Missing updates list"
+        }), 400
+    
+    outcome = tracker.bulk_update_status(updates, atomic=bool(data.get('atomic', False)))
+    
+    return jsonify({
+        "success": outcome["failed"] == 0,
+        **outcome,
+        "timestamp": datetime.now().isoformat()
+    })
+
+
 @app.route('/api/followups')
 def get_followups():
     """Get applications needing follow-up"""
-    followups = FollowupManager.get_followups_needed(tracker.applications)
-    
-    # Add template to each
-    for followup in followups:
-        if not followup.get('template'):
-            followup['template'] = FollowupManager.get_followup_template(
-                followup['status'],
-                followup['company'],
-                followup['role']
-            )
+    limit = request.args.get('limit', 100, type=int)
+    followups = FollowupManager.get_followups_needed(tracker, limit=limit or None)
     
     return jsonify({
         "success": True,
         "followups": followups,
         "count": len(followups),
+        "total_due": tracker.count_due_followups(),
         "timestamp": datetime.now().isoformat()
     })
 
 
+@app.route('/api/analytics/funnel')
+def get_analytics_funnel():
+    """Funnel conversion by week, month, role family or company"""
+    try:
+        result = analytics.funnel(
+            request.args.get('group_by', 'all'),
+            request.args.get('since') or None,
+            request.args.get('as_of') or None
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, **result})
+
+
+@app.route('/api/analytics/time-in-stage')
+def get_analytics_time_in_stage():
+    """Average days spent in each status"""
+    try:
+        result = analytics.time_in_stage(
+            request.args.get('group_by', 'all'),
+            request.args.get('since') or None
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, **result})
+
+
+@app.route('/api/analytics/cohorts')
+def get_analytics_cohorts():
+    """Outcomes by submission week or month"""
+    try:
+        result = analytics.cohorts(
+            request.args.get('period', 'week'),
+            request.args.get('since') or None
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, **result})
+
+
 @app.route('/api/timeline/<job_id>')
 def get_timeline(job_id):
     """Get status timeline for an application"""
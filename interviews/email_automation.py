@@ -9,36 +9,10 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from toolkit.templates import TemplateEngine, user_template_dir
 
-class EmailAutomation:
-    """Email template and sending automation"""
-    
-    def __init__(self, smtp_config: Optional[Dict] = None):
-        """Initialize email automation
-        
-        Args:
-            smtp_config: Dict with smtp_server, port, email, password
-                        Optional - for production use only
-        """
-        self.smtp_config = smtp_config or {}
-        self.email_enabled = bool(smtp_config)
-    
-    def get_interview_reminder_template(
-        self,
-        company: str,
-        role: str,
-        interview_type: str,
-        scheduled_at: str,
-        interviewer: str,
-        location: str
-    ) -> Dict:
-        """Generate interview reminder email template"""
-        
-        days_until = self._calculate_days(scheduled_at)
-        
-        subject = f"Interview Reminder: {company} - {role} ({interview_type})"
-        
-        body = f"""
+
+INTERVIEW_REMINDER_TEMPLATE = """
 Hi there!
 
 This is a friendly reminder about your upcoming interview:
@@ -73,6 +47,114 @@ Good luck with your interview! You've got this! 🎯
 ---
 Job Application MCP Dashboard
 """
+
+THANK_YOU_EMAIL_TEMPLATE = """
+Hi {interviewer_name},
+
+Thank you so much for taking the time to interview me for the {role} position at {company} on {interview_date}. 
+
+I really enjoyed learning more about the team and the exciting projects you're working on. Our conversation reinforced my interest in this role and the company.
+
+{talking_points_section}
+I'm very enthusiastic about this opportunity and would welcome the chance to discuss how my skills and experience can contribute to your team.
+
+Please don't hesitate to reach out if you need any additional information from my end. I look forward to hearing from you.
+
+Best regards,
+[Your Name]
+
+---
+Job Application MCP Dashboard
+"""
+
+FOLLOW_UP_EMAIL_TEMPLATE = """
+Hi Hiring Manager,
+
+I hope this email finds you well. I wanted to follow up on my interview for the {role} position at {company}, which took place on {interview_date}.
+
+I remain very interested in this opportunity and would appreciate any updates on the status of my application. I'm excited about the possibility of joining your team and contributing to [specific project/goal mentioned in interview].
+
+If you need any additional information or references, please let me know. I'm happy to provide whatever you need.
+
+Thank you for your time and consideration.
+
+Best regards,
+[Your Name]
+
+---
+Job Application MCP Dashboard
+"""
+
+STATUS_UPDATE_TEMPLATE = """
+{message}
+
+**Status:** {status_title}
+**Company:** {company}
+**Timestamp:** {timestamp}
+
+{reason_line}
+
+---
+Keep tracking your applications in the Job Application Dashboard!
+"""
+
+BUILTIN_TEMPLATES = {
+    "interview_reminder": INTERVIEW_REMINDER_TEMPLATE,
+    "thank_you_email": THANK_YOU_EMAIL_TEMPLATE,
+    "follow_up_email": FOLLOW_UP_EMAIL_TEMPLATE,
+    "status_update": STATUS_UPDATE_TEMPLATE
+}
+
+
+class EmailAutomation:
+    """Email template and sending automation"""
+    
+    # Shared by all instances; user templates (<template_name>.txt) override built-ins
+    _template_engine: Optional[TemplateEngine] = None
+    
+    def __init__(self, smtp_config: Optional[Dict] = None):
+        """Initialize email automation
+        
+        Args:
+            smtp_config: Dict with smtp_server, port, email, password
+                        Optional - for production use only
+        """
+        self.smtp_config = smtp_config or {}
+        self.email_enabled = bool(smtp_config)
+    
+    @classmethod
+    def template_engine(cls) -> TemplateEngine:
+        """Compiled email templates with a render cache"""
+        if cls._template_engine is None:
+            engine = TemplateEngine(BUILTIN_TEMPLATES)
+            engine.load_directory(user_template_dir())
+            cls._template_engine = engine
+        return cls._template_engine
+    
+    def get_interview_reminder_template(
+        self,
+        company: str,
+        role: str,
+        interview_type: str,
+        scheduled_at: str,
+        interviewer: str,
+        location: str
+    ) -> Dict:
+        """Generate interview reminder email template"""
+        
+        days_until = self._calculate_days(scheduled_at)
+        
+        subject = f"Interview Reminder: {company} - {role} ({interview_type})"
+        
+        body = self.template_engine().render("interview_reminder", {
+            "company": company,
+            "role": role,
+            "interview_type": interview_type,
+            "scheduled_at": scheduled_at,
+            "interviewer": interviewer,
+            "location": location,
+            "days_until": days_until
+        })
         
         return {
             "subject": subject,
@@ -101,24 +183,13 @@ Job Application MCP Dashboard
 
 """
         
-        body = f"""
-Hi {interviewer_name},
-
-Thank you so much for taking the time to interview me for the {role} position at {company} on {interview_date}. 
-
-I really enjoyed learning more about the team and the exciting projects you're working on. Our conversation reinforced my interest in this role and the company.
-
-{talking_points_section}
-I'm very enthusiastic about this opportunity and would welcome the chance to discuss how my skills and experience can contribute to your team.
-
-Please don't hesitate to reach out if you need any additional information from my end. I look forward to hearing from you.
-
-Best regards,
-[Your Name]
-
----
-Job Application MCP Dashboard
-"""
+        body = self.template_engine().render("thank_you_email", {
+            "interviewer_name": interviewer_name,
+            "role": role,
+            "company": company,
+            "interview_date": interview_date,
+            "talking_points_section": talking_points_section
+        })
         
         return {
             "subject": subject,
@@ -138,23 +209,11 @@ Job Application MCP Dashboard
         
         subject = f"Following Up - {company} {role} Interview"
         
-        body = f"""
-Hi Hiring Manager,
-
-I hope this email finds you well. I wanted to follow up on my interview for the {role} position at {company}, which took place on {interview_date}.
-
-I remain very interested in this opportunity and would appreciate any updates on the status of my application. I'm excited about the possibility of joining your team and contributing to [specific project/goal mentioned in interview].
-
-If you need any additional information or references, please let me know. I'm happy to provide whatever you need.
-
-Thank you for your time and consideration.
-
-Best regards,
-[Your Name]
-
----
-Job Application MCP Dashboard
-"""
+        body = self.template_engine().render("follow_up_email", {
+            "role": role,
+            "company": company,
+            "interview_date": interview_date
+        })
         
         return {
             "subject": subject,
@@ -181,18 +240,14 @@ Job Application MCP Dashboard
         
         message = status_messages.get(status, f"Status update from {company}")
         
-        body = f"""
-{message}
-
-**Status:** {status.replace('_', ' ').title()}
-**Company:** {company}
-**Timestamp:** {datetime.now().isoformat()}
-
-{f'**Reason:** {reason}' if reason else ''}
-
----
-Keep tracking your applications in the Job Application Dashboard!
-"""
+        # Contains a timestamp, so never cached
+        body = self.template_engine().render("status_update", {
+            "message": message,
+            "status_title": status.replace('_', ' ').title(),
+            "company": company,
+            "timestamp": datetime.now().isoformat(),
+            "reason_line": f'**Reason:** {reason}' if reason else ''
+        }, cache=False)
         
         return {
             "subject": f"Application Status Update - {company}",
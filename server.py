@@ -1,20 +1,29 @@
 import os
 import json
+import atexit
 import csv
 import asyncio
 from datetime import datetime
 from pathlib import Path
 from docx import Document
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from applications.browser_handler import BrowserHandler, ApplicationResult
+from applications.browser_runtime import BrowserRuntime
+from applications.bulk_apply import BulkApplyRunner, decision_job_id
 from applications.application_autofill import ApplicationAutofiller
 from applications.application_tracker import ApplicationTracker, ApplicationStatus
 from applications.followup_manager import FollowupManager
+from applications.analytics import ApplicationAnalytics
+from applications.response_times import ResponseTimeTracker
+from applications.answer_bank import AnswerBank
 from interviews.interview_prep import InterviewPrep, InterviewType, InterviewStatus
 from interviews.email_automation import EmailAutomation
 from interviews.interview_scheduler import InterviewScheduler
 from interviews.coaching_materials import CoachingMaterials
+from toolkit.metrics import ToolMetrics, instrument_tools
+from toolkit.profiling import ToolProfiler
+from toolkit.responses import MaterialStore, decode_cursor, paginate, project, shape_response
 
 # -------------------------
 # Paths
@@ -29,13 +38,22 @@ APPLICATIONS_FILE = BASE_DIR / "applications.csv"
 ROLE_VARIANTS_DIR = BASE_DIR / "resumes" / "role_variants"
 LOCATION_RULES_FILE = BASE_DIR / "config" / "location_rules.json"
 FORM_RULES_FILE = BASE_DIR / "config" / "form_rules.json"
+ROLE_FAMILIES_FILE = BASE_DIR / "config" / "role_families.json"
 APPLICATIONS_DIR = BASE_DIR / "applications"
+PROFILES_DIR = BASE_DIR / "profiles"
+BATCHES_DIR = APPLICATIONS_DIR / "batches"
 
 # Initialize Stage 5 components
 APPLICATIONS_DIR.mkdir(exist_ok=True)
-browser_handler = BrowserHandler(FORM_RULES_FILE)
-autofiller = ApplicationAutofiller(RESUME_DIR / "master")
+browser_handler = BrowserHandler(FORM_RULES_FILE, selector_cache_path=APPLICATIONS_DIR / "selector_cache.json")
+browser_runtime = BrowserRuntime(browser_handler)  # Background loop owning the warm browser pool
+# Answers to visa/salary/relocation/... questions are reused on later applications
+autofiller = ApplicationAutofiller(RESUME_DIR / "master", answer_bank=AnswerBank(APPLICATIONS_DIR / "answer_bank.json"))
 tracker = ApplicationTracker(APPLICATIONS_DIR)
+analytics = ApplicationAnalytics(APPLICATIONS_DIR / "analytics.db", ROLE_FAMILIES_FILE).attach(tracker)
+response_times = ResponseTimeTracker(APPLICATIONS_DIR / "response_times.json").attach(tracker)
+# Opt-in: follow up at this percentile of learned time-to-response, e.g. 0.75 (default 0 = fixed intervals)
+FollowupManager.use_response_times(response_times, float(os.environ.get("FOLLOWUP_PERCENTILE", "0")))
 
 # Initialize Stage 8 (Interview Prep) components
 INTERVIEWS_DIR = BASE_DIR / "interviews"
@@ -50,6 +68,20 @@ coaching_materials = CoachingMaterials(str(INTERVIEWS_DIR / "materials"))
 
 mcp = FastMCP("Job Application MCP")
 
+# Every tool registered below is wrapped with latency/error/payload metrics,
+# and profiled on demand (MCP_PROFILE_* env vars, set_tool_profiling, or profile_call=true on one call)
+tool_metrics = ToolMetrics()
+tool_profiler = ToolProfiler.from_env(PROFILES_DIR)
+instrument_tools(mcp, tool_metrics, tool_profiler)
+
+# Optional Prometheus textfile dump, refreshed by get_server_metrics and at exit
+METRICS_FILE = os.environ.get("MCP_METRICS_FILE")
+if METRICS_FILE:
+    atexit.register(tool_metrics.write_prometheus, Path(METRICS_FILE))
+
+# Large materials already sent to the client, addressable by content hash
+material_store = MaterialStore()
+
 # -------------------------
 # Configuration Loading
 # -------------------------
@@ -223,14 +255,38 @@ def evaluate_job(payload: dict):
 # -------------------------
 
 @mcp.tool()
-def evaluate_all_jobs():
+def evaluate_all_jobs(
+    include_results: bool = False,
+    decision: str = "",
+    fields: list = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str = ""
+):
     """
     Evaluate all jobs and persist decisions to decisions/job_decisions.json
+    
+    Args:
+        include_results: Also return a page of decision records (default: summary message only)
+        decision: Only include records with this decision (APPLY, SAVE, SKIP)
+        fields: Keys to keep per record, e.g. ["company", "role", "decision", "scoring_context.final_score"]
+        limit: Page size for returned records
+        offset: Page start (ignored when cursor is given)
+        cursor: next_cursor from a previous page
     """
 
     if not JOBS_FILE.exists():
         return "jobs.json not found. Run collect_jobs.py first."
 
+    # Reject a bad cursor before evaluating and overwriting the decisions file
+    if include_results and cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
+    decision_filter = decision.upper()
+
     with open(JOBS_FILE, "r", encoding="utf-8") as f:
         jobs = json.load(f)
 
@@ -296,7 +352,21 @@ def evaluate_all_jobs():
     with open(DECISIONS_FILE, "w", encoding="utf-8") as f:
         json.dump(results, f, indent=2)
 
-    return f"Evaluated {len(results)} jobs. Decisions saved to {DECISIONS_FILE}"
+    message = f"Evaluated {len(results)} jobs. Decisions saved to {DECISIONS_FILE}"
+    
+    if not include_results:
+        return message
+    
+    if decision_filter:
+        results = [r for r in results if str(r.get("decision", "")).upper() == decision_filter]
+    page, page_info = paginate(results, limit, offset, cursor or None)
+    
+    return {
+        "success": True,
+        "message": message,
+        "page": page_info,
+        "results": project(page, fields)
+    }
 
 
 # -------------------------
@@ -368,7 +438,7 @@ def generate_cover_letter(
 # -------------------------
 
 @mcp.tool()
-def apply_to_job(
+async def apply_to_job(
     job_id: str,
     job_url: str,
     company: str,
@@ -391,38 +461,12 @@ def apply_to_job(
         Dict with success status, filled fields, and submission confirmation
     """
     try:
-        # Check if already applied
-        existing = tracker.get_application(job_id)
-        if existing and existing.status == ApplicationStatus.SUBMITTED.value:
-            return {
-                "success": False,
-                "status": "already_applied",
-                "message": f"Already applied to {company} - {role}",
-                "submitted_at": existing.submitted_at
-            }
-        
-        # Load role variant for autofill context
-        role_variants = load_role_variants()
-        role_variant = role_variants.get(role_family, {})
-        
-        # Prepare autofill payload
-        payload = autofiller.prepare_application_payload(
-            {"id": job_id, "company": company, "role": role, "job_description": job_description},
-            role_variant
-        )
+        payload, early_result = _prepare_application(job_id, company, role, role_family, job_description)
+        if early_result:
+            return early_result
         
-        # Check autofill data validity
-        is_valid, missing = autofiller.validate_autofill_data(payload["autofill_data"])
-        if not is_valid:
-            return {
-                "success": False,
-                "status": "insufficient_data",
-                "message": f"Missing required fields: {', '.join(missing)}",
-                "missing_fields": missing
-            }
-        
-        # Run async browser automation
-        result = asyncio.run(_apply_async(job_url, payload, job_id, company, role))
+        # Run browser automation on the long-lived runtime loop (warm browser)
+        result = await browser_runtime.run(_apply_async(job_url, payload, job_id, company, role))
         
         return result
         
@@ -435,92 +479,374 @@ def apply_to_job(
         }
 
 
+def _prepare_application(job_id: str, company: str, role: str, role_family: str, job_description: str = ""):
+    """
+    Build the autofill payload for a job.
+    Returns (payload, None) when ready to apply, or (None, result_dict) when the job should not proceed.
+    """
+    # Check if already applied
+    existing = tracker.get_application(job_id)
+    if existing and existing.status == ApplicationStatus.SUBMITTED.value:
+        return None, {
+            "success": False,
+            "status": "already_applied",
+            "message": f"Already applied to {company} - {role}",
+            "submitted_at": existing.submitted_at
+        }
+    
+    # Load role variant for autofill context
+    role_variants = load_role_variants()
+    role_variant = role_variants.get(role_family, {})
+    
+    # Prepare autofill payload
+    payload = autofiller.prepare_application_payload(
+        {"id": job_id, "company": company, "role": role, "job_description": job_description},
+        role_variant
+    )
+    
+    # Check autofill data validity
+    is_valid, missing = autofiller.validate_autofill_data(payload["autofill_data"])
+    if not is_valid:
+        return None, {
+            "success": False,
+            "status": "insufficient_data",
+            "message": f"Missing required fields: {', '.join(missing)}",
+            "missing_fields": missing
+        }
+    
+    return payload, None
+
+
 async def _apply_async(job_url: str, payload: dict, job_id: str, company: str, role: str):
-    """Async implementation of job application flow."""
+    """
+    Async implementation of job application flow.
+    Runs on the browser runtime loop; each application gets its own context.
+    """
     try:
-        await browser_handler.init()
-        
-        # Open job application
-        page = await browser_handler.open_job_link(job_url)
-        
-        # Detect form fields
-        detected_fields = await browser_handler.detect_form_fields(page)
-        
-        if not detected_fields:
-            await browser_handler.close()
-            return {
-                "success": False,
-                "status": "no_form_detected",
-                "message": "Could not detect application form"
-            }
-        
-        # Autofill form
-        filled_fields, ambiguous = await browser_handler.autofill_form(
-            page,
-            payload["autofill_data"],
-            detected_fields
+        async with browser_handler.application_context() as context:
+            return await _apply_in_context(context, job_url, payload, job_id, company, role)
+    except Exception as e:
+        return {
+            "success": False,
+            "status": "error",
+            "message": str(e)
+        }
+
+
+async def _apply_in_context(context, job_url: str, payload: dict, job_id: str, company: str, role: str):
+    """Open, detect, autofill and submit inside an already-created browser context."""
+    # Open job application
+    page = await browser_handler.open_job_link(job_url, context)
+    
+    # Detect form fields
+    detected_fields = await browser_handler.detect_form_fields(page)
+    
+    if not detected_fields:
+        return {
+            "success": False,
+            "status": "no_form_detected",
+            "message": "Could not detect application form"
+        }
+    
+    # Autofill form
+    filled_fields, ambiguous = await browser_handler.autofill_form(
+        page,
+        payload["autofill_data"],
+        detected_fields
+    )
+    
+    # Check for ambiguous fields that need user input. Saved or provided answers
+    # only count once they were actually written into the form.
+    filled_keys = browser_handler.filled_data_keys(filled_fields)
+    blocking = autofiller.unfilled_ambiguous_fields(payload, filled_keys)
+    if blocking:
+        return {
+            "success": False,
+            "status": "pending_user_input",
+            "job_id": job_id,
+            "company": company,
+            "role": role,
+            "filled_fields": filled_fields,
+            "ambiguous_fields": blocking,
+            "questions": {field: autofiller.requirement_detector.question(field) for field in blocking},
+            "resolved_fields": payload["resolved_fields"],
+            "ambiguous_field_matches": payload["ambiguous_field_matches"],
+            "message": "Application ready but requires user input for ambiguous fields"
+        }
+    
+    # Submit application
+    submit_success = await browser_handler.submit_application(page)
+    
+    if submit_success:
+        # Track successful application
+        tracker.add_application(
+            job_id=job_id,
+            company=company,
+            role=role,
+            apply_url=job_url,
+            status=ApplicationStatus.SUBMITTED.value
+        )
+        tracker.update_application(
+            job_id=job_id,
+            filled_fields=filled_fields,
+            ambiguous_fields_filled={
+                field: resolution["answer"] for field, resolution in payload["resolved_fields"].items()
+            },
+            notes=f"Auto-submitted to {company}"
         )
         
-        # Check for ambiguous fields that need user input
-        if payload["ambiguous_fields"]:
-            await browser_handler.close()
-            return {
-                "success": False,
-                "status": "pending_user_input",
-                "job_id": job_id,
-                "company": company,
-                "role": role,
-                "filled_fields": filled_fields,
-                "ambiguous_fields": payload["ambiguous_fields"],
-                "message": "Application ready but requires user input for ambiguous fields"
-            }
+        return {
+            "success": True,
+            "status": "submitted",
+            "job_id": job_id,
+            "company": company,
+            "role": role,
+            "filled_fields": filled_fields,
+            "resolved_fields": payload["resolved_fields"],
+            "submitted_at": datetime.now().isoformat(),
+            "message": f"Successfully applied to {company} - {role}"
+        }
+    else:
+        return {
+            "success": False,
+            "status": "submission_failed",
+            "message": "Form detected but submission failed",
+            "filled_fields": filled_fields
+        }
+
+
+async def _apply_decision(decision: dict) -> dict:
+    """Apply to a single decision record. Runs on the browser runtime loop (bulk workers)."""
+    job_id = decision_job_id(decision)
+    company = str(decision.get("company") or "")
+    role = str(decision.get("role") or "")
+    
+    payload, early_result = _prepare_application(
+        job_id,
+        company,
+        role,
+        str(decision.get("role_family") or decision.get("resume_variant") or ""),
+        str(decision.get("job_description") or "")
+    )
+    if early_result:
+        return early_result
+    
+    return await _apply_async(str(decision.get("apply_url") or ""), payload, job_id, company, role)
+
+
+@mcp.tool()
+async def bulk_apply_to_jobs(
+    decisions: list = None,
+    max_workers: int = 4,
+    per_domain_limit: int = 2,
+    batch_id: str = "",
+    ctx: Context = None
+):
+    """
+    Apply to many jobs concurrently using a bounded pool of browser contexts.
+    
+    Args:
+        decisions: Decision records (company, role, apply_url, role_family, job_description).
+                   Defaults to every APPLY decision in decisions/job_decisions.json.
+        max_workers: Maximum concurrent browser contexts
+        per_domain_limit: Maximum concurrent applications per ATS domain (e.g. boards.greenhouse.io)
+        batch_id: Resume an interrupted batch; already-finished jobs are skipped
+    
+    Returns:
+        Batch summary with per-job results (progress is also streamed as it happens)
+    """
+    try:
+        if not batch_id and decisions is None:
+            if not DECISIONS_FILE.exists():
+                return {"success": False, "status": "no_decisions", "message": "No decisions provided and job_decisions.json not found"}
+            decisions = json.loads(DECISIONS_FILE.read_text(encoding="utf-8"))
         
-        # Submit application
-        submit_success = await browser_handler.submit_application(page)
+        if decisions is not None:
+            decisions = [d for d in decisions if str(d.get("decision", "APPLY")).upper() == "APPLY" and d.get("apply_url")]
         
-        await browser_handler.close()
+        runner = BulkApplyRunner(BATCHES_DIR, _apply_decision, max_workers, per_domain_limit)
+        mcp_loop = asyncio.get_running_loop()
         
-        if submit_success:
-            # Track successful application
-            tracker.add_application(
-                job_id=job_id,
-                company=company,
-                role=role,
-                apply_url=job_url,
-                status=ApplicationStatus.SUBMITTED.value
-            )
-            tracker.update_application(
-                job_id=job_id,
-                filled_fields=filled_fields,
-                notes=f"Auto-submitted to {company}"
+        def report(record: dict, completed: int, total: int):
+            # Called on the browser runtime loop; hop back to the MCP loop to notify the client
+            if ctx is None:
+                return
+            asyncio.run_coroutine_threadsafe(ctx.report_progress(completed, total), mcp_loop)
+            asyncio.run_coroutine_threadsafe(
+                ctx.info(f"[{completed}/{total}] {record['company']} - {record['role']}: {record['status']}"),
+                mcp_loop
             )
-            
-            return {
-                "success": True,
-                "status": "submitted",
-                "job_id": job_id,
-                "company": company,
-                "role": role,
-                "filled_fields": filled_fields,
-                "submitted_at": datetime.now().isoformat(),
-                "message": f"Successfully applied to {company} - {role}"
-            }
-        else:
-            return {
-                "success": False,
-                "status": "submission_failed",
-                "message": "Form detected but submission failed",
-                "filled_fields": filled_fields
-            }
+        
+        status = await browser_runtime.run(runner.run(decisions, batch_id or None, report))
+        
+        return {"success": True, **status}
     
     except Exception as e:
         return {
             "success": False,
             "status": "error",
-            "message": str(e)
+            "message": str(e),
+            "batch_id": batch_id
         }
 
 
+@mcp.tool()
+def get_bulk_apply_status(batch_id: str):
+    """
+    Get progress and per-job results for a bulk apply batch.
+    
+    Args:
+        batch_id: Batch ID returned by bulk_apply_to_jobs
+    
+    Returns:
+        Batch summary with counts by status and per-job results
+    """
+    runner = BulkApplyRunner(BATCHES_DIR, _apply_decision)
+    status = runner.get_status(batch_id)
+    
+    if status is None:
+        return {"success": False, "message": f"Batch not found: {batch_id}"}
+    
+    return {"success": True, **status}
+
+
+@mcp.tool()
+def get_browser_pool_stats():
+    """
+    Get warm browser pool utilization.
+    
+    Returns:
+        Warm/active browsers and contexts, launches, recycles by reason, and per-browser uses and heap
+    """
+    return {
+        "success": True,
+        **browser_handler.pool_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_page_readiness_stats():
+    """
+    Get per-ATS page readiness timings.
+    
+    Returns:
+        Ready-time percentiles (ms), how readiness was reached (selector, network_idle, timeout)
+        and the current adaptive wait cap for each ATS
+    """
+    return {
+        "success": True,
+        "ats": browser_handler.readiness.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_resource_blocking_stats():
+    """
+    Get request interception savings on application pages.
+    
+    Returns:
+        Requests seen and blocked (by resource type and by tracker domain) per ATS,
+        with estimated bytes saved (configured per-type averages; aborted requests
+        have no response size to measure)
+    """
+    return {
+        "success": True,
+        **browser_handler.resource_blocker.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_selector_cache_stats(domain: str = ""):
+    """
+    Get learned form-selector cache statistics.
+    
+    Args:
+        domain: Only this apply-URL domain (e.g. boards.greenhouse.io)
+    
+    Returns:
+        Hits, misses and stale layouts since startup, plus learned layouts per domain
+    """
+    return {
+        "success": True,
+        **browser_handler.selector_cache.stats(domain or None),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def save_application_answers(answers: dict):
+    """
+    Save answers to ambiguous application questions for reuse (e.g. before a bulk run).
+    
+    Args:
+        answers: {field or question: answer}, e.g. {"visa_sponsorship": "No",
+                 "What are your salary expectations?": "$160,000"}
+    
+    Returns:
+        Number of answers saved, keys skipped (not an ambiguous question), and answer bank totals
+    """
+    answers = answers or {}
+    saved = autofiller.remember_answers(answers)
+    return {
+        "success": True,
+        "saved": saved,
+        "skipped": [key for key in answers if autofiller.answer_field(key) is None],
+        **autofiller.answer_bank.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_saved_answers(question: str = "", field: str = ""):
+    """
+    Look up or list saved answers to ambiguous application questions.
+    
+    Args:
+        question: Question text to look up (fuzzy match); empty lists saved answers
+        field: Only answers for this field (e.g. 'visa_sponsorship')
+    
+    Returns:
+        The best match for a question, or saved answers with lookup statistics
+    """
+    if question:
+        match = autofiller.answer_bank.lookup(question, field or None)
+        return {
+            "success": match is not None,
+            "match": match,
+            "message": None if match else f"No saved answer similar to: {question}",
+            "timestamp": datetime.now().isoformat()
+        }
+    return {
+        "success": True,
+        "answers": autofiller.answer_bank.entries(field or None),
+        **autofiller.answer_bank.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def forget_saved_answer(question: str):
+    """
+    Remove a saved answer so the question is asked again.
+    
+    Args:
+        question: Question text (or field name, e.g. 'salary_expectations')
+    
+    Returns:
+        Whether an answer was removed
+    """
+    detector = autofiller.requirement_detector
+    removed = autofiller.answer_bank.forget(detector.question(question) if question in detector.rules else question)
+    return {
+        "success": removed,
+        "message": "Saved answer removed" if removed else f"No saved answer for: {question}",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @mcp.tool()
 def autofill_application(
     job_id: str,
@@ -567,6 +893,8 @@ def autofill_application(
                 job_id=job_id,
                 ambiguous_fields_filled=additional_data
             )
+            # Remember the answers so later applications don't ask again
+            autofiller.remember_answers(additional_data)
         
         return {
             "success": True,
@@ -662,7 +990,9 @@ def update_application_status(
     next_followup = FollowupManager.calculate_next_followup(
         new_status,
         app.submitted_at,
-        app.last_followup_at
+        app.last_followup_at,
+        company=app.company,
+        source=app.apply_url
     )
     
     # Update application
@@ -700,18 +1030,52 @@ def update_application_status(
 
 
 @mcp.tool()
-def get_applications_needing_followup():
+def bulk_update_application_status(updates: list, atomic: bool = False):
+    """
+    Update the status of many applications in one call (e.g. after a rejection sweep).
+    
+    Each transition is validated like update_application_status, follow-up dates are
+    recalculated, and all changes are written to storage in a single transaction.
+    
+    Args:
+        updates: List of {"job_id": ..., "status": ..., "notes": optional}
+        atomic: If True, apply nothing unless every update is valid
+    
+    Returns:
+        Counts of updated/failed applications and a result per update
+    """
+    if not updates:
+        return {
+            "success": False,
+            "message": "No updates provided"
+        }
+    
+    outcome = tracker.bulk_update_status(updates, atomic=atomic)
+    
+    return {
+        "success": outcome["failed"] == 0,
+        **outcome,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_applications_needing_followup(limit: int = 50):
     """
     Get list of applications that need follow-up today or overdue.
     
+    Args:
+        limit: Maximum applications to return, most overdue first (0 = all)
+    
     Returns:
         List of applications with follow-up templates ready to send
     """
-    followups = FollowupManager.get_followups_needed(tracker.applications)
+    followups = FollowupManager.get_followups_needed(tracker, limit=limit or None)
     
     return {
         "success": True,
         "count": len(followups),
+        "total_due": tracker.count_due_followups(),
         "applications": followups,
         "timestamp": datetime.now().isoformat()
     }
@@ -762,6 +1126,82 @@ def get_application_timeline(job_id: str):
     }
 
 
+@mcp.tool()
+def get_application_analytics(
+    report: str = "funnel",
+    group_by: str = "all",
+    since: str = "",
+    as_of: str = ""
+):
+    """
+    Funnel, time-in-stage and cohort analytics over application status history.
+    
+    Args:
+        report: "funnel", "time_in_stage" or "cohorts"
+        group_by: all, week, month, role_family or company (cohorts: week or month)
+        since: Only applications submitted on/after this ISO date
+        as_of: Funnel only - point-in-time view ignoring later transitions
+    
+    Returns:
+        Report rows grouped as requested
+    """
+    try:
+        if report == "funnel":
+            result = analytics.funnel(group_by, since or None, as_of or None)
+        elif report == "time_in_stage":
+            result = analytics.time_in_stage(group_by, since or None)
+        elif report == "cohorts":
+            result = analytics.cohorts(group_by if group_by in ("week", "month") else "week", since or None)
+        else:
+            return {
+                "success": False,
+                "message": f"Unknown report: {report} (expected funnel, time_in_stage or cohorts)"
+            }
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": str(e)
+        }
+    
+    return {
+        "success": True,
+        **result,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@mcp.tool()
+def get_response_time_stats(status: str = "", company: str = "", source: str = ""):
+    """
+    Learned time-to-response distributions that drive adaptive follow-up intervals.
+    
+    Args:
+        status: Only this status (submitted or viewed)
+        company: Only this company's distribution
+        source: Only this source (apply URL or ATS domain, e.g. jobs.lever.co)
+    
+    Returns:
+        Percentile summaries (days) per status and key, plus the follow-up interval in use
+    """
+    key = None
+    if company or source:
+        key = ResponseTimeTracker.sketch_keys(company or None, source or None)[-1]
+    
+    summaries = response_times.summary(status or None, key)
+    intervals = {
+        s: FollowupManager.followup_interval(s, company or None, source or None)
+        for s in summaries
+    }
+    
+    return {
+        "success": True,
+        "percentile": FollowupManager.learned_percentile if FollowupManager.response_times else None,
+        "distributions": summaries,
+        "followup_interval_days": intervals,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 # -------------------------
 # Interview Prep Tools (Stage 8)
 # -------------------------
@@ -830,23 +1270,38 @@ def schedule_interview(
 
 
 @mcp.tool()
-def get_upcoming_interviews(days: int = 7):
+def get_upcoming_interviews(
+    days: int = 7,
+    fields: list = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str = ""
+):
     """
     Get all upcoming interviews in the next N days.
     
     Args:
         days: Number of days to look ahead (default: 7)
+        fields: Keys to keep per interview, e.g. ["company", "scheduled_at"] (default: all)
+        limit: Page size
+        offset: Page start (ignored when cursor is given)
+        cursor: next_cursor from a previous page
     
     Returns:
         List of upcoming interviews with details
     """
     interviews = interview_prep.get_upcoming_interviews(days)
+    try:
+        page, page_info = paginate(interviews, limit, offset, cursor or None)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
     
     return {
         "success": True,
         "count": len(interviews),
         "days": days,
-        "interviews": [
+        "page": page_info,
+        "interviews": project([
             {
                 "id": i['id'],
                 "company": i['company'],
@@ -858,13 +1313,31 @@ def get_upcoming_interviews(days: int = 7):
                 "status": i['status'],
                 "preparation_complete": i['preparation_complete']
             }
-            for i in interviews
-        ]
+            for i in page
+        ], fields)
     }
 
 
+# Sections of the prep package that are large and rarely change between calls
+PREP_MATERIAL_SECTIONS = [
+    "star_method",
+    "common_questions",
+    "prep_checklist",
+    "interview_tips",
+    "strength_weaknesses",
+    "questions_to_ask"
+]
+
+
 @mcp.tool()
-def get_interview_prep_materials(job_id: str, interview_type: str, role_family: str):
+def get_interview_prep_materials(
+    job_id: str,
+    interview_type: str,
+    role_family: str,
+    fields: list = None,
+    known_refs: list = None,
+    max_bytes: int = 0
+):
     """
     Get comprehensive interview preparation materials.
     
@@ -872,6 +1345,10 @@ def get_interview_prep_materials(job_id: str, interview_type: str, role_family:
         job_id: Job ID for reference
         interview_type: Type of interview (affects preparation focus)
         role_family: Role family (backend_engineer, data_engineer, etc.)
+        fields: Sections/keys to return, e.g. ["common_questions.technical", "interview_tips"] (default: all)
+        known_refs: Content hashes from a previous response's "refs"; unchanged sections
+                    come back as {"$ref": hash} instead of being re-sent
+        max_bytes: Approximate size cap for the response (0 = unlimited)
     
     Returns:
         Complete preparation package with guides, questions, and tips
@@ -905,7 +1382,33 @@ def get_interview_prep_materials(job_id: str, interview_type: str, role_family:
         )
     }
     
-    return materials
+    return shape_response(
+        materials,
+        fields=fields,
+        max_bytes=max_bytes,
+        known_refs=known_refs,
+        ref_sections=PREP_MATERIAL_SECTIONS,
+        store=material_store
+    )
+
+
+@mcp.tool()
+def get_material_by_ref(ref: str):
+    """
+    Resolve a {"$ref": hash} placeholder from an earlier response.
+    
+    Args:
+        ref: Content hash (e.g. "sha256:...")
+    
+    Returns:
+        The referenced material, if still cached
+    """
+    content = material_store.get(ref)
+    
+    if content is None:
+        return {"success": False, "message": f"Reference not cached (call the original tool without known_refs): {ref}"}
+    
+    return {"success": True, "ref": ref, "content": content}
 
 
 @mcp.tool()
@@ -1167,9 +1670,110 @@ def mark_interview_prep_complete(interview_id: str):
         }
 
 
+# -------------------------
+# Server Metrics (Stage 9)
+# -------------------------
+
+@mcp.tool()
+def get_server_metrics(tool: str = "", format: str = "json"):
+    """
+    Get per-tool call counts, latency percentiles, payload sizes and error rates.
+    
+    Args:
+        tool: Restrict to a single tool name (optional)
+        format: "json" (default) or "prometheus" for the text exposition format
+    
+    Returns:
+        Metrics for every tool called since startup, hottest (most total time) first
+    """
+    if METRICS_FILE:
+        tool_metrics.write_prometheus(Path(METRICS_FILE))
+    
+    if format == "prometheus":
+        return tool_metrics.to_prometheus()
+    
+    return {
+        "success": True,
+        **tool_metrics.snapshot(tool or None)
+    }
+
+
+@mcp.tool()
+def set_tool_profiling(
+    tools: str = "*",
+    sample_rate: float = 1.0,
+    engine: str = "cprofile",
+    min_duration_ms: float = 0.0
+):
+    """
+    Turn per-call profiling on or off without restarting the server.
+    
+    Args:
+        tools: "*" for all tools, comma-separated tool names, or "" to disable profiling
+        sample_rate: Fraction of matching calls to profile (0.0 - 1.0)
+        engine: "cprofile" (.prof, deterministic) or "pyinstrument" (speedscope JSON, sampling)
+        min_duration_ms: Only keep profiles of calls slower than this
+    
+    Returns:
+        Active profiling settings
+    """
+    try:
+        settings = tool_profiler.configure(
+            [t.strip() for t in tools.split(",") if t.strip()],
+            sample_rate,
+            engine,
+            min_duration_ms
+        )
+        return {"success": True, "settings": settings}
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+def list_tool_profiles(limit: int = 20, tool: str = ""):
+    """
+    List recently captured tool profiles (newest first).
+    
+    Args:
+        limit: Maximum number of profiles to return
+        tool: Only list profiles for this tool (optional)
+    
+    Returns:
+        Profile names with tool, duration and capture time
+    """
+    profiles = tool_profiler.list_profiles(limit, tool or None)
+    
+    return {
+        "success": True,
+        "count": len(profiles),
+        "settings": tool_profiler.settings(),
+        "profiles": profiles
+    }
+
+
+@mcp.tool()
+def get_tool_profile(profile_name: str, top: int = 30, sort: str = "cumulative"):
+    """
+    Fetch a captured profile.
+    
+    Args:
+        profile_name: Name from list_tool_profiles
+        top: Number of functions to include in the pstats summary
+        sort: pstats sort key (cumulative, tottime, calls)
+    
+    Returns:
+        pstats text summary for .prof files, or speedscope JSON
+    """
+    try:
+        return {"success": True, **tool_profiler.read_profile(profile_name, top, sort)}
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        return {"success": False, "error": str(e)}
+
+
 # -------------------------
 # Server Start
 # -------------------------
 
 if __name__ == "__main__":
+    browser_runtime.start(warm=True)  # Launch the browser pool in the background before the first apply
     mcp.run()
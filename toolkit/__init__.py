@@ -0,0 +1,16 @@
+# MCP Tool Infrastructure - Stage 9
+from .metrics import ToolMetrics, instrument_tools
+from .profiling import ToolProfiler
+from .responses import MaterialStore, shape_response, paginate, project
+from .templates import TemplateEngine
+
+__all__ = [
+    'ToolMetrics',
+    'instrument_tools',
+    'ToolProfiler',
+    'MaterialStore',
+    'shape_response',
+    'paginate',
+    'project',
+    'TemplateEngine'
+]
@@ -0,0 +1,277 @@
+"""
+Per-tool latency and error metrics for the MCP server (Stage 9)
+Wraps every registered tool and records call counts, latency histograms,
+payload sizes and error rates, with a Prometheus text exposition.
+"""
+
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Histogram bucket upper bounds in milliseconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def result_error(result: Any) -> Optional[str]:
+    """
+    Detect a failure reported in-band.
+    Most tools catch exceptions and return {"success": False, "message"/"error": ...}.
+    """
+    if isinstance(result, dict) and result.get("success") is False:
+        return str(result.get("error") or result.get("message") or result.get("status") or "failed")
+    return None
+
+
+def payload_size(result: Any) -> int:
+    """Approximate serialized size of a tool result in bytes."""
+    if result is None:
+        return 0
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    try:
+        return len(json.dumps(result, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(result).encode("utf-8"))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+class ToolStats:
+    """Running statistics for a single tool."""
+
+    def __init__(self, name: str, reservoir_size: int):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.exceptions = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # Last bucket is +Inf
+        self.recent_ms = deque(maxlen=reservoir_size)
+        self.payload_bytes_total = 0
+        self.payload_bytes_max = 0
+        self.last_error: Optional[str] = None
+        self.last_called_at: Optional[str] = None
+
+    def observe(self, duration_ms: float, payload_bytes: int, error: Optional[str], raised: bool):
+        self.calls += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.recent_ms.append(duration_ms)
+        self.payload_bytes_total += payload_bytes
+        self.payload_bytes_max = max(self.payload_bytes_max, payload_bytes)
+        self.last_called_at = datetime.now().isoformat()
+
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+        if error is not None:
+            self.errors += 1
+            self.last_error = error[:300]
+        if raised:
+            self.exceptions += 1
+
+    def to_dict(self) -> Dict:
+        recent = sorted(self.recent_ms)
+        return {
+            "tool": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "exceptions": self.exceptions,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "latency_ms": {
+                "mean": round(self.total_ms / self.calls, 2) if self.calls else None,
+                "p50": _percentile(recent, 50),
+                "p95": _percentile(recent, 95),
+                "p99": _percentile(recent, 99),
+                "max": round(self.max_ms, 2),
+                "total": round(self.total_ms, 2)
+            },
+            "payload_bytes": {
+                "mean": int(self.payload_bytes_total / self.calls) if self.calls else 0,
+                "max": self.payload_bytes_max,
+                "total": self.payload_bytes_total
+            },
+            "histogram_ms": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.bucket_counts)},
+                "le_inf": self.bucket_counts[-1]
+            },
+            "last_error": self.last_error,
+            "last_called_at": self.last_called_at
+        }
+
+
+class ToolMetrics:
+    """Thread-safe registry of per-tool statistics."""
+
+    def __init__(self, reservoir_size: int = 1024):
+        """
+        Args:
+            reservoir_size: Number of recent latencies kept per tool for p50/p95/p99
+        """
+        self.reservoir_size = reservoir_size
+        self.started_at = datetime.now().isoformat()
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, duration_ms: float, payload_bytes: int = 0,
+               error: Optional[str] = None, raised: bool = False):
+        """Record one tool invocation."""
+        with self._lock:
+            stats = self._stats.get(tool)
+            if stats is None:
+                stats = self._stats[tool] = ToolStats(tool, self.reservoir_size)
+            stats.observe(duration_ms, payload_bytes, error, raised)
+
+    def wrap(self, fn: Callable, name: Optional[str] = None) -> Callable:
+        """Return an instrumented wrapper around a sync or async tool function."""
+        tool_name = name or fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    self.record(tool_name, (time.perf_counter() - start) * 1000, 0, f"{type(e).__name__}: {e}", True)
+                    raise
+                self.record(tool_name, (time.perf_counter() - start) * 1000, payload_size(result), result_error(result))
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.record(tool_name, (time.perf_counter() - start) * 1000, 0, f"{type(e).__name__}: {e}", True)
+                raise
+            self.record(tool_name, (time.perf_counter() - start) * 1000, payload_size(result), result_error(result))
+            return result
+        return wrapper
+
+    def snapshot(self, tool: Optional[str] = None) -> Dict:
+        """Metrics for all tools (or one), hottest first by total time spent."""
+        with self._lock:
+            tools = [s.to_dict() for name, s in self._stats.items() if not tool or name == tool]
+
+        tools.sort(key=lambda t: t["latency_ms"]["total"], reverse=True)
+        total_calls = sum(t["calls"] for t in tools)
+        total_errors = sum(t["errors"] for t in tools)
+
+        return {
+            "started_at": self.started_at,
+            "generated_at": datetime.now().isoformat(),
+            "total_calls": total_calls,
+            "total_errors": total_errors,
+            "error_rate": round(total_errors / total_calls, 4) if total_calls else 0.0,
+            "tools": tools
+        }
+
+    def to_prometheus(self, prefix: str = "mcp_tool") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_duration_seconds Tool call latency.",
+            f"# TYPE {prefix}_duration_seconds histogram"
+        ]
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: s.name)
+
+            for s in stats:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS, s.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_duration_seconds_bucket{{tool="{s.name}",le="{bound / 1000:g}"}} {cumulative}')
+                lines.append(f'{prefix}_duration_seconds_bucket{{tool="{s.name}",le="+Inf"}} {s.calls}')
+                lines.append(f'{prefix}_duration_seconds_sum{{tool="{s.name}"}} {s.total_ms / 1000:.6f}')
+                lines.append(f'{prefix}_duration_seconds_count{{tool="{s.name}"}} {s.calls}')
+
+            lines += [f"# HELP {prefix}_errors_total Tool calls that raised or returned success=false.",
+                      f"# TYPE {prefix}_errors_total counter"]
+            lines += [f'{prefix}_errors_total{{tool="{s.name}"}} {s.errors}' for s in stats]
+
+            lines += [f"# HELP {prefix}_payload_bytes_total Serialized size of tool results.",
+                      f"# TYPE {prefix}_payload_bytes_total counter"]
+            lines += [f'{prefix}_payload_bytes_total{{tool="{s.name}"}} {s.payload_bytes_total}' for s in stats]
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> Path:
+        """Dump the Prometheus text format to a file (e.g. for node_exporter's textfile collector)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = datetime.now().isoformat()
+
+
+def instrument_tools(mcp, metrics: ToolMetrics, profiler=None):
+    """
+    Make every subsequent @mcp.tool() registration instrumented (and optionally profiled).
+    The undecorated function is returned, so direct Python calls between tools are not counted.
+    """
+    register = mcp.tool
+
+    def tool(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(fn):
+            name = kwargs.get("name") or fn.__name__
+            wrapped = profiler.wrap(fn, name) if profiler is not None else fn
+            decorator(metrics.wrap(wrapped, name))
+            return fn
+
+        return wrap
+
+    mcp.tool = tool
+    return mcp
+
+
+def test_tool_metrics():
+    """Test metrics collection."""
+    metrics = ToolMetrics()
+
+    def fast_tool():
+        return {"success": True, "items": list(range(100))}
+
+    def failing_tool():
+        return {"success": False, "error": "not found"}
+
+    fast = metrics.wrap(fast_tool)
+    failing = metrics.wrap(failing_tool)
+    for _ in range(20):
+        fast()
+    failing()
+
+    print(json.dumps(metrics.snapshot(), indent=2)[:800])
+    print(metrics.to_prometheus()[:400])
+
+
+if __name__ == "__main__":
+    test_tool_metrics()
@@ -0,0 +1,317 @@
+"""
+Opt-in per-call profiling for MCP tools (Stage 9)
+Captures cProfile (.prof) or pyinstrument (speedscope JSON) profiles of individual
+tool invocations into a rotating profiles directory.
+
+Enable with environment variables:
+    MCP_PROFILE_TOOLS        "*" for every tool, or a comma-separated list of tool names
+    MCP_PROFILE_SAMPLE_RATE  Fraction of matching calls to profile (default 1.0)
+    MCP_PROFILE_ENGINE       "cprofile" (default) or "pyinstrument"
+    MCP_PROFILE_MIN_MS       Only keep profiles of calls slower than this (default 0)
+    MCP_PROFILE_MAX_FILES    Rotation limit for saved profiles (default 50)
+or at runtime through the set_tool_profiling MCP tool. Any single call can also
+be profiled by passing profile_call=true to the tool.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:
+    PyinstrumentProfiler = None
+    SpeedscopeRenderer = None
+
+
+ENGINES = ("cprofile", "pyinstrument")
+
+# Keyword argument added to every wrapped tool: profile this one call
+PROFILE_ARG = "profile_call"
+
+
+class ToolProfiler:
+    """Decides which tool calls to profile, captures them, and manages saved profiles."""
+
+    def __init__(
+        self,
+        profiles_dir: Path,
+        tools: Optional[List[str]] = None,
+        sample_rate: float = 1.0,
+        engine: str = "cprofile",
+        min_duration_ms: float = 0.0,
+        max_profiles: int = 50
+    ):
+        """
+        Args:
+            profiles_dir: Directory where profiles are written
+            tools: Tool names to profile ("*" for all); None/empty disables profiling
+            sample_rate: Fraction of matching calls to profile (0.0 - 1.0)
+            engine: "cprofile" (deterministic) or "pyinstrument" (sampling, speedscope output)
+            min_duration_ms: Discard profiles of calls faster than this
+            max_profiles: Keep at most this many profiles on disk (oldest are deleted)
+        """
+        self.profiles_dir = Path(profiles_dir)
+        self.max_profiles = max_profiles
+        # Only one profiler can be active per interpreter; concurrent calls are skipped
+        self._active = threading.Lock()
+        self.configure(tools or [], sample_rate, engine, min_duration_ms)
+
+    @classmethod
+    def from_env(cls, profiles_dir: Path) -> "ToolProfiler":
+        """Build a profiler from MCP_PROFILE_* environment variables."""
+        tools = [t.strip() for t in os.environ.get("MCP_PROFILE_TOOLS", "").split(",") if t.strip()]
+        return cls(
+            profiles_dir,
+            tools=tools,
+            sample_rate=float(os.environ.get("MCP_PROFILE_SAMPLE_RATE", "1.0")),
+            engine=os.environ.get("MCP_PROFILE_ENGINE", "cprofile"),
+            min_duration_ms=float(os.environ.get("MCP_PROFILE_MIN_MS", "0")),
+            max_profiles=int(os.environ.get("MCP_PROFILE_MAX_FILES", "50"))
+        )
+
+    def configure(
+        self,
+        tools: List[str],
+        sample_rate: float = 1.0,
+        engine: str = "cprofile",
+        min_duration_ms: float = 0.0
+    ) -> Dict:
+        """Change profiling settings at runtime."""
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown profiling engine: {engine} (expected one of {', '.join(ENGINES)})")
+        if engine == "pyinstrument" and PyinstrumentProfiler is None:
+            raise ValueError("pyinstrument not installed. Run: pip install pyinstrument")
+
+        self.tools = set(tools)
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.engine = engine
+        self.min_duration_ms = float(min_duration_ms)
+        return self.settings()
+
+    def settings(self) -> Dict:
+        return {
+            "enabled": bool(self.tools) and self.sample_rate > 0,
+            "tools": sorted(self.tools),
+            "sample_rate": self.sample_rate,
+            "engine": self.engine,
+            "min_duration_ms": self.min_duration_ms,
+            "max_profiles": self.max_profiles,
+            "profiles_dir": str(self.profiles_dir)
+        }
+
+    def should_profile(self, tool: str) -> bool:
+        if not self.tools or ("*" not in self.tools and tool not in self.tools):
+            return False
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    # -------------------------
+    # Capture
+    # -------------------------
+
+    def _start(self, is_async: bool):
+        if self.engine == "pyinstrument":
+            profiler = PyinstrumentProfiler(async_mode="enabled" if is_async else "disabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop(self, profiler):
+        if self.engine == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+
+    def _save(self, tool: str, profiler, duration_ms: float, requested: bool = False) -> Optional[Path]:
+        if duration_ms < self.min_duration_ms and not requested:
+            return None
+
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        stem = f"{stamp}_{tool}_{int(duration_ms)}ms"
+
+        if self.engine == "pyinstrument":
+            path = self.profiles_dir / f"{stem}.speedscope.json"
+            path.write_text(profiler.output(SpeedscopeRenderer()), encoding="utf-8")
+        else:
+            path = self.profiles_dir / f"{stem}.prof"
+            profiler.dump_stats(str(path))
+
+        self._rotate()
+        return path
+
+    def _rotate(self):
+        profiles = self._profile_files()
+        for old in profiles[self.max_profiles:]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _with_profile_arg(fn: Callable, wrapper: Callable) -> bool:
+        """Advertise the per-call profiling argument in the wrapper's signature (read by FastMCP)."""
+        signature = inspect.signature(fn)
+        params = list(signature.parameters.values())
+        if PROFILE_ARG in signature.parameters:
+            return False  # The tool has its own argument of that name
+        arg = inspect.Parameter(PROFILE_ARG, inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool)
+        if params and params[-1].kind == inspect.Parameter.VAR_KEYWORD:
+            params.insert(len(params) - 1, arg)
+        else:
+            params.append(arg)
+        wrapper.__signature__ = signature.replace(parameters=params)
+        return True
+
+    @staticmethod
+    def _report(result, path: Optional[Path]):
+        """Tell a caller that asked for a profile where it went (dict results only)."""
+        if isinstance(result, dict):
+            return {**result, "profile_name": path.name if path else None}
+        return result
+
+    def wrap(self, fn: Callable, name: Optional[str] = None) -> Callable:
+        """
+        Return a wrapper that profiles selected calls of a sync or async tool.
+        Besides the configured tools, any call passing profile_call=True is profiled
+        (regardless of min_duration_ms) and gets "profile_name" added to a dict result.
+        Note: a cProfile capture around an async tool also records any other
+        coroutines the event loop runs while the tool is suspended.
+        """
+        tool_name = name or fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                requested = bool(kwargs.pop(PROFILE_ARG, False)) if adds_arg else False
+                if not (requested or self.should_profile(tool_name)) or not self._active.acquire(blocking=False):
+                    result = await fn(*args, **kwargs)
+                    return self._report(result, None) if requested else result
+                try:
+                    profiler = self._start(is_async=True)
+                    start = time.perf_counter()
+                    try:
+                        result = await fn(*args, **kwargs)
+                    finally:
+                        self._stop(profiler)
+                        path = self._save(tool_name, profiler, (time.perf_counter() - start) * 1000, requested)
+                    return self._report(result, path) if requested else result
+                finally:
+                    self._active.release()
+            adds_arg = self._with_profile_arg(fn, async_wrapper)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            requested = bool(kwargs.pop(PROFILE_ARG, False)) if adds_arg else False
+            if not (requested or self.should_profile(tool_name)) or not self._active.acquire(blocking=False):
+                result = fn(*args, **kwargs)
+                return self._report(result, None) if requested else result
+            try:
+                profiler = self._start(is_async=False)
+                start = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    self._stop(profiler)
+                    path = self._save(tool_name, profiler, (time.perf_counter() - start) * 1000, requested)
+                return self._report(result, path) if requested else result
+            finally:
+                self._active.release()
+        adds_arg = self._with_profile_arg(fn, wrapper)
+        return wrapper
+
+    # -------------------------
+    # Retrieval
+    # -------------------------
+
+    def _profile_files(self) -> List[Path]:
+        """Saved profiles, newest first."""
+        if not self.profiles_dir.exists():
+            return []
+        files = [p for p in self.profiles_dir.iterdir()
+                 if p.name.endswith(".prof") or p.name.endswith(".speedscope.json")]
+        return sorted(files, key=lambda p: p.name, reverse=True)
+
+    def list_profiles(self, limit: int = 20, tool: Optional[str] = None) -> List[Dict]:
+        """Recent profiles with tool name, duration and size."""
+        profiles = []
+        for path in self._profile_files():
+            match = re.match(r"^(\d{8}_\d{6}_\d{6})_(.+)_(\d+)ms\.", path.name)
+            if not match:
+                continue
+            if tool and match.group(2) != tool:
+                continue
+            profiles.append({
+                "name": path.name,
+                "tool": match.group(2),
+                "duration_ms": int(match.group(3)),
+                "captured_at": datetime.strptime(match.group(1), "%Y%m%d_%H%M%S_%f").isoformat(),
+                "format": "speedscope" if path.name.endswith(".speedscope.json") else "pstats",
+                "size_bytes": path.stat().st_size
+            })
+            if len(profiles) >= limit:
+                break
+        return profiles
+
+    def read_profile(self, name: str, top: int = 30, sort: str = "cumulative") -> Dict:
+        """
+        Load a saved profile.
+        .prof files are summarized as pstats text (top N functions); speedscope
+        profiles are returned as JSON for https://www.speedscope.app.
+        """
+        path = self.profiles_dir / Path(name).name  # No directory traversal
+        if not path.exists():
+            raise FileNotFoundError(f"Profile not found: {name}")
+
+        if path.name.endswith(".speedscope.json"):
+            return {"name": path.name, "format": "speedscope", "profile": json.loads(path.read_text(encoding="utf-8"))}
+
+        stream = io.StringIO()
+        stats = pstats.Stats(str(path), stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+        return {
+            "name": path.name,
+            "format": "pstats",
+            "path": str(path),
+            "total_calls": stats.total_calls,
+            "total_time_s": round(stats.total_tt, 6),
+            "summary": stream.getvalue()
+        }
+
+
+def test_tool_profiler():
+    """Test profiling capture and rotation."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        profiler = ToolProfiler(Path(tmpdir), tools=["slow_tool"], max_profiles=3)
+
+        @functools.partial(profiler.wrap, name="slow_tool")
+        def slow_tool():
+            return sum(i * i for i in range(200000))
+
+        for _ in range(5):
+            slow_tool()
+
+        profiles = profiler.list_profiles()
+        print(f"Kept {len(profiles)} profiles: {[p['name'] for p in profiles]}")
+        print(profiler.read_profile(profiles[0]["name"], top=5)["summary"][:600])
+
+
+if __name__ == "__main__":
+    test_tool_profiler()
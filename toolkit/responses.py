@@ -0,0 +1,277 @@
+"""
+Memory-bounded response shaping for MCP tool results (Stage 9)
+Field projection, pagination (limit/offset/cursor), size caps, and content-hash
+references so large materials already sent to the client are not re-sent.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# -------------------------
+# Field Projection
+# -------------------------
+
+def project(record: Any, fields: Optional[Iterable[str]]) -> Any:
+    """
+    Keep only the requested fields of a dict.
+    Dotted paths select nested keys ("common_questions.technical").
+    Lists of dicts are projected element-wise.
+    """
+    if not fields:
+        return record
+    if isinstance(record, list):
+        return [project(item, fields) for item in record]
+    if not isinstance(record, dict):
+        return record
+
+    # Build a selection tree: {key: None} takes the whole value, {key: {...}} recurses
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        parts = [p for p in str(field).strip().split(".") if p]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                node = None  # Parent already selected in full
+                break
+            node = node.setdefault(part, {})
+        if node is not None:
+            node[parts[-1]] = None
+
+    return _project_tree(record, tree)
+
+
+def _project_tree(value: Any, tree: Optional[Dict]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project_tree(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _project_tree(value[key], sub) for key, sub in tree.items() if key in value}
+
+
+# -------------------------
+# Pagination
+# -------------------------
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return max(0, int(json.loads(base64.urlsafe_b64decode(padded))["o"]))
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def paginate(items: List[Any], limit: Optional[int] = None, offset: int = 0,
+             cursor: Optional[str] = None) -> Tuple[List[Any], Dict]:
+    """
+    Slice a list and describe the page.
+    A cursor (from a previous page's next_cursor) takes precedence over offset.
+    """
+    total = len(items)
+    start = decode_cursor(cursor) if cursor else max(0, int(offset or 0))
+    end = total if not limit or limit <= 0 else min(total, start + int(limit))
+    page = items[start:end]
+
+    return page, {
+        "total": total,
+        "offset": start,
+        "limit": limit if limit and limit > 0 else None,
+        "returned": len(page),
+        "has_more": end < total,
+        "next_cursor": encode_cursor(end) if end < total else None
+    }
+
+
+# -------------------------
+# Size Caps
+# -------------------------
+
+def json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+def cap_size(value: Any, max_bytes: int, path: str = "") -> Tuple[Any, List[str]]:
+    """
+    Trim a value so its JSON encoding fits in roughly max_bytes.
+    Dict keys are kept in order while they fit; lists keep a prefix; strings are cut.
+    Returns (trimmed_value, truncated_paths).
+    """
+    if max_bytes <= 0 or json_size(value) <= max_bytes:
+        return value, []
+
+    if isinstance(value, str):
+        budget = max(0, max_bytes - 16)
+        return value[:budget] + "…", [path or "$"]
+
+    if isinstance(value, list):
+        kept, used = [], 2
+        for index, item in enumerate(value):
+            size = json_size(item) + 1
+            if used + size > max_bytes:
+                remaining = max_bytes - used
+                if remaining > 64 and isinstance(item, (dict, list, str)):
+                    trimmed, _ = cap_size(item, remaining, f"{path}[{index}]")
+                    kept.append(trimmed)
+                break
+            kept.append(item)
+            used += size
+        return kept, [path or "$"]
+
+    if isinstance(value, dict):
+        kept, used, truncated = {}, 2, []
+        for key, item in value.items():
+            child_path = f"{path}.{key}" if path else key
+            overhead = json_size(key) + 2
+            size = json_size(item) + overhead
+            if used + size <= max_bytes:
+                kept[key] = item
+                used += size
+                continue
+            remaining = max_bytes - used - overhead
+            if remaining > 64 and isinstance(item, (dict, list, str)):
+                trimmed, paths = cap_size(item, remaining, child_path)
+                kept[key] = trimmed
+                used += json_size(trimmed) + overhead
+                truncated += paths
+            else:
+                truncated.append(child_path)
+        return kept, truncated
+
+    return value, []
+
+
+# -------------------------
+# Content-Hash References
+# -------------------------
+
+def content_hash(value: Any) -> str:
+    """Stable short hash of a JSON-serializable value."""
+    canonical = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+
+class MaterialStore:
+    """Bounded LRU of content sent to clients, addressable by content hash."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, value: Any) -> str:
+        ref = content_hash(value)
+        with self._lock:
+            self._items[ref] = value
+            self._items.move_to_end(ref)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return ref
+
+    def get(self, ref: str) -> Optional[Any]:
+        with self._lock:
+            value = self._items.get(ref)
+            if value is not None:
+                self._items.move_to_end(ref)
+            return value
+
+    def dedupe(self, sections: Dict[str, Any], known_refs: Optional[Iterable[str]] = None,
+               keys: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Replace sections whose content hash the client already has with {"$ref": hash}.
+        Returns (sections, refs) where refs maps every hashed section to its hash.
+        """
+        known = set(known_refs or [])
+        keys = list(keys) if keys is not None else list(sections.keys())
+        shaped, refs = dict(sections), {}
+        for key in keys:
+            if key not in sections:
+                continue
+            ref = self.put(sections[key])
+            refs[key] = ref
+            if ref in known:
+                shaped[key] = {"$ref": ref}
+        return shaped, refs
+
+
+def _fit_paths(paths: List[str], max_bytes: int) -> List[str]:
+    """Truncated paths within max_bytes: a prefix plus a "+N more" marker when they don't all fit."""
+    if json_size(paths) <= max_bytes:
+        return paths
+    for keep in range(len(paths) - 1, -1, -1):
+        fitted = paths[:keep] + [f"+{len(paths) - keep} more"]
+        if json_size(fitted) <= max_bytes:
+            return fitted
+    return [f"+{len(paths)} more"]
+
+
+def shape_response(
+    payload: Dict,
+    fields: Optional[Iterable[str]] = None,
+    max_bytes: int = 0,
+    known_refs: Optional[Iterable[str]] = None,
+    ref_sections: Optional[Iterable[str]] = None,
+    store: Optional[MaterialStore] = None
+) -> Dict:
+    """
+    Apply projection, reference de-duplication and a size cap to a dict payload.
+    Adds "refs" (section -> hash) when a store is given, and "truncated" when capped
+    (the capped response, "truncated" included, fits in max_bytes).
+    """
+    shaped = project(payload, fields)
+
+    if store is not None and ref_sections is not None:
+        shaped, refs = store.dedupe(shaped, known_refs, ref_sections)
+        if refs:
+            shaped["refs"] = refs
+
+    if max_bytes and max_bytes > 0 and json_size(shaped) > max_bytes:
+        # The "truncated" list counts against the cap: shrink the budget until both fit
+        source, reserve = shaped, 0
+        while True:
+            shaped, truncated = cap_size(source, max(1, max_bytes - reserve))
+            if truncated:
+                shaped["truncated"] = _fit_paths(truncated, max_bytes // 2)
+            overflow = json_size(shaped) - max_bytes
+            if overflow <= 0 or reserve >= max_bytes:
+                break
+            reserve += overflow
+
+    return shaped
+
+
+def test_response_shaping():
+    """Test projection, pagination, caps and references."""
+    materials = {
+        "interview_type": "technical",
+        "star_method": {"steps": ["Situation", "Task", "Action", "Result"] * 50},
+        "common_questions": {"technical": ["Q1", "Q2"], "behavioral": ["Q3"]}
+    }
+    print(project(materials, ["interview_type", "common_questions.technical"]))
+
+    page, info = paginate(list(range(10)), limit=4)
+    print(page, info)
+    page, info = paginate(list(range(10)), limit=4, cursor=info["next_cursor"])
+    print(page, info)
+
+    store = MaterialStore()
+    first = shape_response(materials, ref_sections=["star_method", "common_questions"], store=store)
+    second = shape_response(materials, known_refs=first["refs"].values(),
+                            ref_sections=["star_method", "common_questions"], store=store)
+    print(f"First: {json_size(first)} bytes, repeat: {json_size(second)} bytes")
+    print(shape_response(materials, max_bytes=300))
+
+
+if __name__ == "__main__":
+    test_response_shaping()
@@ -0,0 +1,174 @@
+"""
+Compiled text templates with a bounded render cache (Stage 9)
+Templates use str.format syntax. They are parsed once with string.Formatter and
+rendered output is memoized by (template, values) with LRU eviction.
+
+User templates are plain files (<name>.txt) in a template directory; they
+override built-in templates of the same name. The directory defaults to
+config/templates and can be changed with MCP_TEMPLATE_DIR.
+"""
+
+import os
+import string
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent.parent / "config" / "templates"
+
+_formatter = string.Formatter()
+
+
+def user_template_dir() -> Path:
+    """Directory holding user-supplied templates."""
+    return Path(os.environ.get("MCP_TEMPLATE_DIR") or DEFAULT_TEMPLATE_DIR)
+
+
+class CompiledTemplate:
+    """A template pre-split into literal text and replacement fields."""
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        # (literal, field_name, format_spec, conversion) - parsed once
+        self.segments: List[Tuple[str, Optional[str], str, Optional[str]]] = list(_formatter.parse(source))
+        self.fields = {
+            field.split(".")[0].split("[")[0]
+            for _, field, _, _ in self.segments
+            if field
+        }
+
+    def render(self, values: Dict) -> str:
+        parts = []
+        for literal, field, spec, conversion in self.segments:
+            parts.append(literal)
+            if field is None:
+                continue
+            if field in values:
+                value = values[field]
+            else:
+                value, _ = _formatter.get_field(field, (), values)  # Dotted/indexed fields
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            if spec and "{" in spec:
+                spec = _formatter.vformat(spec, (), values)  # Nested fields, e.g. {x:{width}}
+            parts.append(format(value, spec) if spec else str(value))
+        return "".join(parts)
+
+
+class TemplateEngine:
+    """Named compiled templates plus an LRU cache of rendered output."""
+
+    def __init__(
+        self,
+        templates: Optional[Dict[str, str]] = None,
+        template_dir: Optional[Path] = None,
+        cache_size: int = 512
+    ):
+        """
+        Args:
+            templates: Built-in templates by name
+            template_dir: Directory of <name>.txt user templates overriding built-ins
+            cache_size: Maximum rendered outputs kept (0 disables caching)
+        """
+        self.cache_size = cache_size
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        for name, source in (templates or {}).items():
+            self.register(name, source)
+        if template_dir is not None:
+            self.load_directory(template_dir)
+
+    def register(self, name: str, source: str) -> CompiledTemplate:
+        """Compile and register a template (replacing any with the same name)."""
+        compiled = CompiledTemplate(name, source)
+        with self._lock:
+            self._templates[name] = compiled
+            # Drop cached renders of the old version
+            for key in [k for k in self._cache if k[0] == name]:
+                del self._cache[key]
+        return compiled
+
+    def load_directory(self, template_dir: Path, prefix: str = "") -> List[str]:
+        """Register every <name>.txt in a directory (optionally only names starting with prefix)."""
+        template_dir = Path(template_dir)
+        if not template_dir.is_dir():
+            return []
+        loaded = []
+        for path in sorted(template_dir.glob(f"{prefix}*.txt")):
+            try:
+                self.register(path.stem, path.read_text(encoding="utf-8"))
+                loaded.append(path.stem)
+            except (OSError, ValueError) as e:
+                print(f"Error loading template {path.name}: {e}")
+        return loaded
+
+    def has(self, name: str) -> bool:
+        return name in self._templates
+
+    def fields(self, name: str) -> set:
+        """Top-level field names a template expects."""
+        return set(self._templates[name].fields)
+
+    def render(self, name: str, values: Dict, cache: bool = True) -> Optional[str]:
+        """
+        Render a template by name; None if no such template.
+        Values must be hashable for cached renders (pass cache=False otherwise,
+        e.g. for values like timestamps that never repeat).
+        """
+        template = self._templates.get(name)
+        if template is None:
+            return None
+
+        if not cache or self.cache_size <= 0:
+            return template.render(values)
+
+        key = (name, tuple(sorted(values.items())))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        rendered = template.render(values)
+        with self._lock:
+            self._cache[key] = rendered
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def cache_info(self) -> Dict:
+        with self._lock:
+            return {
+                "templates": sorted(self._templates),
+                "cached": len(self._cache),
+                "max_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def test_template_engine():
+    """Test compiled rendering and the render cache."""
+    engine = TemplateEngine({"greeting": "Hi {name}, welcome to {company}! ({count:>3})"}, cache_size=2)
+    print(engine.render("greeting", {"name": "Ada", "company": "Acme", "count": 7}))
+    print(engine.render("greeting", {"name": "Ada", "company": "Acme", "count": 7}))
+    print(engine.render("greeting", {"name": "Bob", "company": "Acme", "count": 8}))
+    print(engine.render("greeting", {"name": "Cy", "company": "Acme", "count": 9}))
+    print(engine.cache_info())
+
+
+if __name__ == "__main__":
+    test_template_engine()